@@ -0,0 +1,33 @@
+import time
+import uuid
+from sdk.video.video_analysis_request import VideoAnalysisRequest
+
+class Job:
+    STATUSES = ("queued", "running", "done", "failed")
+
+    def __init__(self, request: VideoAnalysisRequest, job_id=None):
+        self.id = job_id or uuid.uuid4().hex[:12]
+        self.request = request
+        self.status = "queued"
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "input": self.request.input,
+            "status": self.status,
+            "progress": round(self.progress, 3),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
@@ -0,0 +1,248 @@
+import asyncio
+import json
+import os
+import re
+import shutil
+import uuid
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+from pydantic import ValidationError
+from api.job_service import JobService
+from sdk.app.logger import Logger
+from sdk.video.video_analysis_request import VideoAnalysisRequest
+
+class JobServer:
+    """Minimal HTTP/1.1 front end of a `JobService`, one request per connection.
+
+    POST /jobs                          JSON request body, e.g. {"input": "data/videos/video1.mp4"}
+    POST /jobs?filename=x.mp4           raw video upload as the body
+    GET  /jobs                          all jobs
+    GET  /jobs/<id>                     job status and progress
+    GET  /jobs/<id>/report              summary and result paths of a finished job
+    GET  /health                        queue and worker state
+
+    Clients may only set `CLIENT_FIELDS`, and a JSON `input` must be a file
+    inside `input_folder`. Every job gets its own folder under
+    `upload_folder`, and the input is linked there, so results are always
+    written (and cleaned) inside that folder, never next to the source.
+    """
+
+    MAX_JSON_BODY = 1 << 20
+    MAX_UPLOAD_BODY = 8 << 30
+    CHUNK_SIZE = 1 << 20
+    JOB_PATH = re.compile(r"^/jobs/([0-9a-f]+)(/report)?$")
+    CLIENT_FIELDS = {
+        "confidence", "frame_skip", "batch_size", "tracking", "detect_interval",
+        "start_frame", "end_frame", "look_mode", "look_away_threshold", "head_cascade",
+        "motion_gate", "motion_threshold", "motion_max_static",
+        "image_format", "image_quality", "image_max_width"
+    }
+
+    def __init__(self, service: JobService, host="127.0.0.1", port=8000, upload_folder="data/uploads", input_folder="data/videos"):
+        self.logger = Logger(__name__)
+        self.service = service
+        self.host = host
+        self.port = port
+        self.upload_folder = Path(upload_folder)
+        self.input_folder = Path(input_folder)
+
+    async def serve(self):
+        await self.service.start()
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+
+        self.logger.started(f"Job service listening on http://{self.host}:{self.port}")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.service.close()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, target, headers = await self.read_head(reader)
+            url = urlsplit(target)
+            status, body = await self.route(method, url.path, parse_qs(url.query), headers, reader)
+        except ValueError as e:
+            status, body = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as e:
+            self.logger.error("Request failed", e)
+            status, body = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+
+        try:
+            await self.respond(writer, status, body)
+        finally:
+            writer.close()
+
+    async def route(self, method, path, query, headers, reader):
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, {"workers": self.service.workers, "queued": self.service.queued, "queue_size": self.service.queue_size}
+
+        if path == "/jobs" and method == "GET":
+            return HTTPStatus.OK, [job.to_dict() for job in self.service.jobs.values()]
+
+        if path == "/jobs" and method == "POST":
+            return await self.create_job(query, headers, reader)
+
+        match = self.JOB_PATH.match(path)
+
+        if match and method == "GET":
+            job = self.service.get(match.group(1))
+
+            if job is None:
+                return HTTPStatus.NOT_FOUND, {"error": "Job not found"}
+
+            if not match.group(2):
+                return HTTPStatus.OK, job.to_dict()
+
+            if job.status != "done":
+                return HTTPStatus.CONFLICT, {"error": f"Job is {job.status}", **job.to_dict()}
+
+            return HTTPStatus.OK, {**job.to_dict(), **job.result}
+
+        return HTTPStatus.NOT_FOUND, {"error": "Not found"}
+
+    async def create_job(self, query, headers, reader):
+        if self.service.queued >= self.service.queue_size:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Job queue is full, retry later"}
+
+        length = int(headers.get("content-length", 0))
+        job_id = uuid.uuid4().hex[:12]
+        source = None
+
+        if "filename" in query:
+            # Keep only the base name, uploads must stay inside the upload folder
+            file_name = os.path.basename(query["filename"][0]) or "upload.mp4"
+
+            if length <= 0:
+                raise ValueError("Uploads need a Content-Length")
+
+            if length > self.MAX_UPLOAD_BODY:
+                return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": f"Uploads are limited to {self.MAX_UPLOAD_BODY} bytes"}
+
+            input_path = await self.save_upload(reader, length, job_id, file_name)
+            fields = {}
+        else:
+            if length > self.MAX_JSON_BODY:
+                raise ValueError("Request body is too large")
+
+            fields = json.loads(await reader.readexactly(length) or b"{}")
+
+            if not isinstance(fields, dict):
+                raise ValueError("Request body must be a JSON object")
+
+            source = input_path = self.resolve_input(fields.pop("input", None))
+            not_allowed = sorted(set(fields) - self.CLIENT_FIELDS)
+
+            if not_allowed:
+                raise ValueError(f"Fields not allowed: {not_allowed}")
+
+        try:
+            # The job folder is private to this job, so cleaning its output is always safe
+            request = VideoAnalysisRequest(**{**self.service.request.model_dump(), **fields, "input": str(input_path), "clean_output": True})
+        except ValidationError as e:
+            self.remove_job_folder(job_id)
+            return HTTPStatus.BAD_REQUEST, {"error": e.errors(include_url=False, include_context=False)}
+
+        if source:
+            request.input = str(self.link_input(source, job_id))
+
+        try:
+            job = self.service.submit(request, job_id)
+        except asyncio.QueueFull:
+            self.remove_job_folder(job_id)
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Job queue is full, retry later"}
+
+        return HTTPStatus.ACCEPTED, job.to_dict()
+
+    def resolve_input(self, input_path) -> Path:
+        """The client's input path, which must be an existing file inside the input folder."""
+        if not input_path or not isinstance(input_path, str):
+            raise ValueError("'input' is required")
+
+        path = Path(input_path).resolve()
+
+        if not path.is_file() or not path.is_relative_to(self.input_folder.resolve()):
+            raise ValueError(f"Input file not found in {self.input_folder}: {input_path}")
+
+        return path
+
+    def link_input(self, source: Path, job_id) -> Path:
+        """Links the input into the job folder, so the results are written there instead of next to the source."""
+        folder = self.upload_folder / job_id
+        folder.mkdir(parents=True, exist_ok=True)
+        file_path = folder / source.name
+
+        try:
+            file_path.symlink_to(source)
+        except OSError:
+            # Symbolic links may need extra privileges on Windows
+            try:
+                os.link(source, file_path)
+            except OSError:
+                shutil.copyfile(source, file_path)
+
+        return file_path
+
+    def remove_job_folder(self, job_id):
+        """Deletes the upload or linked input of a job that was not queued."""
+        shutil.rmtree(self.upload_folder / job_id, ignore_errors=True)
+
+    async def save_upload(self, reader, length, job_id, file_name) -> Path:
+        folder = self.upload_folder / job_id
+        folder.mkdir(parents=True, exist_ok=True)
+        file_path = folder / file_name
+
+        try:
+            with open(file_path, "wb") as f:
+                remaining = length
+
+                while remaining:
+                    chunk = await reader.read(min(self.CHUNK_SIZE, remaining))
+
+                    if not chunk:
+                        raise ValueError("Upload ended early")
+
+                    f.write(chunk)
+                    remaining -= len(chunk)
+        except BaseException:
+            self.remove_job_folder(job_id)
+            raise
+
+        return file_path
+
+    async def read_head(self, reader):
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split()
+
+        if len(parts) != 3:
+            raise ValueError(f"Malformed request line: {request_line}")
+
+        headers = {}
+
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+
+            if not line:
+                break
+
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        return parts[0].upper(), parts[1], headers
+
+    async def respond(self, writer, status, body):
+        payload = json.dumps(body, default=str).encode()
+        head = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(payload)}",
+            "Connection: close"
+        ]
+
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            head.append("Retry-After: 5")
+
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+        await writer.drain()
@@ -0,0 +1,135 @@
+import asyncio
+import multiprocessing
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from api.job import Job
+from sdk.app.logger import Logger
+from sdk.video.video_analysis_manager import _init_worker
+from sdk.video.video_analysis_request import VideoAnalysisRequest
+from sdk.video.video_file_analyzer import VideoFileAnalyzer
+
+def _ping():
+    return True
+
+def _run_job(request: VideoAnalysisRequest, job_id, progress):
+    analyzer = VideoFileAnalyzer(request)
+    analyzer.on_progress = lambda fraction: progress.__setitem__(job_id, fraction)
+    report = analyzer.analyze()
+
+    if report is None:
+        raise IOError(f"Cannot open video file: {request.input}")
+
+    # analyze() logs and swallows errors so a partial report is still written
+    if analyzer.error:
+        raise RuntimeError(f"Analysis failed: {analyzer.error}")
+
+    return {
+        "summary": report.summary(),
+        "report": str(analyzer.report_path),
+        "events": str(analyzer.events_path),
+        "metrics": str(analyzer.metrics_path)
+    }
+
+class JobService:
+    """Runs analysis jobs from a bounded queue on a pool of warm worker processes.
+
+    Workers load and warm up the models once at start, so a job only pays
+    for its own frames. They are spawned rather than forked, so they do not
+    inherit the event loop and threads of the server process. At most
+    `workers` jobs run at once. `submit` raises `asyncio.QueueFull` when
+    `queue_size` jobs are already waiting.
+    """
+
+    def __init__(self, request: VideoAnalysisRequest, workers=2, queue_size=16, history=1000):
+        self.logger = Logger(__name__)
+        self.request = request  # Template for warming up workers
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.history = history
+        self.jobs: OrderedDict[str, Job] = OrderedDict()
+        self._queue = None
+        self._tasks = []
+        self._executor = None
+        self._manager = None
+        self._progress = None
+
+    @property
+    def queued(self):
+        return self._queue.qsize() if self._queue else 0
+
+    async def start(self):
+        start_time = time.time()
+        loop = asyncio.get_running_loop()
+
+        context = multiprocessing.get_context("spawn")
+
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._manager = context.Manager()
+        self._progress = self._manager.dict()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=_init_worker, initargs=(self.request,))
+
+        # Spawn every worker now, so models are loaded before the first job arrives
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _ping) for _ in range(self.workers)))
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+        self.logger.finished(f"Job service ready with {self.workers} warm workers", start_time)
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        if self._executor:
+            self._executor.shutdown(cancel_futures=True)
+
+        if self._manager:
+            self._manager.shutdown()
+
+    def submit(self, request: VideoAnalysisRequest, job_id=None) -> Job:
+        request = request.model_copy(update={"workers": 1, "metrics_port": None})  # The service already runs jobs in parallel
+        job = Job(request, job_id)
+
+        self._queue.put_nowait(job)
+        self.jobs[job.id] = job
+        self._trim()
+
+        self.logger.info(f"Job queued: {job.id} [{request.input}]")
+
+        return job
+
+    def get(self, job_id) -> Job:
+        job = self.jobs.get(job_id)
+
+        if job and job.status == "running":
+            job.progress = self._progress.get(job_id, job.progress)
+
+        return job
+
+    async def _work(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+
+            try:
+                job.result = await loop.run_in_executor(self._executor, _run_job, job.request, job.id, self._progress)
+                job.status = "done"
+                job.progress = 1.0
+                self.logger.success(f"Job done: {job.id}")
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+                self.logger.error(f"Job failed: {job.id}", e, stack=False)
+            finally:
+                job.finished_at = time.time()
+                self._progress.pop(job.id, None)
+                self._queue.task_done()
+
+    def _trim(self):
+        # Forget the oldest finished jobs beyond the history limit
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished][:max(0, len(self.jobs) - self.history)]:
+            del self.jobs[job_id]
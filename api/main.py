@@ -1,8 +1,24 @@
+import asyncio
+from api.job_server import JobServer
+from api.job_service import JobService
 from sdk.app.cmd_args import CmdArgs
-from sdk.video.video_analysis_manager import VideoAnalysisManager
+from sdk.video.video_analysis_request import VideoAnalysisRequest
+
+def serve(args):
+    request = VideoAnalysisRequest.sample()
+    request.model_name = args.model_name
+    service = JobService(request, args.workers, args.queue_size)
+    server = JobServer(service, args.host, args.port, args.upload_folder, args.input_folder)
+
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
 
 if __name__ == "__main__":
     args = CmdArgs().parse()
-    analyzer = VideoAnalysisManager(args)
-    analyzer.analyze()
-    
+
+    if args.mode != "serve":
+        raise SystemExit("Usage: python -m api.main serve [--port 8000] [--workers 2] [--queue-size 16]")
+
+    serve(args)
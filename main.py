@@ -1,10 +1,52 @@
+import json
+from api.main import serve
 from sdk.app.cmd_args import CmdArgs
+from sdk.detection.report.report import Report
+from sdk.detection.head.head_stream_analyzer import HeadStreamAnalyzer
+from sdk.video.multi_stream_engine import MultiStreamEngine
 from sdk.video.video_analysis_manager import VideoAnalysisManager
 from sdk.video.video_analysis_request import VideoAnalysisRequest
 
+def to_output(result):
+    """JSON-ready form of a manager result: a report summary, {file: summary} for a folder, or scan results."""
+    if isinstance(result, Report):
+        return result.summary()
+
+    if isinstance(result, dict):
+        return {file_path: to_output(report) for file_path, report in result.items()}
+
+    return result
+
 if __name__ == "__main__":
     args = CmdArgs().parse()
-    request = VideoAnalysisRequest.sample()
-    analyzer = VideoAnalysisManager(request)
-    analyzer.analyze()
+
+    if args.mode == "live" and len(args.source) > 1:
+        stats = MultiStreamEngine(args.source, look_mode=args.look_mode, look_away_threshold=args.look_away_threshold).run()
+        print(json.dumps(stats, indent=2))
+    elif args.mode == "live":
+        HeadStreamAnalyzer(args.look_away_threshold, args.source[0], args.headless).start()
+    elif args.mode == "serve":
+        serve(args)
+    elif args.mode == "file":
+        request = VideoAnalysisRequest(
+            input=args.input,
+            frame_skip=args.frame_skip,
+            look_mode=args.look_mode,
+            look_away_threshold=args.look_away_threshold,
+            batch_size=args.batch_size,
+            tracking=args.tracking,
+            detect_interval=args.detect_interval,
+            workers=args.workers,
+            scan=args.scan,
+            scan_interval=args.scan_interval,
+            scan_mode=args.scan_mode
+        )
+        result = VideoAnalysisManager(request).analyze()
+
+        with open(args.output, "w") as f:
+            json.dump(to_output(result), f, indent=2, default=str)
+    else:
+        request = VideoAnalysisRequest.sample()
+        analyzer = VideoAnalysisManager(request)
+        analyzer.analyze()
     
@@ -18,12 +18,31 @@ class CmdArgs:
         file_parser.add_argument("-o", "--output", required=True, help="Path to save JSON output")
         file_parser.add_argument("--look-mode", default="yaw", choices=["yaw", "yaw_pitch", "gaze"])
         file_parser.add_argument("--frame-skip", type=int, default=1)
+        file_parser.add_argument("--batch-size", type=int, default=1, help="Sampled frames per person model call")
+        file_parser.add_argument("--tracking", action="store_true", help="Track person boxes between detections")
+        file_parser.add_argument("--detect-interval", type=int, default=30, help="Maximum frames between person detections when tracking")
+        file_parser.add_argument("--workers", type=int, default=1, help="Worker processes for chunks or folder files")
         file_parser.add_argument("--look-away-threshold", type=float, default=0.1)
+        file_parser.add_argument("--scan", action="store_true", help="Triage: analyze a sparse sample of frames and score each file")
+        file_parser.add_argument("--scan-interval", type=float, default=10.0, help="Seconds between scanned frames")
+        file_parser.add_argument("--scan-mode", default="keyframes", choices=["keyframes", "interval"])
 
         # --- live mode ---
         live_parser = subparsers.add_parser("live", help="Start live video stream analysis")
         live_parser.add_argument("--look-mode", default="yaw", choices=["yaw", "yaw_pitch", "gaze"])
         live_parser.add_argument("--look-away-threshold", type=float, default=0.1)
+        live_parser.add_argument("--source", nargs="+", default=["0"], help="Camera indexes, stream URLs or video files (played at real-time pace); several sources run as a multi-stream engine")
+        live_parser.add_argument("--headless", action="store_true", help="Log results instead of showing a window")
+
+        # --- serve mode ---
+        serve_parser = subparsers.add_parser("serve", help="Start the local HTTP job service")
+        serve_parser.add_argument("--host", default="127.0.0.1")
+        serve_parser.add_argument("--port", type=int, default=8000)
+        serve_parser.add_argument("--workers", type=int, default=2, help="Worker processes with warm models, i.e. jobs run at once")
+        serve_parser.add_argument("--queue-size", type=int, default=16, help="Jobs waiting before new ones are rejected with 503")
+        serve_parser.add_argument("--upload-folder", default="data/uploads", help="Job folders: uploads, linked inputs and their results")
+        serve_parser.add_argument("--input-folder", default="data/videos", help="Folder that JSON job inputs must be inside")
+        serve_parser.add_argument("--model-name", default="yolov8n.pt")
 
         args = parser.parse_args()
         
@@ -34,9 +53,15 @@ class CmdArgs:
             file_parser.print_help()
             print("\nSubcommand 'live' options:")
             live_parser.print_help()
+            print("\nSubcommand 'serve' options:")
+            serve_parser.print_help()
             sys.exit(0)
 
-        args.input = "data/videos/video5.mp4"
+        if not getattr(args, "input", None):
+            args.input = "data/videos/video5.mp4"
+
+        if args.mode == "live":
+            args.source = [int(source) if source.isdigit() else source for source in args.source]
         
         if args.mode == "":
             args.mode = "file"
@@ -1,11 +1,149 @@
+import atexit
 import logging
+import logging.handlers
+import multiprocessing.util
+import os
+import queue
+import sys
+import threading
 import time
 import traceback
 
+class _Message:
+    """Formats a log line only when a handler actually emits it."""
+
+    def __init__(self, icon, type, name, message, args, start_time):
+        self.icon = icon
+        self.type = type
+        self.name = name
+        self.message = message
+        self.args = args
+        self.time_spent = time.time() - start_time if start_time else None
+        self.suppressed = 0  # Repeats dropped by the rate limit before this one
+
+    def __str__(self):
+        message = self.message() if callable(self.message) else str(self.message)
+
+        if self.args:
+            message = message % self.args
+
+        if self.suppressed:
+            message = f"{message} (+{self.suppressed} similar suppressed)"
+
+        if self.time_spent is not None:
+            return f"{self.icon} [{self.type}]:[{self.name}]: Time spent: [{self.time_spent:.2f}s] - {message}"
+
+        return f"{self.icon} [{self.type}]:[{self.name}]: {message}"
+
+class _RateLimitFilter(logging.Filter):
+    """Lets a repetitive message through at most once per `every` seconds.
+
+    Only records logged with `every=` are limited; they are keyed by logger
+    and message template, so per-frame messages with changing arguments
+    still count as one message. The number of suppressed repeats is
+    appended to the next line that gets through.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._last = {}
+        self._suppressed = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        every = getattr(record, "every", None)
+        if not every:
+            return True
+
+        message = record.msg.message if isinstance(record.msg, _Message) else record.msg
+        key = (record.name, getattr(message, "__code__", message))  # Lambdas made by the same call site share their code
+        now = time.monotonic()
+
+        with self._lock:
+            if now - self._last.get(key, float("-inf")) < every:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return False
+
+            self._last[key] = now
+            suppressed = self._suppressed.pop(key, 0)
+
+        if isinstance(record.msg, _Message):
+            record.msg.suppressed = suppressed
+
+        return True
+
 class Logger:
+    """Level-gated logger writing through a queue to a background thread.
+
+    The level comes from the SDK_LOG_LEVEL environment variable (default
+    INFO) or `Logger.set_level`. Messages below the level are dropped before
+    they are formatted; pass %-style args or a callable to keep formatting
+    lazy on hot paths.
+
+    A forked child inherits the queue but not the listener thread, so the
+    queue and listener are rebuilt in the child right after a fork.
+    """
+
+    ROOT = "sdk"
+
+    _listener = None
+    _handler = None
+    _setup_lock = threading.Lock()
+
     def __init__(self, name):
         self.name = name
-        self.logger = logging.getLogger(name)
+        self.logger = logging.getLogger(f"{self.ROOT}.{name}")
+        self._setup()
+
+    @classmethod
+    def _setup(cls):
+        with cls._setup_lock:
+            if cls._listener:
+                return
+
+            cls._start()
+            atexit.register(lambda: cls._listener.stop())
+
+            if hasattr(os, "register_at_fork"):
+                os.register_at_fork(after_in_child=cls._after_fork)
+
+    @classmethod
+    def _start(cls):
+        log_queue = queue.Queue(-1)
+        handler = logging.handlers.QueueHandler(log_queue)
+        handler.addFilter(_RateLimitFilter())
+
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(logging.Formatter("%(message)s"))
+
+        root = logging.getLogger(cls.ROOT)
+
+        if cls._handler:
+            root.removeHandler(cls._handler)
+
+        root.addHandler(handler)
+        root.setLevel(os.environ.get("SDK_LOG_LEVEL", "INFO").upper())
+        root.propagate = False
+
+        cls._handler = handler
+        cls._listener = logging.handlers.QueueListener(log_queue, output)
+        cls._listener.start()
+
+    @classmethod
+    def _after_fork(cls):
+        # The lock may have been held by another thread at fork time
+        cls._setup_lock = threading.Lock()
+        cls._start()
+
+        # Pool workers leave through os._exit, which skips atexit; multiprocessing still runs its finalizers
+        multiprocessing.util.Finalize(None, cls._listener.stop, exitpriority=0)
+
+    @classmethod
+    def set_level(cls, level):
+        logging.getLogger(cls.ROOT).setLevel(level.upper() if isinstance(level, str) else level)
+
+    def is_enabled(self, level=logging.DEBUG):
+        return self.logger.isEnabledFor(level)
 
     def started(self, message, start_time=None):
         self.log(message, "STARTED", "🚀", start_time)
@@ -14,25 +152,26 @@ class Logger:
         self.log(message, "FINISHED", "✅", start_time)
 
     def success(self, message, start_time=None):
-        self.log(message, "FAILED", "✨", start_time)
-
-        self.info(f" {message}", start_time)
+        self.log(message, "SUCCESS", "✨", start_time)
 
     def failed(self, message, start_time=None):
-        self.log(message, "SUCCESS", "💥", start_time)
+        self.log(message, "FAILED", "💥", start_time, level=logging.WARNING)
 
     def info(self, message, start_time=None):
         self.log(message, "INFO", "ℹ️", start_time)
 
-    def log(self, message, type, icon, start_time=None):
-        if start_time:
-            time_spent = time.time() - start_time
-            print(f"{icon} [{type}]:[{self.name}]: Time spent: [{time_spent:.2f}s] - {message}")
-        else:
-            print(f"{icon} [{type}]:[{self.name}]: {message}")
+    def debug(self, message, *args, every=None):
+        """Logs at DEBUG level; `every` limits a repeated message to once per that many seconds."""
+        self.log(message, "DEBUG", "🔍", None, *args, level=logging.DEBUG, every=every)
+
+    def log(self, message, type, icon, start_time=None, *args, level=logging.INFO, every=None):
+        if not self.logger.isEnabledFor(level):
+            return
+
+        self.logger.log(level, _Message(icon, type, self.name, message, args, start_time), extra={"every": every})
 
     def error(self, message, e=None, stack=True):
         if e:
-            print(f"❌ [ERROR]:[{self.name}]: {message}: {e}" + (f"\n{traceback.format_exc()}" if stack else ""))
-        else:
-            print(f"❌ [ERROR]:[{self.name}]: {message}")
\ No newline at end of file
+            message = f"{message}: {e}" + (f"\n{traceback.format_exc()}" if stack else "")
+
+        self.log(message, "ERROR", "❌", level=logging.ERROR)
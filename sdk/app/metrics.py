@@ -0,0 +1,208 @@
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class Histogram:
+    """Latency histogram with fixed buckets (seconds)."""
+
+    BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets=None):
+        self.buckets = tuple(buckets or self.BUCKETS)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value, count=1):
+        self.counts[bisect.bisect_left(self.buckets, value)] += count
+        self.count += count
+        self.sum += value * count
+        self.max = max(self.max, value)
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile."""
+        if not self.count:
+            return 0.0
+
+        rank = q / 100 * self.count
+        total = 0
+
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank:
+                return min(bound, self.max)
+
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": round(self.max, 6),
+            "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts))
+        }
+
+class Metrics:
+    """Process-wide counters and latency histograms, labeled e.g. by stage and analyzer type.
+
+    Totals accumulate for the life of the process. A scope (`begin_scope`)
+    collects only what is recorded while it is open, e.g. the metrics of one
+    file in a worker that analyzes many. Each process has its own instance,
+    so `serve` only exposes what was recorded in the serving process.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._scopes = []
+
+    @classmethod
+    def instance(cls) -> "Metrics":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            scopes = list(self._scopes)
+
+        for scope in scopes:
+            scope.inc(name, value, **labels)
+
+    def observe(self, name, seconds, count=1, **labels):
+        """Records `count` observations of `seconds` each."""
+        key = self._key(name, labels)
+
+        with self._lock:
+            histogram = self._histograms.get(key)
+
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+
+            histogram.observe(seconds, count)
+            scopes = list(self._scopes)
+
+        for scope in scopes:
+            scope.observe(name, seconds, count, **labels)
+
+    def begin_scope(self) -> "Metrics":
+        """Returns a collector that also receives everything recorded until `end_scope`."""
+        scope = Metrics()
+
+        with self._lock:
+            self._scopes.append(scope)
+
+        return scope
+
+    def end_scope(self, scope: "Metrics"):
+        with self._lock:
+            if scope in self._scopes:
+                self._scopes.remove(scope)
+
+    def histogram(self, name, **labels) -> Histogram:
+        """The histogram recorded under `name` and `labels`, or None."""
+        with self._lock:
+            return self._histograms.get(self._key(name, labels))
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+                "histograms": [
+                    {"name": name, "labels": dict(labels), **histogram.snapshot()}
+                    for (name, labels), histogram in sorted(self._histograms.items())
+                ]
+            }
+
+    def save(self, file_path):
+        with open(file_path, "w") as f:
+            json.dump(self.snapshot(), f, separators=(",", ":"))
+
+    def to_prometheus(self) -> str:
+        lines = []
+
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                lines.append(f"{name}{self._labels(labels)} {value}")
+
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                total = 0
+
+                for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                    total += count
+                    lines.append(f"{name}_bucket{self._labels(labels + (('le', bound),))} {total}")
+
+                lines.append(f"{name}_sum{self._labels(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{self._labels(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port=9100, host="127.0.0.1"):
+        """Serves the Prometheus text format on http://host:port/metrics from a daemon thread."""
+        if self._server:
+            return self._server
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = metrics.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True).start()
+
+        return self._server
+
+    def _key(self, name, labels):
+        return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def _labels(self, labels):
+        if not labels:
+            return ""
+
+        return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
@@ -0,0 +1,229 @@
+import json
+import platform
+import subprocess
+import sys
+import time
+import cv2
+import numpy as np
+
+from sdk.app.logger import Logger
+from sdk.app.metrics import Metrics
+from sdk.bench.stub_models import StubFaceMesh, StubYolo
+from sdk.bench.synthetic_video import SyntheticVideo
+from sdk.detection.core.model_pool import ModelPool
+from sdk.detection.head.head_file_analyzer import HeadFileAnalyzer
+from sdk.detection.head.head_request import HeadRequest
+from sdk.detection.person.person_file_analyzer import PersonFileAnalyzer
+from sdk.detection.person.person_request import PersonRequest
+from sdk.video.frame_source import FrameSource
+from sdk.video.video_analysis_request import VideoAnalysisRequest
+from sdk.video.video_file_analyzer import VideoFileAnalyzer
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None if unavailable)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+            return round(psutil.Process().memory_info().peak_wset / 2**20, 1)
+        except (ImportError, AttributeError):
+            return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+def get_stats(frames, seconds, latencies=None):
+    stats = {
+        "frames": frames,
+        "seconds": round(seconds, 3),
+        "fps": round(frames / seconds, 2) if seconds else 0.0,
+        "p50_ms": None,
+        "p99_ms": None,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+    if latencies:
+        latencies_ms = np.asarray(latencies) * 1000
+        stats["p50_ms"] = round(float(np.percentile(latencies_ms, 50)), 3)
+        stats["p99_ms"] = round(float(np.percentile(latencies_ms, 99)), 3)
+
+    return stats
+
+class Benchmark:
+    """Measures per-stage throughput on synthetic videos, with stub or real models."""
+
+    def __init__(self, folder, models="stub", model_name="yolov8n.pt", frame_skip=5, batch_size=1):
+        self.logger = Logger(__name__)
+        self.videos = SyntheticVideo(folder)
+        self.models = models
+        self.model_name = model_name
+        self.frame_skip = frame_skip
+        self.batch_size = batch_size
+
+    def install_stubs(self):
+        # Analyzers borrow models from the pool by key, so registering stubs swaps them in
+        pool = ModelPool.instance()
+        pool.register(("yolo", self.model_name), StubYolo())
+        pool.register(("face_mesh", False), StubFaceMesh())
+
+    def run_all(self, resolutions, seconds, fps) -> dict:
+        if self.models == "stub":
+            self.install_stubs()
+
+        cases = [self.run(width, height, seconds, fps) for width, height in resolutions]
+
+        return {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": self.get_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "models": self.models,
+            "frame_skip": self.frame_skip,
+            "batch_size": self.batch_size,
+            "cases": cases
+        }
+
+    def run(self, width, height, seconds, fps) -> dict:
+        video = self.videos.create(width, height, seconds, fps)
+
+        self.logger.started(f"Benchmarking {video}")
+        Metrics.instance().reset()
+
+        stages = {
+            "decode_all": self.bench_decode(video, lambda frame_index: True),
+            "decode_sampled": self.bench_decode(video, lambda frame_index: frame_index % self.frame_skip == 0),
+            "person_analyze_frame": self.bench_person(video),
+            "head_analyze_frame": self.bench_head(video),
+            "head_analyze_file": self.bench_head_file(video),
+            "video_analyze": self.bench_video(video)
+        }
+
+        return {
+            "video": {"width": width, "height": height, "seconds": seconds, "fps": fps},
+            "stages": stages,
+            "metrics": Metrics.instance().snapshot()
+        }
+
+    def bench_decode(self, video, should_retrieve) -> dict:
+        frames = 0
+        latencies = []
+        start_time = time.perf_counter()
+        last = start_time
+
+        with FrameSource(video, should_retrieve) as source:
+            for _ in source:
+                now = time.perf_counter()
+                latencies.append(now - last)
+                last = now
+                frames += 1
+
+        return get_stats(frames, time.perf_counter() - start_time, latencies)
+
+    def bench_person(self, video) -> dict:
+        # The stubs are registered under model_name, so the analyzers must borrow that model
+        request = PersonRequest(input=video, model_name=self.model_name, frame_skip=self.frame_skip, batch_size=self.batch_size)
+
+        analyzer = PersonFileAnalyzer(request)
+        latencies = []
+        batch = []
+
+        def run_batch():
+            start = time.perf_counter()
+            analyzer.analyze_frames([frame.index for frame in batch], [frame.image for frame in batch])
+            latencies.extend([(time.perf_counter() - start) / len(batch)] * len(batch))
+            batch.clear()
+
+        try:
+            with FrameSource(video, analyzer.wants_frame) as source:
+                for frame in source:
+                    batch.append(frame)
+
+                    if len(batch) >= self.batch_size:
+                        run_batch()
+
+            if batch:
+                run_batch()
+        finally:
+            analyzer.release()
+
+        return get_stats(len(latencies), sum(latencies), latencies)
+
+    def bench_head(self, video) -> dict:
+        request = HeadRequest.default(video)
+        request.frame_skip = self.frame_skip
+
+        analyzer = HeadFileAnalyzer(request)
+        latencies = []
+
+        try:
+            with FrameSource(video, analyzer.wants_frame) as source:
+                for frame in source:
+                    start = time.perf_counter()
+                    analyzer.analyze_frame(frame.index, frame.image)
+                    latencies.append(time.perf_counter() - start)
+        finally:
+            analyzer.release()
+
+        return get_stats(len(latencies), sum(latencies), latencies)
+
+    def bench_head_file(self, video) -> dict:
+        request = HeadRequest.default(video)
+        request.frame_skip = self.frame_skip
+
+        analyzer = HeadFileAnalyzer(request)
+
+        try:
+            start = time.perf_counter()
+            analyzer.analyze_file(video)
+            seconds = time.perf_counter() - start
+        finally:
+            analyzer.image_writer.close()
+            analyzer.release()
+
+        return get_stats(self.get_frame_count(video), seconds)
+
+    def bench_video(self, video) -> dict:
+        request = VideoAnalysisRequest(input=video, model_name=self.model_name, frame_skip=self.frame_skip, batch_size=self.batch_size)
+
+        analyzer = VideoFileAnalyzer(request)
+        run_analyzers = analyzer.run_analyzers
+        latencies = []
+
+        # Time each decoded frame's trip through the analyzers; frames that complete a batch carry its inference
+        def timed_run_analyzers(frame):
+            start = time.perf_counter()
+            items = run_analyzers(frame)
+            latencies.append(time.perf_counter() - start)
+            return items
+
+        analyzer.run_analyzers = timed_run_analyzers
+
+        start = time.perf_counter()
+        analyzer.analyze()
+        seconds = time.perf_counter() - start
+
+        return get_stats(self.get_frame_count(video), seconds, latencies)
+
+    def get_frame_count(self, video):
+        cap = cv2.VideoCapture(video)
+
+        try:
+            return int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        finally:
+            cap.release()
+
+    def get_revision(self):
+        try:
+            result = subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True)
+            return result.stdout.strip() or None
+        except OSError:
+            return None
+
+    def save(self, results, file_path):
+        with open(file_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+        self.logger.finished(f"Benchmark results saved to {file_path}")
@@ -0,0 +1,38 @@
+import argparse
+import json
+import os
+import tempfile
+
+from sdk.app.logger import Logger
+from sdk.bench.benchmark import Benchmark
+
+logger = Logger(__name__)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Throughput benchmark on synthetic videos")
+    parser.add_argument("--resolutions", default="640x360,1280x720,1920x1080", help="Comma separated WIDTHxHEIGHT list")
+    parser.add_argument("--seconds", type=int, default=10, help="Length of each synthetic video")
+    parser.add_argument("--fps", type=int, default=30, help="Frame rate of each synthetic video")
+    parser.add_argument("--models", default="stub", choices=["stub", "real"], help="Use stub models (no inference) or the real ones")
+    parser.add_argument("--model-name", default="yolov8n.pt", help="YOLO model used by the person analyzer")
+    parser.add_argument("--frame-skip", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--folder", default=os.path.join(tempfile.gettempdir(), "pose-bench"), help="Folder for synthetic videos")
+    parser.add_argument("-o", "--output", help="Path to save JSON results (printed when omitted)")
+
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    try:
+        args = parse_args()
+        resolutions = [tuple(int(v) for v in r.split("x")) for r in args.resolutions.split(",")]
+
+        benchmark = Benchmark(args.folder, args.models, args.model_name, args.frame_skip, args.batch_size)
+        results = benchmark.run_all(resolutions, args.seconds, args.fps)
+
+        if args.output:
+            benchmark.save(results, args.output)
+        else:
+            print(json.dumps(results, indent=2))
+    except Exception as e:
+        logger.error("Unexpected error during benchmark", e)
@@ -0,0 +1,58 @@
+import argparse
+import json
+import time
+
+from sdk.app.logger import Logger
+from sdk.detection.person.onnx_yolo import OnnxYolo
+from sdk.video.frame_source import FrameSource
+
+logger = Logger(__name__)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare ONNX Runtime person detection with the PyTorch model")
+    parser.add_argument("-i", "--input", required=True, help="Video whose frames are compared")
+    parser.add_argument("--model-name", default="yolov8n.pt", help="PyTorch YOLO model, exported to ONNX next to it")
+    parser.add_argument("--frames", type=int, default=50, help="Number of frames compared, spread over the video")
+    parser.add_argument("--quantize", action="store_true", help="Compare the INT8 model instead of the FP32 one")
+    parser.add_argument("--intra-op-threads", type=int, default=0)
+    parser.add_argument("--inter-op-threads", type=int, default=1)
+
+    return parser.parse_args()
+
+def read_frames(file_path, count):
+    source = FrameSource(file_path)
+    if not source.open():
+        raise IOError(f"Cannot open video file: {file_path}")
+
+    step = max(1, source.frame_count // count)
+    source.should_retrieve = lambda frame_index: frame_index % step == 0
+
+    with source:
+        return [frame.image for frame in source][:count]
+
+def time_model(model, frames):
+    start = time.perf_counter()
+
+    for frame in frames:
+        model([frame], verbose=False)
+
+    return round(len(frames) / (time.perf_counter() - start), 2)
+
+if __name__ == "__main__":
+    try:
+        from ultralytics import YOLO
+
+        args = parse_args()
+        frames = read_frames(args.input, args.frames)
+
+        reference = YOLO(args.model_name)
+        model = OnnxYolo.load(args.model_name, args.quantize, args.intra_op_threads, args.inter_op_threads)
+
+        results = model.parity(reference, frames)
+        results["torch_fps"] = time_model(reference, frames)
+        results["onnx_fps"] = time_model(model, frames)
+        results["model"] = model.model_path
+
+        print(json.dumps(results, indent=2))
+    except Exception as e:
+        logger.error("Unexpected error during parity check", e)
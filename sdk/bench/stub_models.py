@@ -0,0 +1,73 @@
+import time
+import numpy as np
+
+class StubBoxes:
+    def __init__(self, data):
+        self.data = data
+
+class StubDetection:
+    def __init__(self, boxes):
+        self.boxes = StubBoxes(boxes)
+
+class StubYolo:
+    """Stands in for ultralytics.YOLO: returns fixed person boxes without inference."""
+
+    def __init__(self, people=2, delay=0.0):
+        self.people = people
+        self.delay = delay
+
+    def __call__(self, frames, verbose=False):
+        if not isinstance(frames, list):
+            frames = [frames]
+
+        if self.delay:
+            time.sleep(self.delay * len(frames))
+
+        return [StubDetection(self.boxes(frame)) for frame in frames]
+
+    def boxes(self, frame):
+        height, width = frame.shape[:2]
+        box_width = width / (self.people + 1)
+
+        return np.array([
+            [i * box_width, height * 0.2, (i + 1) * box_width, height * 0.9, 0.9, 0]
+            for i in range(self.people)
+        ], dtype=np.float32)
+
+class StubLandmark:
+    def __init__(self, x, y, z=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+class StubFace:
+    def __init__(self, landmark):
+        self.landmark = landmark
+
+class StubMeshResult:
+    def __init__(self, multi_face_landmarks):
+        self.multi_face_landmarks = multi_face_landmarks
+
+class StubFaceMesh:
+    """Stands in for mediapipe FaceMesh: returns one face whose nose drifts off center."""
+
+    LANDMARK_COUNT = 468
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.frame_index = 0
+        self.landmark = [StubLandmark(0.5, 0.5) for _ in range(self.LANDMARK_COUNT)]
+
+    def process(self, rgb):
+        if self.delay:
+            time.sleep(self.delay)
+
+        self.frame_index += 1
+        offset = 0.3 * np.sin(self.frame_index / 30.0)
+        landmark = list(self.landmark)
+        landmark[1] = StubLandmark(0.5 + offset, 0.5)
+
+        return StubMeshResult([StubFace(landmark)])
+
+    def close(self):
+        pass
@@ -0,0 +1,56 @@
+import os
+from pathlib import Path
+import time
+import cv2
+import numpy as np
+
+from sdk.app.logger import Logger
+
+class SyntheticVideo:
+    """Generates deterministic MP4 test videos: a static background with moving figures."""
+
+    def __init__(self, folder):
+        self.logger = Logger(__name__)
+        self.folder = Path(folder)
+
+    def path(self, width, height, seconds, fps):
+        return self.folder / f"synthetic_{width}x{height}_{fps}fps_{seconds}s.mp4"
+
+    def create(self, width, height, seconds, fps, people=2):
+        file_path = self.path(width, height, seconds, fps)
+
+        if file_path.exists():
+            return str(file_path)
+
+        start_time = time.time()
+        os.makedirs(self.folder, exist_ok=True)
+
+        writer = cv2.VideoWriter(str(file_path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+        if not writer.isOpened():
+            raise IOError(f"Cannot create video file: {file_path}")
+
+        rng = np.random.default_rng(0)
+        background = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+        background = cv2.GaussianBlur(background, (0, 0), 15)
+        frame = np.empty_like(background)
+
+        box_width, box_height = width // 6, height // 2
+
+        try:
+            for frame_index in range(int(seconds * fps)):
+                np.copyto(frame, background)
+
+                for person in range(people):
+                    phase = frame_index / fps + person * np.pi
+                    x = int((width - box_width) * (0.5 + 0.4 * np.sin(phase)))
+                    y = height // 4
+                    cv2.rectangle(frame, (x, y), (x + box_width, y + box_height), (40 + 80 * person, 120, 200), -1)
+                    cv2.circle(frame, (x + box_width // 2, y - box_width // 3), box_width // 3, (180, 160, 140), -1)
+
+                writer.write(frame)
+        finally:
+            writer.release()
+
+        self.logger.finished(f"Synthetic video created: {file_path}", start_time)
+
+        return str(file_path)
@@ -5,6 +5,7 @@ class AnalyzerResult(BaseModel):
     status: int = Field(description="Whether the analysis was unknown=-1, success=0, skipped=1")
     confidence: float = Field(ge=0.0, le=1.0, description="Confidence score between 0.0 and 1.0")
     detail: Optional[Any] = Field(None, description="Additional analysis details")
+    carried_forward: bool = Field(False, description="Whether the result was reused from an earlier frame instead of analyzed")
 
     @classmethod
     def default(cls) -> "AnalyzerResult":
@@ -23,6 +24,10 @@ class AnalyzerResult(BaseModel):
     def success(self, value):
         self.status = 0 if value else -1
     
-    @success.setter
+    @property
+    def skipped(self):
+        return self.status == 1
+
+    @skipped.setter
     def skipped(self, value):
         self.status = 1 if value else -1
\ No newline at end of file
@@ -0,0 +1,63 @@
+import os
+import pickle
+import time
+from pathlib import Path
+from sdk.app.logger import Logger
+
+class Checkpoint:
+    """Periodically pickled analysis state, for resuming an interrupted run.
+
+    The state is written to a temporary file and renamed over the previous
+    checkpoint, so a crash while saving leaves the last good one in place.
+    A checkpoint is only resumed when its `signature` (e.g. the request
+    fields) matches, so a changed configuration starts from scratch.
+    """
+
+    def __init__(self, file_path, interval=60.0, signature=None):
+        self.logger = Logger(__name__)
+        self.file_path = Path(file_path)
+        self.interval = interval
+        self.signature = signature
+        self._last_save = time.monotonic()
+
+    @property
+    def enabled(self):
+        return self.interval > 0
+
+    def exists(self):
+        return self.file_path.is_file()
+
+    def is_due(self):
+        return self.enabled and time.monotonic() - self._last_save >= self.interval
+
+    def save(self, state: dict):
+        start = time.perf_counter()
+        temp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+
+        with open(temp_path, "wb") as f:
+            pickle.dump({"signature": self.signature, "state": state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temp_path, self.file_path)
+        self._last_save = time.monotonic()
+        self.logger.debug("Checkpoint saved to %s in %.3f s", self.file_path, time.perf_counter() - start)
+
+    def load(self) -> dict:
+        """The saved state, or None when there is none or it belongs to another configuration."""
+        if not self.exists():
+            return None
+
+        try:
+            with open(self.file_path, "rb") as f:
+                checkpoint = pickle.load(f)
+        except Exception as e:
+            self.logger.error(f"Ignoring unreadable checkpoint: {self.file_path}", e, stack=False)
+            return None
+
+        if checkpoint.get("signature") != self.signature:
+            self.logger.info(f"Ignoring checkpoint of a different configuration: {self.file_path}")
+            return None
+
+        return checkpoint["state"]
+
+    def remove(self):
+        self.file_path.unlink(missing_ok=True)
@@ -1,16 +1,21 @@
 import json
 from pathlib import Path
 import shutil
-import cv2
+import numpy as np
 from sdk.app.logger import Logger
 from sdk.detection.core.analyzer_result import AnalyzerResult
 from sdk.detection.core.core_request import CoreRequest
+from sdk.detection.core.image_writer import ImageWriter
+from sdk.detection.core.model_pool import ModelPool
 
 class CoreAnalyzer:
     def __init__(self):
         self.logger = Logger(__name__)
         self._request = None
         self.model = None
+        self._model_keys = []
+        self._image_writer = None
+        self._buffers = {}
 
     @property
     def request(self) -> CoreRequest:
@@ -19,8 +24,18 @@ class CoreAnalyzer:
     @request.setter
     def request(self, value):
         self._request = value
-        self.init_folder()
+        self.init_folder(value.clean_output)
     
+    @property
+    def image_writer(self) -> ImageWriter:
+        if self._image_writer is None:
+            self._image_writer = ImageWriter()
+        return self._image_writer
+
+    @image_writer.setter
+    def image_writer(self, value: ImageWriter):
+        self._image_writer = value
+
     @property
     def output_folder(self):
         base_name = Path(self._request.input).stem
@@ -41,34 +56,34 @@ class CoreAnalyzer:
         
     @property
     def reports_json_path(self):
-        return self.output_folder / f"reports.json"
+        return self.output_folder / f"reports.jsonl"
     
-    def set_file(self, file_path):
+    def set_file(self, file_path, clean=True):
         self.request.input = file_path
-        self.init_folder()
+        self.init_folder(clean)
 
     def to_timestamp(self, seconds):
         mins = int(seconds // 60)
         secs = int(seconds % 60)
         return f"{mins:02d}:{secs:02d}"
     
-    def save_frame(self, frame, timestamp):
-        timestamp = timestamp.replace(":", "-")
-        image_filename = self.output_folder / f"{timestamp}.png"
+    def save_frame(self, frame, timestamp, frame_index=None, prepared=False):
+        """Queues an evidence image; with `frame_index`, frames within the same second get distinct files."""
+        name = timestamp.replace(":", "-")
+
+        if frame_index is not None:
+            name = f"{name}_{frame_index:08d}"
 
-        cv2.imwrite(str(image_filename), frame)
+        image_filename = self.output_folder / f"{name}{self.image_writer.extension}"
 
-        return str(image_filename)
+        return self.image_writer.submit(image_filename, frame, self.type, prepared)
     
     def save_result(self, result):
         self.save_result_json(self.report_json_path, result)
 
-    def save_results(self, results):
-        self.save_result_json(self.reports_json_path, results)
-        
     def save_result_json(self, file_path, result):
         with open(file_path, "w") as f:
-            json.dump(result, f, indent=4)
+            json.dump(result, f, separators=(",", ":"))
 
         self.logger.finished(f"{self.type_title} analysis report saved to {file_path}")
     
@@ -90,5 +105,75 @@ class CoreAnalyzer:
         
         return folder
     
+    @property
+    def frame_skip(self):
+        """Sampling stride: the analyzer wants every n-th frame."""
+        return max(1, getattr(self._request, "frame_skip", 1) or 1)
+
+    @property
+    def batch_size(self):
+        return max(1, getattr(self._request, "batch_size", 1) or 1)
+
+    @property
+    def batch_max_wait(self):
+        return getattr(self._request, "batch_max_wait", 0.0) or 0.0
+
+    def get_buffer(self, name, shape, dtype=np.uint8) -> np.ndarray:
+        """A scratch array reused across frames, reallocated only when the shape changes."""
+        buffer = self._buffers.get(name)
+
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = self._buffers[name] = np.empty(shape, dtype)
+
+        return buffer
+
+    def borrow_model(self, key, loader, warmup=None):
+        model = ModelPool.instance().acquire(key, loader, warmup)
+        self._model_keys.append(key)
+        return model
+
+    def release(self):
+        for key in self._model_keys:
+            ModelPool.instance().release(key)
+
+        self._model_keys = []
+
+    def wants_frame(self, frame_index):
+        return frame_index % self.frame_skip == 0
+
+    def get_state(self):
+        """Picklable state carried between frames, saved in checkpoints."""
+        return None
+
+    def set_state(self, state):
+        pass
+
+    def annotate(self, image, frame_index, scale=1.0):
+        """Draws the analyzer's findings for a frame on its evidence image, whose size is `scale` times the frame's."""
+        pass
+
+    @property
+    def reports_segments(self):
+        """True when the analyzer reports qualifying segments through track_result instead of each detected frame."""
+        return False
+
+    def track_result(self, frame_index, timestamp, result, capture, fps) -> list[dict]:
+        """Adds a frame's result to the current segment; `capture` returns its evidence image and is only called if kept.
+
+        Returns the segments closed by this frame that qualify, with their evidence saved.
+        """
+        return []
+
+    def close_segments(self, fps) -> list[dict]:
+        """Ends the current segment once the video is done; returns it if it qualifies."""
+        return []
+
+    def finalize(self, fps=None):
+        """Called once the video is done. Returns analyzer-specific stats for the summary, or None."""
+        return None
+
+    def analyze_frames(self, frame_indexes, frames) -> list[AnalyzerResult]:
+        return [self.analyze_frame(frame_index, frame) for frame_index, frame in zip(frame_indexes, frames)]
+
     def analyze_frame(self, frame_index, frame) -> AnalyzerResult:
         return None
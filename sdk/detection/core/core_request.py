@@ -1,10 +1,12 @@
 import shutil
 from typing import Optional, Type
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sdk.app.json_file import JsonFile
 from sdk.detection.core.types import T
 
 class CoreRequest(BaseModel):
+    clean_output: bool = Field(True, description="Remove previous results from the output folder")
+
     def load(self, model_class: Type[T], json_path: str) -> Optional[T]:
         json_file = JsonFile()
         return json_file.load(model_class, json_path)
@@ -0,0 +1,130 @@
+import queue
+import threading
+import time
+import cv2
+from sdk.app.logger import Logger
+from sdk.app.metrics import Metrics
+
+class ImageWriter:
+    """Encodes and writes evidence images on background threads.
+
+    Frames are snapshotted (downscaled or copied) on submit, so callers may
+    reuse their buffers right away. The queue is bounded: when the writers
+    fall behind, `submit` blocks instead of growing memory. After `close`,
+    the next `submit` starts the writer threads again.
+    """
+
+    EXTENSIONS = {"png": ".png", "jpg": ".jpg", "webp": ".webp"}
+
+    def __init__(self, image_format="jpg", quality=90, max_width=None, threads=2, queue_size=64):
+        self.logger = Logger(__name__)
+        self.image_format = image_format
+        self.quality = quality
+        self.max_width = max_width
+        self.written = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self.threads = max(1, threads)
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self.start()
+
+    def start(self):
+        with self._start_lock:
+            if self._threads:
+                return
+
+            self._threads = [
+                threading.Thread(target=self._run, name=f"image-writer-{i}", daemon=True)
+                for i in range(self.threads)
+            ]
+
+            for thread in self._threads:
+                thread.start()
+
+    @property
+    def extension(self):
+        return self.EXTENSIONS[self.image_format]
+
+    @property
+    def params(self):
+        if self.image_format == "jpg":
+            return [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+
+        if self.image_format == "webp":
+            return [cv2.IMWRITE_WEBP_QUALITY, self.quality]
+
+        return [cv2.IMWRITE_PNG_COMPRESSION, 1]  # Favor speed over size
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def submit(self, file_path, frame, analyzer=None, prepared=False) -> str:
+        """Queues `frame` for writing; `prepared` frames already come from `prepare` and are not copied again."""
+        if not self._threads:
+            self.start()  # Closed by an earlier run, e.g. a second analyze() of the same VideoFileAnalyzer
+
+        self._queue.put((str(file_path), frame if prepared else self.prepare(frame), analyzer))
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+
+        return str(file_path)
+
+    def prepare(self, frame):
+        height, width = frame.shape[:2]
+
+        if self.max_width and width > self.max_width:
+            size = (self.max_width, max(1, round(height * self.max_width / width)))
+            return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+        return frame.copy()
+
+    def flush(self):
+        self._queue.join()
+
+    def close(self):
+        with self._start_lock:
+            self.flush()
+
+            for _ in self._threads:
+                self._queue.put(None)
+
+            for thread in self._threads:
+                thread.join()
+
+            self._threads = []
+
+        self.logger.info(f"Images written: {self.written}, failed: {self.failed}, max queue depth: {self.max_queue_depth}")
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+
+            try:
+                if item is None:
+                    return
+
+                self._write(*item)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, file_path, image, analyzer):
+        start = time.perf_counter()
+
+        try:
+            written = cv2.imwrite(file_path, image, self.params)
+            Metrics.instance().observe("stage_seconds", time.perf_counter() - start, stage="image_save", analyzer=analyzer)
+
+            if not written:
+                self.logger.error(f"Failed to write image: {file_path}")
+        except Exception as e:
+            written = False
+            self.logger.error(f"Failed to write image: {file_path}", e)
+
+        with self._lock:
+            if written:
+                self.written += 1
+            else:
+                self.failed += 1
@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+from sdk.app.logger import Logger
+
+class ModelPool:
+    """Process-wide registry of loaded models that analyzers borrow from.
+
+    Models are keyed by a hashable key (e.g. `("yolo", "yolov8n.pt")`), loaded
+    and warmed up on first use, and reference counted. Models nobody holds
+    stay cached until the pool exceeds its capacity, then the least recently
+    used ones are evicted.
+
+    Borrowers share the same model object, so they must not call it
+    concurrently from different threads.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, capacity=4):
+        self.logger = Logger(__name__)
+        self.capacity = capacity
+        self._models = OrderedDict()
+        self._refs = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def instance(cls) -> "ModelPool":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __contains__(self, key):
+        return key in self._models
+
+    def __len__(self):
+        return len(self._models)
+
+    def acquire(self, key, loader, warmup=None):
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+            else:
+                start_time = time.time()
+                model = loader()
+
+                if warmup:
+                    warmup(model)
+
+                self._models[key] = model
+                self.logger.finished(f"Model loaded: {key}", start_time)
+
+            self._refs[key] = self._refs.get(key, 0) + 1
+            self._evict()
+
+            return self._models[key]
+
+    def release(self, key):
+        with self._lock:
+            if self._refs.get(key, 0) > 0:
+                self._refs[key] -= 1
+
+            self._evict()
+
+    def register(self, key, model):
+        """Places an already loaded model in the pool, e.g. a stub for benchmarks."""
+        with self._lock:
+            self._models[key] = model
+            self._models.move_to_end(key)
+            self._refs.setdefault(key, 0)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            for key in [key for key in self._models if not self._refs.get(key)]:
+                self._remove(key)
+
+    def _evict(self):
+        while len(self._models) > self.capacity:
+            idle = next((key for key in self._models if not self._refs.get(key)), None)
+
+            if idle is None:
+                break
+
+            self._remove(idle)
+
+    def _remove(self, key):
+        model = self._models.pop(key)
+        self._refs.pop(key, None)
+
+        close = getattr(model, "close", None)
+        if callable(close):
+            close()
+
+        self.logger.info(f"Model evicted: {key}")
@@ -1,189 +1,328 @@
 import cv2
 import mediapipe as mp
+import numpy as np
 import json
 import os
 from glob import glob
+from pathlib import Path
 
 from sdk.app.logger import Logger
+from sdk.app.metrics import Metrics
 from sdk.detection.core.analyzer_result import AnalyzerResult
+from sdk.detection.core.checkpoint import Checkpoint
 from sdk.detection.core.core_analyzer import CoreAnalyzer
 from sdk.detection.head.head_request import HeadRequest
+from sdk.detection.head.landmark_series import LandmarkSeries
+from sdk.detection.head.look_away_tracker import LookAwayTracker
+from sdk.detection.report.report_writer import ReportWriter
+from sdk.video.frame_source import FrameSource
 
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # 2 = warning and info messages suppressed
 os.environ['GLOG_minloglevel'] = '2'  # 0 = all, 1 = warning+, 2 = error+, 3 = fatal only
 
 class HeadFileAnalyzer(CoreAnalyzer):
     def __init__(self, request: HeadRequest):
+        super().__init__()
         self.logger = Logger(__name__)
         self.request = request
-        self.face_mesh = mp.solutions.face_mesh.FaceMesh(static_image_mode=False)
+        self.series = LandmarkSeries()
+        self.box_source = None  # Callable returning person boxes (P, 5) for a frame index, or None when unknown
+        self.face_mesh = self.borrow_model(("face_mesh", request.static_frames), lambda: mp.solutions.face_mesh.FaceMesh(static_image_mode=request.static_frames, max_num_faces=1), self.warmup)
+        self.roi_mesh = None
+
+        if request.cascade:
+            # Crops of different people are unrelated images, so tracking between calls must be off
+            self.roi_mesh = self.borrow_model(("face_mesh", True), lambda: mp.solutions.face_mesh.FaceMesh(static_image_mode=True, max_num_faces=1), self.warmup_roi)
+
+        self.reset_tracking()
+        self.tracker = self.create_tracker()  # Look-away segment across analyze_frame calls
         #self.holistic = mp.solutions.holistic.Holistic(static_image_mode=False)
 
     @property
     def type(self):
         return "head"
+
+    @property
+    def reports_segments(self):
+        return True
+
+    def create_tracker(self) -> LookAwayTracker:
+        return LookAwayTracker(self.request.threshold_look_away_duration, self.frame_skip, self.request.evidence_frames)
+
+    def warmup(self, face_mesh):
+        face_mesh.process(np.zeros((480, 640, 3), dtype=np.uint8))
+
+    def warmup_roi(self, face_mesh):
+        face_mesh.process(np.zeros((self.request.roi_size, self.request.roi_size, 3), dtype=np.uint8))
+
+    def reset_tracking(self):
+        """Restarts the pooled tracking FaceMesh graph, so the face tracked at the end of the
+        previous video (or the warmup frame) does not seed the next one."""
+        reset = getattr(self.face_mesh, "reset", None)
+
+        if not self.request.static_frames and callable(reset):
+            reset()
     
     def _is_looking_away(self, frame_index, landmarks):
-        result = False
-        deviation = 0.0
-
-        if self.request.look_mode == "gaze":
-            left_eye = landmarks[33]
-            right_eye = landmarks[263]
-            eye_center_x = (left_eye.x + right_eye.x) / 2
-            deviation = abs(eye_center_x - 0.5)
-            result = deviation > self.request.look_away_threshold
-
-        elif self.request.look_mode == "yaw":
-            nose_x = landmarks[1].x
-            deviation = abs(nose_x - 0.5)
-            result = deviation > self.request.look_away_threshold
-
-        elif self.request.look_mode == "yaw_pitch":
-            nose_x = landmarks[1].x
-            nose_y = landmarks[1].y
-            dx = abs(nose_x - 0.5)
-            dy = abs(nose_y - 0.5)
-            deviation = max(dx, dy)
-            result = (dx > self.request.look_away_threshold or dy > self.request.look_away_threshold)
+        # All look modes are evaluated in one pass and kept in self.series,
+        # so other modes and thresholds can be checked later without FaceMesh
+        deviations = self.series.append(frame_index, LandmarkSeries.to_array(landmarks))
+        deviation, result = self.get_look_away(deviations, self.request.look_mode, self.request.look_away_threshold)
+        deviation, result = float(deviation), bool(result)
 
         if result:
-            self.logger.info(f"Looking away in frame {frame_index}: Deviation = {deviation:.3f}")
+            self.logger.debug("Looking away in frame %d: Deviation = %.3f", frame_index, deviation, every=1.0)
 
         confidence = min(1.0, deviation / self.request.look_away_threshold)
 
         return result, confidence
 
+    @staticmethod
+    def get_look_away(deviations, look_mode, threshold):
+        """Picks `look_mode` from LandmarkSeries deviations (..., 3); returns the deviations and whether they exceed `threshold`."""
+        deviations = deviations[..., LandmarkSeries.LOOK_MODES.index(look_mode)]
+        return deviations, deviations > threshold
+
     def analyze123(self):
         if os.path.isfile(self.request.input):
             result = self.analyze_file(self.request.input)
             self.save_result(result)
 
         elif os.path.isdir(self.request.input):
-            result = self.analyze_folder(self.request.input)
-            self.save_results(result)
+            self.analyze_folder(self.request.input)
 
         else:
             self.logger.error(f"Invalid input path in request {self.request}")
 
     def analyze_folder(self, folder_path):
-        results = []
-        for file_path in glob(os.path.join(folder_path, "*.mp4")):
-            self.logger.info(f"Analyzing: {file_path}")
-            result = self.analyze_file(file_path)
-            self.save_result(result)
-            results.append(result)
-        
-        output = {
-            "results": results
+        # Each file's result is streamed as one line instead of being collected in memory
+        writer = ReportWriter(self.reports_json_path)
+        detected = 0
+
+        try:
+            for file_path in glob(os.path.join(folder_path, "*.mp4")):
+                self.logger.info(f"Analyzing: {file_path}")
+                result = self.analyze_file(file_path)
+                self.save_result(result)
+                writer.write({"file": file_path, **result})
+                detected += int(result["detected"])
+        finally:
+            summary = {
+                "files": writer.count,
+                "detected": detected
+            }
+            writer.close(summary)
+
+        return summary
+    
+    def analyze_file(self, file_path: str):
+        checkpoint = self.get_checkpoint(file_path)
+        state = checkpoint.load() if self.request.resume else None
+
+        # A resumed run keeps the evidence images written before the interruption
+        self.set_file(file_path, clean=state is None)
+        self.series.clear()
+        self.reset_tracking()
+
+        head_tracking_flags = []
+        self.tracker = self.create_tracker()
+        start_frame = 0
+
+        if state:
+            head_tracking_flags = state["flags"]
+            self.set_state(state["analyzer"])
+            start_frame = state["frame_index"] + 1
+            self.logger.info(f"Resuming {file_path} from frame {start_frame}")
+
+        source = FrameSource(file_path, self.wants_frame, start_frame=start_frame, buffer_pool_size=FrameSource.QUEUE_SIZE + 2)  # Queue, current frame and the one being decoded
+        if not source.open():
+            return self.get_result([])
+
+        frame_rate = source.fps
+
+        with source:
+            for frame in source:
+                result = self.analyze_frame(frame.index, frame.image)
+                head_tracking_flags.extend(self.track_result(frame.index, frame.timestamp, result, lambda: self.image_writer.prepare(frame.image), frame_rate))
+
+                if checkpoint.is_due():
+                    self.image_writer.flush()
+                    checkpoint.save({
+                        "frame_index": frame.index,
+                        "flags": head_tracking_flags,
+                        "analyzer": self.get_state()
+                    })
+
+                frame.release()
+
+        # Handle end-of-video last segment
+        head_tracking_flags.extend(self.close_segments(frame_rate))
+
+        self.image_writer.flush()
+        checkpoint.remove()
+
+        result = self.get_result(head_tracking_flags)
+        return result
+
+    def get_checkpoint(self, file_path) -> Checkpoint:
+        stat = os.stat(file_path) if os.path.isfile(file_path) else None
+        signature = {
+            "file": (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns) if stat else file_path,
+            "request": self.request.model_dump(exclude={"input", "clean_output", "resume", "checkpoint_interval"})
         }
 
-        return output
-    
-    # def analyze_file(self, file_path: str):
-    #     self.set_file(file_path)
+        return Checkpoint(Path(file_path).parent / Path(file_path).stem / f"{self.type}.checkpoint.pkl", self.request.checkpoint_interval, signature)
 
-    #     cap = cv2.VideoCapture(file_path)
-    #     frame_index = 0
-    #     frame_rate = cap.get(cv2.CAP_PROP_FPS) or 30
-        
-    #     head_tracking_flags = []
-        
-    #     while cap.isOpened():
-    #         ret, frame = cap.read()
-    #         if not ret:
-    #             break
+    def get_state(self):
+        return {"series": self.series, "tracker": self.tracker}
 
-    #         self.analyze_frame(cap, frame_index, head_tracking_flags, frame)
+    def set_state(self, state):
+        self.series = state["series"]
+        self.tracker = state.get("tracker") or self.create_tracker()
 
-    #         frame_index += 1
+    def track_result(self, frame_index, timestamp, result, capture, fps) -> list[dict]:
+        if result is None or result.skipped:
+            return []
 
-    #     cap.release()
+        if result.success:
+            # Frames are only kept in memory until the segment qualifies
+            self.tracker.update(frame_index, timestamp, result.confidence, capture)
+            return []
 
-    #     result = self.get_result(head_tracking_flags)
+        return self.close_segments(fps)
 
-    #     return result
+    def close_segments(self, fps) -> list[dict]:
+        closed = self.tracker.close(fps)
 
-    def analyze_file(self, file_path: str):
-        self.set_file(file_path)
+        if closed is None:
+            return []
 
-        cap = cv2.VideoCapture(file_path)
-        frame_index = 0
-        frame_rate = cap.get(cv2.CAP_PROP_FPS) or 30  # Default to 30
+        segment, evidence = closed
 
-        head_tracking_flags = []
-        look_away_segment = []
-        is_looking_away = False
-        look_away_frame_count = 0
+        segment["images"] = [
+            self.save_frame(image, self.to_timestamp(timestamp), frame_index, prepared=True)  # Copied by prepare when they were kept
+            for frame_index, timestamp, _, image in evidence
+        ]
+        segment["image"] = segment["images"][0]
+        segment["timestamp"] = self.to_timestamp(segment["start"])
+        segment["look_mode"] = self.request.look_mode
+
+        return [segment]
+
+    def analyze_frame(self, frame_index, frame) -> AnalyzerResult:
+        result = AnalyzerResult.default()
+
+        try:
+            if not self.wants_frame(frame_index):
+                result.skipped = True
+                return result
+
+            boxes = self.box_source(frame_index) if self.roi_mesh and self.box_source else None
 
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
+            # Without people found in this frame, the full frame is searched for a face instead
+            if boxes is not None and len(boxes):
+                return self.analyze_people(frame_index, frame, boxes)
 
-            if frame_index % self.request.frame_skip == 0:
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            metrics = Metrics.instance()
+
+            with metrics.timer("stage_seconds", stage="color", analyzer=self.type):
+                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.get_buffer("rgb", frame.shape))
+
+            with metrics.timer("stage_seconds", stage="inference", analyzer=self.type):
                 mesh_result = self.face_mesh.process(rgb)
 
-                if mesh_result.multi_face_landmarks:
-                    face_landmarks = mesh_result.multi_face_landmarks[0].landmark
-                    detected, confidence = self._is_looking_away(frame_index, face_landmarks)
-
-                    if detected:
-                        is_looking_away = True
-                        look_away_frame_count += self.request.frame_skip
-                        timestamp = self.to_timestamp(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
-                        image_path = self.save_frame(frame, timestamp)
-                        look_away_segment.append({
-                            "confidence": confidence,
-                            "timestamp": timestamp,
-                            "image": image_path
-                        })
-                    else:
-                        if is_looking_away:
-                            duration = look_away_frame_count / frame_rate
-                            if duration >= self.request.threshold_look_away_duration:
-                                head_tracking_flags.extend(look_away_segment)
-                            # reset
-                            look_away_segment = []
-                            look_away_frame_count = 0
-                            is_looking_away = False
-
-            frame_index += 1
+            metrics.inc("frames_total", analyzer=self.type)
 
-        # Handle end-of-video last segment
-        if is_looking_away:
-            duration = look_away_frame_count / frame_rate
-            if duration >= self.request.threshold_look_away_duration:
-                head_tracking_flags.extend(look_away_segment)
+            if not mesh_result.multi_face_landmarks:
+                result.skipped = True  # Skip if no face detected
+                return result
 
-        cap.release()
+            with metrics.timer("stage_seconds", stage="postprocess", analyzer=self.type):
+                face_landmarks = mesh_result.multi_face_landmarks[0].landmark
+                detected, confidence = self._is_looking_away(frame_index, face_landmarks)
+
+            result.success = detected
+            result.confidence = round(confidence, 2)
+            result.detail = {"look_mode": self.request.look_mode}
+        except Exception as e:
+            self.logger.error(f"Face mesh inference failed at frame {frame_index}", e)
 
-        result = self.get_result(head_tracking_flags)
         return result
 
-    def analyze_frame(self, cap, frame_index, head_tracking_flags, frame):
-        if frame_index % self.request.frame_skip == 0:
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            mesh_result = self.face_mesh.process(rgb)
+    def analyze_people(self, frame_index, frame, boxes) -> AnalyzerResult:
+        result = AnalyzerResult.default()
+        metrics = Metrics.instance()
+        height, width = frame.shape[:2]
+        size = self.request.roi_size
 
-            if not mesh_result.multi_face_landmarks:
-                return  # Skip if no face detected
+        rois = []
+        faces = []
+
+        for box in boxes:
+            roi = self.get_head_roi(box, width, height)
+            if roi is None:
+                continue
 
-            face_landmarks = mesh_result.multi_face_landmarks[0].landmark
+            x1, y1, x2, y2 = roi
 
-            is_detected, confidence = self._is_looking_away(frame_index, face_landmarks)
+            with metrics.timer("stage_seconds", stage="color", analyzer=self.type):
+                crop = cv2.resize(frame[y1:y2, x1:x2], (size, size), dst=self.get_buffer("roi", (size, size, 3)), interpolation=cv2.INTER_AREA)
+                rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB, dst=self.get_buffer("roi_rgb", (size, size, 3)))
 
-            if is_detected:
-                timestamp = self.to_timestamp(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
-                image_path = self.save_frame(frame, timestamp)
+            with metrics.timer("stage_seconds", stage="inference", analyzer=self.type):
+                mesh_result = self.roi_mesh.process(rgb)
+
+            if mesh_result.multi_face_landmarks:
+                rois.append(roi)
+                faces.append(LandmarkSeries.to_array(mesh_result.multi_face_landmarks[0].landmark))
+
+        metrics.inc("frames_total", analyzer=self.type)
+        metrics.inc("rois_total", len(boxes), analyzer=self.type)
+
+        if not faces:
+            result.skipped = True
+            return result
+
+        with metrics.timer("stage_seconds", stage="postprocess", analyzer=self.type):
+            # Deviations are measured within each head crop, which is centered on
+            # the person, so people away from the frame center are not flagged
+            deviations, looking_away = self.get_look_away(self.series.append(frame_index, np.stack(faces)), self.request.look_mode, self.request.look_away_threshold)
+
+            people = []
+
+            for roi, points, deviation, away in zip(rois, faces, deviations, looking_away):
+                nose = LandmarkSeries.to_frame(points[LandmarkSeries.NOSE], roi, (width, height))
+                people.append({
+                    "box": [int(v) for v in roi],
+                    "nose": [round(float(nose[0]), 4), round(float(nose[1]), 4)],
+                    "deviation": round(float(deviation), 3),
+                    "looking_away": bool(away)
+                })
+
+        result.success = bool(looking_away.any())
+        result.confidence = round(min(1.0, float(deviations.max()) / self.request.look_away_threshold), 2)
+        result.detail = {"look_mode": self.request.look_mode, "people": people}
+
+        return result
+
+    def get_head_roi(self, box, width, height):
+        """Square crop around the upper part of a person box, clipped to the frame."""
+        x1, y1, x2, y2 = (float(v) for v in box[:4])
+        head_height = (y2 - y1) * self.request.roi_head_fraction
+        side = max(x2 - x1, head_height)
+        cx = (x1 + x2) / 2
+        cy = y1 + head_height / 2
+
+        left = max(0, int(cx - side / 2))
+        top = max(0, int(cy - side / 2))
+        right = min(width, int(cx + side / 2))
+        bottom = min(height, int(cy + side / 2))
+
+        if right - left < 8 or bottom - top < 8:
+            return None
+
+        return left, top, right, bottom
 
-                head_tracking_flags.append({
-                        "confidence": confidence, 
-                        "timestamp": timestamp, 
-                        "image": image_path
-                        })
-                    
     def get_result(self, head_tracking_flags):
         total_detections = len(head_tracking_flags)
         overall_confidence = 0.0
@@ -207,6 +346,3 @@ class HeadFileAnalyzer(CoreAnalyzer):
         }
         
         return result
-
-    def analyze_frame(self, frame_index, frame) -> AnalyzerResult:
-        pass
\ No newline at end of file
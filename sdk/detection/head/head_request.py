@@ -11,6 +11,13 @@ class HeadRequest(CoreRequest):
     frame_skip: int = Field(5, ge=0, description="Number of frames to skip between detections")
     look_away_threshold: float = Field(0.6, ge=0.0, le=1.0, description="Threshold to detect looking away (0.0 to 1.0)")
     threshold_look_away_duration: int = Field(5, ge=0, description="Threshold to detect looking away duration in seconds")
+    evidence_frames: int = Field(3, ge=1, description="Maximum evidence images saved per look-away segment")
+    cascade: bool = Field(False, description="Run FaceMesh on head crops of detected person boxes instead of the full frame")
+    roi_size: int = Field(192, ge=64, description="Side in pixels of the head crop sent to FaceMesh in cascade mode")
+    roi_head_fraction: float = Field(0.4, gt=0.0, le=1.0, description="Upper fraction of a person box treated as the head region")
+    checkpoint_interval: float = Field(60.0, ge=0.0, description="Seconds between checkpoints of a running analyze_file, 0 to disable")
+    resume: bool = Field(True, description="Continue from a matching checkpoint left by an interrupted analyze_file")
+    static_frames: bool = Field(False, description="Frames are unrelated images (e.g. sparse scan samples), so FaceMesh detects faces anew on each one")
     
     @classmethod
     def default(cls, input) -> "HeadRequest":
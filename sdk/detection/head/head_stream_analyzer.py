@@ -1,11 +1,31 @@
+import threading
+import time
 import cv2
 import mediapipe as mp
+from sdk.app.logger import Logger
+from sdk.app.metrics import Metrics
+from sdk.video.latest_slot import LatestSlot
+from sdk.video.live_source import LiveSource
 
 class HeadStreamAnalyzer:
-    def __init__(self, look_away_thresh=0.3):
+    """Live head analysis as a pipeline of capture, inference and output stages.
+
+    Each stage hands over only its latest item, so when inference is slower
+    than the source, stale frames are dropped instead of queueing up latency.
+    """
+
+    def __init__(self, look_away_thresh=0.3, source=0, headless=False, realtime=None, holistic=True):
+        self.logger = Logger(__name__)
         self.look_away_thresh = look_away_thresh
+        self.source = source
+        self.headless = headless
+        self.realtime = realtime
         self.face_mesh = mp.solutions.face_mesh.FaceMesh()
-        self.holistic = mp.solutions.holistic.Holistic()
+        self.holistic = mp.solutions.holistic.Holistic() if holistic else None
+        self.results = LatestSlot()
+        self.processed = 0
+        self.shown = 0
+        self._stop = threading.Event()
 
     def _is_looking_away(self, landmarks, img_width):
         left_eye_x = landmarks[33].x * img_width
@@ -14,42 +34,115 @@ class HeadStreamAnalyzer:
         return abs(eye_center - img_width / 2) > (img_width * self.look_away_thresh)
 
     def start(self):
-        cap = cv2.VideoCapture(0)
-        print("Starting live stream analysis... Press 'q' to quit.")
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
+        source = LiveSource(self.source, self.realtime)
+        inference = threading.Thread(target=self._infer, args=(source,), name="live-inference", daemon=True)
+
+        self.logger.started(f"Starting live stream analysis on [{self.source}]" + ("" if self.headless else "... Press 'q' to quit."))
+
+        # When the source fails to open, its error propagates without starting or joining the inference thread
+        try:
+            with source:
+                inference.start()
+
+                try:
+                    self._output()
+                except KeyboardInterrupt:
+                    pass
+                finally:
+                    self._stop.set()
+                    self.results.close()
+                    inference.join()
+
+            self.logger.finished(f"Live stream ended. Captured: {source.captured}, processed: {self.processed}, shown: {self.shown}, dropped: {source.dropped + self.results.dropped}")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if not self.headless:
+                cv2.destroyAllWindows()
+
+    def analyze(self, frame) -> tuple[int, list[str]]:
+        rgb = cv2.cvtColor(frame.image, cv2.COLOR_BGR2RGB)
+        mesh_result = self.face_mesh.process(rgb)
+        pose_result = self.holistic.process(rgb) if self.holistic else None
+
+        info = []
+        faces = 0
+
+        if mesh_result.multi_face_landmarks:
+            faces = len(mesh_result.multi_face_landmarks)
+
+            if faces > 1:
+                info.append("Multiple faces detected!")
 
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            mesh_result = self.face_mesh.process(rgb)
-            pose_result = self.holistic.process(rgb)
+            landmarks = mesh_result.multi_face_landmarks[0].landmark
+            if self._is_looking_away(landmarks, frame.image.shape[1]):
+                info.append("Looking Away!")
 
-            info = []
+        if pose_result and pose_result.pose_landmarks:
+            l = pose_result.pose_landmarks.landmark[11]
+            r = pose_result.pose_landmarks.landmark[12]
+            if abs(l.x - r.x) > 0.5:
+                info.append("Head Turn Detected!")
 
-            if mesh_result.multi_face_landmarks:
-                cv2.putText(frame, f"Faces: {len(mesh_result.multi_face_landmarks)}", (10, 30),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        return faces, info
 
-                if len(mesh_result.multi_face_landmarks) > 1:
-                    info.append("Multiple faces detected!")
+    def _infer(self, source: LiveSource):
+        metrics = Metrics.instance()
 
-                landmarks = mesh_result.multi_face_landmarks[0].landmark
-                if self._is_looking_away(landmarks, frame.shape[1]):
-                    info.append("Looking Away!")
+        try:
+            while not self._stop.is_set():
+                frame = source.get(timeout=0.1)
 
-            if pose_result.pose_landmarks:
-                l = pose_result.pose_landmarks.landmark[11]
-                r = pose_result.pose_landmarks.landmark[12]
-                if abs(l.x - r.x) > 0.5:
-                    info.append("Head Turn Detected!")
+                if frame is None:
+                    if source.slot.closed:
+                        break
+                    continue
+
+                with metrics.timer("stage_seconds", stage="inference", analyzer="live"):
+                    faces, info = self.analyze(frame)
+
+                self.processed += 1
+                self.results.put((frame, faces, info))
+        except Exception as e:
+            self.logger.error("Live inference failed", e)
+        finally:
+            self.results.close()
+
+    def _output(self):
+        metrics = Metrics.instance()
+
+        while True:
+            result = self.results.get(timeout=0.1)
+
+            if result is None:
+                if self.results.closed:
+                    break
+                if not self.headless and cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+                continue
+
+            frame, faces, info = result
+            latency = time.perf_counter() - frame.captured_at
+            metrics.observe("latency_seconds", latency, analyzer="live")
+            self.shown += 1
+
+            if self.headless:
+                if info:
+                    self.logger.info(f"Frame {frame.index} [{latency * 1000:.0f} ms]: {', '.join(info)}")
+                else:
+                    self.logger.debug("Frame %d [%.0f ms]: faces %d", frame.index, latency * 1000, faces, every=1.0)
+                continue
+
+            image = frame.image
+
+            if faces:
+                cv2.putText(image, f"Faces: {faces}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
 
             for i, txt in enumerate(info):
-                cv2.putText(frame, txt, (10, 60 + 30 * i), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                cv2.putText(image, txt, (10, 60 + 30 * i), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
 
-            cv2.imshow("Live Interview Monitor", frame)
+            cv2.putText(image, f"{latency * 1000:.0f} ms", (10, image.shape[0] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
+            cv2.imshow("Live Interview Monitor", image)
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 break
-
-        cap.release()
-        cv2.destroyAllWindows()
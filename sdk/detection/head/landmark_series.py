@@ -0,0 +1,99 @@
+from itertools import islice
+import numpy as np
+
+class LandmarkSeries:
+    """Time series of per-frame look deviations computed from face landmarks.
+
+    Landmarks are converted once per frame into an (N, 3) array, and the
+    deviations for every look mode are computed together in one vectorized
+    pass. They are stored in preallocated arrays, so any look mode and
+    threshold can be evaluated afterwards without rerunning FaceMesh.
+    """
+
+    LOOK_MODES = ("yaw", "yaw_pitch", "gaze")
+    LANDMARK_COUNT = 468
+    NOSE = 1
+    LEFT_EYE = 33
+    RIGHT_EYE = 263
+
+    def __init__(self, capacity=4096):
+        self.frame_indexes = np.empty(capacity, np.int64)
+        self.deviations = np.empty((capacity, len(self.LOOK_MODES)), np.float32)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @classmethod
+    def to_array(cls, landmarks) -> np.ndarray:
+        """Converts MediaPipe landmarks to a (468, 3) float32 array of normalized x, y, z."""
+        flat = np.fromiter(
+            (value for landmark in islice(landmarks, cls.LANDMARK_COUNT) for value in (landmark.x, landmark.y, landmark.z)),
+            dtype=np.float32,
+            count=cls.LANDMARK_COUNT * 3
+        )
+        return flat.reshape(cls.LANDMARK_COUNT, 3)
+
+    @classmethod
+    def get_deviations(cls, points) -> np.ndarray:
+        """Maps (..., 468, 3) landmarks to (..., 3) deviations from center, one per look mode."""
+        nose = np.abs(points[..., cls.NOSE, :2] - 0.5)
+        eye_center_x = points[..., [cls.LEFT_EYE, cls.RIGHT_EYE], 0].mean(axis=-1)
+
+        yaw = nose[..., 0]
+        yaw_pitch = nose.max(axis=-1)
+        gaze = np.abs(eye_center_x - 0.5)
+
+        return np.stack((yaw, yaw_pitch, gaze), axis=-1)
+
+    @staticmethod
+    def to_frame(points, roi, frame_size) -> np.ndarray:
+        """Maps landmarks normalized to a crop at `roi` (x1, y1, x2, y2) back to normalized frame coordinates."""
+        x1, y1, x2, y2 = roi
+        width, height = frame_size
+        scale = np.array([(x2 - x1) / width, (y2 - y1) / height, (x2 - x1) / width], dtype=np.float32)
+        offset = np.array([x1 / width, y1 / height, 0.0], dtype=np.float32)
+
+        return points * scale + offset
+
+    def append(self, frame_index, points) -> np.ndarray:
+        """Stores the deviations of one face (468, 3), or the largest per mode of several faces (P, 468, 3).
+
+        Returns the deviations of every face.
+        """
+        if self._size == len(self.frame_indexes):
+            self._grow(self._size * 2)
+
+        deviations = self.get_deviations(points)
+
+        self.frame_indexes[self._size] = frame_index
+        self.deviations[self._size] = deviations.max(axis=0) if deviations.ndim > 1 else deviations
+        self._size += 1
+
+        return deviations
+
+    def clear(self):
+        self._size = 0
+
+    def deviation(self, look_mode) -> np.ndarray:
+        return self.deviations[:self._size, self.LOOK_MODES.index(look_mode)]
+
+    def evaluate(self, rules) -> np.ndarray:
+        """Evaluates (look_mode, threshold) rules on every stored frame.
+
+        Returns a (frames, rules) boolean array, True where the frame looks away.
+        """
+        columns = [self.LOOK_MODES.index(look_mode) for look_mode, _ in rules]
+        thresholds = np.array([threshold for _, threshold in rules], dtype=np.float32)
+
+        return self.deviations[:self._size, columns] > thresholds
+
+    def _grow(self, capacity):
+        frame_indexes = np.empty(capacity, np.int64)
+        deviations = np.empty((capacity, len(self.LOOK_MODES)), np.float32)
+
+        frame_indexes[:self._size] = self.frame_indexes[:self._size]
+        deviations[:self._size] = self.deviations[:self._size]
+
+        self.frame_indexes = frame_indexes
+        self.deviations = deviations
@@ -0,0 +1,91 @@
+class LookAwayTracker:
+    """Groups consecutive look-away frames into segments.
+
+    Candidate frames are held in memory (the first frames of the segment
+    plus the peak-confidence frame) and are only handed out once the segment
+    lasts at least `min_duration` seconds, so short glances never cost a disk
+    write. Images are captured lazily: `capture` is only called for a frame
+    that becomes a candidate, so a long segment does not copy every frame.
+    """
+
+    def __init__(self, min_duration, frame_step=1, max_candidates=3):
+        self.min_duration = min_duration
+        self.frame_step = frame_step  # Frames each analyzed frame stands for
+        self.max_candidates = max(1, max_candidates)
+        self._candidates = []
+        self._segment = None
+        self._peak = None
+
+    @property
+    def active(self):
+        return self._segment is not None
+
+    def update(self, frame_index, timestamp, confidence, capture=None):
+        """Adds a look-away frame to the current segment, starting one if needed.
+
+        `capture` returns the frame's evidence image and is only called if the frame is kept.
+        """
+        if self._segment is None:
+            self._segment = {
+                "start": timestamp,
+                "end": timestamp,
+                "start_frame": frame_index,
+                "frames": 0,
+                "confidence_sum": 0.0
+            }
+
+        segment = self._segment
+        segment["end"] = timestamp
+        segment["frames"] += 1
+        segment["confidence_sum"] += confidence
+
+        # One slot is left for the peak
+        keep = len(self._candidates) < self.max_candidates - 1
+        is_peak = self._peak is None or confidence > self._peak[2]
+
+        if not keep and not is_peak:
+            return
+
+        candidate = (frame_index, timestamp, confidence, capture() if capture else None)
+
+        if keep:
+            self._candidates.append(candidate)
+
+        if is_peak:
+            self._peak = candidate
+
+    def close(self, frame_rate):
+        """Ends the current segment.
+
+        Returns `(segment, candidates)` when the segment qualifies, otherwise
+        None. Candidates are `(frame_index, timestamp, confidence, image)`
+        tuples, peak frame first.
+        """
+        segment, peak, candidates = self._segment, self._peak, list(self._candidates)
+
+        self._segment = None
+        self._peak = None
+        self._candidates.clear()
+
+        if segment is None:
+            return None
+
+        duration = segment["frames"] * self.frame_step / frame_rate
+        if duration < self.min_duration:
+            return None
+
+        record = {
+            "start": segment["start"],
+            "end": segment["end"],
+            "duration": round(duration, 3),
+            "start_frame": segment["start_frame"],
+            "peak_frame": peak[0],
+            "peak_timestamp": peak[1],
+            "peak_confidence": peak[2],
+            "confidence": round(segment["confidence_sum"] / segment["frames"], 2),
+            "frames": segment["frames"]
+        }
+
+        evidence = [peak] + [candidate for candidate in candidates if candidate[0] != peak[0]]
+
+        return record, evidence
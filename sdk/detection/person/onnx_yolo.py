@@ -0,0 +1,211 @@
+import os
+import time
+from pathlib import Path
+import cv2
+import numpy as np
+from sdk.app.logger import Logger
+
+class OnnxBoxes:
+    def __init__(self, data):
+        self.data = data  # (N, 6) of x1, y1, x2, y2, confidence, class, like ultralytics' boxes.data
+
+class OnnxDetection:
+    def __init__(self, data):
+        self.boxes = OnnxBoxes(data)
+
+class OnnxYolo:
+    """YOLOv8 detector on ONNX Runtime (CPU), called like `ultralytics.YOLO`.
+
+    A `.pt` model is exported to ONNX once and cached next to it (and, when
+    `quantize` is set, dynamically quantized to INT8). Frames are letterboxed
+    to `image_size`, run as one batch, and decoded with class-aware NMS.
+    """
+
+    def __init__(self, model_path, image_size=640, confidence=0.25, iou=0.7, intra_op_threads=0, inter_op_threads=1):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("The onnx backend requires onnxruntime: pip install onnxruntime onnx") from e
+
+        self.logger = Logger(__name__)
+        self.model_path = str(model_path)
+        self.image_size = image_size
+        self.confidence = confidence
+        self.iou = iou
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = intra_op_threads  # 0 lets onnxruntime pick the physical core count
+        options.inter_op_num_threads = inter_op_threads
+
+        if inter_op_threads > 1:
+            options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+
+        self.session = ort.InferenceSession(self.model_path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        self.dynamic_batch = not isinstance(self.session.get_inputs()[0].shape[0], int)
+        self._blob = None
+        self._buffers = {}
+
+    @classmethod
+    def load(cls, model_name, quantize=False, intra_op_threads=0, inter_op_threads=1) -> "OnnxYolo":
+        model_path = cls.export(model_name) if model_name.endswith(".pt") else Path(model_name)
+
+        if quantize:
+            model_path = cls.quantize(model_path)
+
+        return cls(model_path, intra_op_threads=intra_op_threads, inter_op_threads=inter_op_threads)
+
+    @staticmethod
+    def export(model_name, image_size=640) -> Path:
+        """Exports a `.pt` model to ONNX with a dynamic batch axis, reusing an earlier export."""
+        onnx_path = Path(model_name).with_suffix(".onnx")
+
+        if onnx_path.is_file():
+            return onnx_path
+
+        from ultralytics import YOLO
+
+        start_time = time.time()
+        exported = YOLO(model_name).export(format="onnx", imgsz=image_size, dynamic=True, simplify=True)
+
+        if Path(exported) != onnx_path:
+            os.replace(exported, onnx_path)
+
+        Logger(__name__).finished(f"Exported {model_name} to {onnx_path}", start_time)
+
+        return onnx_path
+
+    @staticmethod
+    def quantize(onnx_path) -> Path:
+        """Dynamically quantizes the weights to INT8, reusing an earlier result."""
+        onnx_path = Path(onnx_path)
+        int8_path = onnx_path.with_name(f"{onnx_path.stem}.int8.onnx")
+
+        if int8_path.is_file():
+            return int8_path
+
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        start_time = time.time()
+        quantize_dynamic(str(onnx_path), str(int8_path), weight_type=QuantType.QUInt8)
+        Logger(__name__).finished(f"Quantized {onnx_path} to {int8_path}", start_time)
+
+        return int8_path
+
+    def __call__(self, frames, verbose=False) -> list[OnnxDetection]:
+        if not isinstance(frames, list):
+            frames = [frames]
+
+        size = self.image_size
+
+        if self._blob is None or len(self._blob) < len(frames):
+            self._blob = np.empty((len(frames), 3, size, size), np.float32)
+
+        batch = self._blob[:len(frames)]
+        transforms = [self.letterbox(frame, batch[i]) for i, frame in enumerate(frames)]
+
+        if self.dynamic_batch:
+            outputs = self.session.run(None, {self.input_name: batch})[0]
+        else:
+            outputs = np.concatenate([self.session.run(None, {self.input_name: batch[i:i + 1]})[0] for i in range(len(batch))])
+
+        return [OnnxDetection(self.postprocess(output, transform)) for output, transform in zip(outputs, transforms)]
+
+    def parity(self, reference, frames, iou=0.5) -> dict:
+        """Compares the detections with a reference model (e.g. the torch YOLO) on the same frames.
+
+        A reference box counts as matched by the best same-class box with at least `iou` overlap.
+        """
+        from sdk.detection.person.person_tracker import PersonTracker
+
+        reference_count = count = matched = 0
+        differences = []
+
+        for frame in frames:
+            expected = reference(frame, verbose=False)[0].boxes.data
+            expected = np.asarray(expected.cpu() if hasattr(expected, "cpu") else expected, dtype=np.float32).reshape(-1, 6)
+            actual = self(frame)[0].boxes.data
+
+            reference_count += len(expected)
+            count += len(actual)
+
+            if not len(expected) or not len(actual):
+                continue
+
+            overlap = PersonTracker.iou(expected[:, :4], actual[:, :4])
+            overlap[expected[:, None, 5] != actual[None, :, 5]] = 0.0
+            best = overlap.argmax(axis=1)
+            hit = overlap[np.arange(len(expected)), best] >= iou
+
+            matched += int(hit.sum())
+            differences.extend(np.abs(expected[hit, 4] - actual[best[hit], 4]).tolist())
+
+        return {
+            "frames": len(frames),
+            "reference_boxes": reference_count,
+            "boxes": count,
+            "recall": round(matched / reference_count, 4) if reference_count else 1.0,
+            "mean_confidence_diff": round(float(np.mean(differences)), 4) if differences else 0.0,
+            "max_confidence_diff": round(float(np.max(differences)), 4) if differences else 0.0
+        }
+
+    def letterbox(self, frame, out):
+        """Resizes keeping the aspect ratio and pads to a square, writing the CHW float input into `out`.
+
+        Intermediate images live in reused buffers. Returns (scale, pad x, pad y, width, height).
+        """
+        size = self.image_size
+        height, width = frame.shape[:2]
+        scale = min(size / height, size / width)
+        resized_width, resized_height = round(width * scale), round(height * scale)
+        pad_x = (size - resized_width) // 2
+        pad_y = (size - resized_height) // 2
+
+        resized = cv2.resize(frame, (resized_width, resized_height), dst=self._buffer("resized", (resized_height, resized_width, 3)), interpolation=cv2.INTER_LINEAR)
+        canvas = self._buffer("canvas", (size, size, 3))
+        canvas.fill(114)
+        canvas[pad_y:pad_y + resized_height, pad_x:pad_x + resized_width] = resized
+
+        rgb = cv2.cvtColor(canvas, cv2.COLOR_BGR2RGB, dst=self._buffer("rgb", (size, size, 3)))
+        np.multiply(rgb.transpose(2, 0, 1), np.float32(1 / 255), out=out)
+
+        return scale, pad_x, pad_y, width, height
+
+    def _buffer(self, name, shape):
+        buffer = self._buffers.get(name)
+
+        if buffer is None or buffer.shape != shape:
+            buffer = self._buffers[name] = np.empty(shape, np.uint8)
+
+        return buffer
+
+    def postprocess(self, output, transform) -> np.ndarray:
+        """Decodes one (4 + classes, anchors) output into (N, 6) boxes in frame coordinates."""
+        scale, pad_x, pad_y, width, height = transform
+        predictions = output.T
+        scores = predictions[:, 4:]
+        classes = scores.argmax(axis=1)
+        confidences = scores[np.arange(len(scores)), classes]
+
+        keep = confidences > self.confidence
+        predictions, classes, confidences = predictions[keep], classes[keep], confidences[keep]
+
+        if not len(predictions):
+            return np.empty((0, 6), np.float32)
+
+        # Center format to top-left format for NMS; offsetting by class keeps NMS per class
+        xywh = predictions[:, :4].copy()
+        xywh[:, :2] -= xywh[:, 2:] / 2
+        shifted = xywh.copy()
+        shifted[:, :2] += classes[:, None] * 4096
+
+        indexes = np.array(cv2.dnn.NMSBoxes(shifted.tolist(), confidences.tolist(), self.confidence, self.iou), dtype=np.int64).reshape(-1)
+
+        boxes = np.column_stack((xywh[indexes, :2], xywh[indexes, :2] + xywh[indexes, 2:]))
+        boxes[:, [0, 2]] = (boxes[:, [0, 2]] - pad_x) / scale
+        boxes[:, [1, 3]] = (boxes[:, [1, 3]] - pad_y) / scale
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, width)
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, height)
+
+        return np.column_stack((boxes, confidences[indexes], classes[indexes])).astype(np.float32)
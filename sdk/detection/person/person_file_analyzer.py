@@ -1,54 +1,179 @@
 import time
 import cv2
+import numpy as np
 from ultralytics import YOLO
 from sdk.app.logger import Logger  
+from sdk.app.metrics import Metrics
 from sdk.detection.core.analyzer_result import AnalyzerResult
 from sdk.detection.core.core_analyzer import CoreAnalyzer
+from sdk.detection.person.onnx_yolo import OnnxYolo
 from sdk.detection.person.person_request import PersonRequest
+from sdk.detection.person.person_tracker import PersonTracker
 
 class PersonFileAnalyzer(CoreAnalyzer):
     def __init__(self, request: PersonRequest):
+        super().__init__()
         self.logger = Logger(__name__)
         self.request = request
-        self.model = None
+        self.boxes = None
+        self.batch_boxes = {}  # Frame index -> person boxes of the latest batch
+        self.tracker = None
+
+        if request.tracking:
+            self.tracker = PersonTracker(request.detect_interval, request.track_min_confidence, request.track_iou)
+
         self.init()
+
     @property
     def type(self):
         return "person"
     
     def init(self):
         try:
-            self.model = YOLO(self.request.model_name)
-            self.logger.info(f"Model loaded: {self.request.model_name}")
+            request = self.request
+
+            if request.backend == "onnx":
+                key = ("yolo-onnx", request.model_name, request.quantize, request.intra_op_threads, request.inter_op_threads)
+                loader = lambda: OnnxYolo.load(request.model_name, request.quantize, request.intra_op_threads, request.inter_op_threads)
+            else:
+                key = ("yolo", request.model_name)
+                loader = lambda: YOLO(request.model_name)
+
+            self.model = self.borrow_model(key, loader, self.warmup)
+            self.logger.info(f"Model ready: {request.model_name} [{request.backend}{', int8' if request.quantize else ''}]")
         except Exception as e:
             self.logger.error(f"Failed to load model: {self.request.model_name}", e)
             raise
 
+    def warmup(self, model):
+        model(np.zeros((640, 640, 3), dtype=np.uint8), verbose=False)
+
     def analyze_frame(self, frame_index, frame) -> AnalyzerResult:
-        result = AnalyzerResult.default()
+        return self.analyze_frames([frame_index], [frame])[0]
+
+    def analyze_frames(self, frame_indexes, frames) -> list[AnalyzerResult]:
+        results = [AnalyzerResult.default() for _ in frames]
+        sampled = []
+
+        for i, frame_index in enumerate(frame_indexes):
+            if self.wants_frame(frame_index):
+                sampled.append(i)
+            else:
+                results[i].skipped = True
+
+        if not sampled:
+            return results
+
+        self.batch_boxes = {}
 
         try:
-            if frame_index % self.request.frame_skip != 0:
-                result.skipped = True
-                return result
+            metrics = Metrics.instance()
+            detect = self.plan_detections([frame_indexes[i] for i in sampled])
+            detected = [i for i, needed in zip(sampled, detect) if needed]
+            detections = {}
+
+            if detected:
+                start = time.perf_counter()
+                outputs = self.model([frames[i] for i in detected], verbose=False)
+
+                # Batched inference is recorded as its per-frame share
+                metrics.observe("stage_seconds", (time.perf_counter() - start) / len(detected), len(detected), stage="inference", analyzer=self.type)
+                metrics.inc("batches_total", analyzer=self.type)
+                detections = {i: output.boxes.data for i, output in zip(detected, outputs)}
 
-            results = self.model(frame, verbose=False)[0]
+            metrics.inc("frames_total", len(sampled), analyzer=self.type)
+            metrics.inc("frames_detected_total", len(detected), analyzer=self.type)
 
-            people = [det for det in results.boxes.data if int(det[5]) == 0 and det[4] > self.request.confidence]
-            total_people = len(people)
-            result.success = total_people > 1
+            for i in sampled:
+                with metrics.timer("stage_seconds", stage="postprocess", analyzer=self.type):
+                    people = self.get_people(detections[i]) if i in detections else None
 
-            if result.success:
-                for det in people:
-                    x1, y1, x2, y2 = map(int, det[:4])
-                    cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)  # green box
+                    if self.tracker:
+                        if people is not None:
+                            people = self.tracker.update(frame_indexes[i], people)
+                        else:
+                            people = self.tracker.boxes(frame_indexes[i])
 
-                result.confidence = round(float(max(det[4] for det in people)), 2)
-                result.detail = dict({"count": total_people})
+                    self.fill_result(results[i], people, tracked=i not in detections)
+
+                self.batch_boxes[frame_indexes[i]] = self.boxes
         except Exception as e:
-            self.logger.error(f"Model inference failed at frame {frame_index}", e)
+            self.logger.error(f"Model inference failed at frames {frame_indexes[sampled[0]]}-{frame_indexes[sampled[-1]]}", e)
         
-        return result
+        return results
+
+    def person_boxes(self, frame_index):
+        """Person boxes (P, 5) of x1, y1, x2, y2, confidence found in this very frame, or None if it was not analyzed (yet).
+
+        Boxes of every frame of the latest batch are kept, so a dependent
+        analyzer can catch up on the frames of a batch once it has run.
+        """
+        return self.batch_boxes.get(frame_index)
+
+    def plan_detections(self, frame_indexes) -> list[bool]:
+        """Which of the sampled frames need the model; without tracking, all of them."""
+        if not self.tracker:
+            return [True] * len(frame_indexes)
+
+        plan = []
+        last = self.tracker.last_detection
+
+        for frame_index in frame_indexes:
+            needed = self.tracker.needs_detection(frame_index, last)
+            plan.append(needed)
+
+            if needed:
+                last = frame_index
+
+        return plan
+
+    def get_people(self, boxes) -> np.ndarray:
+        """Model boxes filtered to confident persons, as (P, 5) of x1, y1, x2, y2, confidence."""
+        return self.filter_people(boxes, self.request.confidence)
+
+    @staticmethod
+    def filter_people(boxes, confidence) -> np.ndarray:
+        """Model boxes of the person class above `confidence`, as (P, 5); also used by the multi-stream engine."""
+        people = [det for det in boxes if int(det[5]) == 0 and det[4] > confidence]
+        return np.array([[float(v) for v in det[:5]] for det in people], dtype=np.float32).reshape(-1, 5)
+
+    def get_state(self):
+        return {"tracker": self.tracker, "boxes": self.boxes, "batch_boxes": self.batch_boxes}
+
+    def set_state(self, state):
+        self.tracker = state["tracker"]
+        self.boxes = state["boxes"]
+        self.batch_boxes = state.get("batch_boxes", {})
+
+    def finalize(self, fps=None):
+        if not self.tracker:
+            return None
+
+        stats = self.tracker.stats(fps)
+        self.logger.info(f"Tracks: {stats['track_count']}, detections: {stats['detections']}")
+
+        return stats
+
+    def annotate(self, image, frame_index, scale=1.0):
+        # Drawn on the evidence copy only; the frame itself is shared with other analyzers, e.g. head crops
+        boxes = self.batch_boxes.get(frame_index)
+
+        for det in boxes if boxes is not None else []:
+            x1, y1, x2, y2 = (int(v * scale) for v in det[:4])
+            cv2.rectangle(image, (x1, y1), (x2, y2), (0, 255, 0), 2)  # green box
+
+    def fill_result(self, result: AnalyzerResult, people, tracked=False):
+        total_people = len(people)
+        self.boxes = people
+        result.success = total_people > 1
+
+        if result.success:
+            result.confidence = round(float(max(det[4] for det in people)), 2)
+            result.detail = dict({"count": total_people})
+
+            if self.tracker:
+                result.detail["track_ids"] = self.tracker.track_ids()
+                result.detail["tracked"] = tracked
         
 
     def analyze123(self):
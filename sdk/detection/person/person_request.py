@@ -1,13 +1,23 @@
 from argparse import Namespace
 from pydantic import Field, field_validator, model_validator
-from typing import Optional
+from typing import Literal, Optional
 from sdk.detection.core.core_request import CoreRequest
 
 class PersonRequest(CoreRequest):
     input: Optional[str] = Field(None, description="Input file or folder path (for 'file' mode)")
-    model_name: str = Field("yolov8n.pt", description="Path to the YOLO model file (.pt)")
+    model_name: str = Field("yolov8n.pt", description="Path to the YOLO model file (.pt, or .onnx for the onnx backend)")
+    backend: Literal["torch", "onnx"] = Field("torch", description="Inference backend: PyTorch, or ONNX Runtime on CPU (a .pt model is exported once)")
+    quantize: bool = Field(False, description="Use a dynamically quantized INT8 model with the onnx backend")
+    intra_op_threads: int = Field(0, ge=0, description="ONNX Runtime threads within an operator, 0 for the number of cores")
+    inter_op_threads: int = Field(1, ge=1, description="ONNX Runtime threads running operators in parallel")
     confidence: float = Field(0.5, ge=0.0, le=1.0, description="Confidence threshold between 0.0 and 1.0")
     frame_skip: int = Field(5, ge=0, description="Number of frames to skip between detections")
+    batch_size: int = Field(1, ge=1, description="Number of sampled frames sent to the model in one inference call")
+    batch_max_wait: float = Field(0.5, ge=0.0, description="Maximum seconds a partial batch waits before inference")
+    tracking: bool = Field(False, description="Track person boxes between detections instead of running the model on every sampled frame")
+    detect_interval: int = Field(30, ge=1, description="Maximum frames between model detections when tracking")
+    track_min_confidence: float = Field(0.3, ge=0.0, le=1.0, description="Detect again early when a track's decayed confidence drops below this")
+    track_iou: float = Field(0.3, ge=0.0, le=1.0, description="Minimum IoU to match a detection to a track")
 
     @classmethod
     def default(cls, input) -> "PersonRequest":
@@ -27,8 +37,11 @@ class PersonRequest(CoreRequest):
         if not input_path:
             raise ValueError("Input path is required")
         
-        if not model_name.endswith(".pt"):
-            raise ValueError("model_name must end with .pt")
+        if model_name and not model_name.endswith((".pt", ".onnx")):
+            raise ValueError("model_name must end with .pt or .onnx")
+
+        if model_name and model_name.endswith(".onnx") and values.get("backend", "torch") != "onnx":
+            raise ValueError("An .onnx model_name requires backend 'onnx'")
         
         return values
     
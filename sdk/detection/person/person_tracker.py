@@ -0,0 +1,203 @@
+import numpy as np
+
+class PersonTracker:
+    """IoU tracker with a constant-velocity model, in pure NumPy.
+
+    Tracks are matched to detections greedily by IoU, then smoothed with an
+    alpha-beta filter over center and size. Between detections, boxes are
+    extrapolated, and each track's confidence decays by `decay` per frame.
+    `needs_detection` asks for a detection once the interval has passed or
+    the weakest track falls below `min_confidence`.
+    """
+
+    def __init__(self, detect_interval=30, min_confidence=0.3, iou_threshold=0.3, max_misses=2, decay=0.98, alpha=0.8, beta=0.3):
+        self.detect_interval = detect_interval
+        self.min_confidence = min_confidence
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.decay = decay
+        self.alpha = alpha
+        self.beta = beta
+        self.last_detection = None
+        self.detections = 0
+        self.next_id = 1
+        self.finished = []
+        self._clear()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def needs_detection(self, frame_index, last_detection=None) -> bool:
+        last = self.last_detection if last_detection is None else last_detection
+
+        if last is None or frame_index - last >= self.detect_interval:
+            return True
+
+        if not len(self.ids):
+            return False
+
+        return bool(self._confidences(frame_index).min() < self.min_confidence)
+
+    def update(self, frame_index, detections) -> np.ndarray:
+        """Matches (D, 5) detections of x1, y1, x2, y2, confidence to the tracks.
+
+        Returns the (T, 5) tracked boxes after the update.
+        """
+        detections = np.asarray(detections, dtype=np.float32).reshape(-1, 5)
+        predicted = self._predict(frame_index)
+        dt = np.maximum(frame_index - self.frames, 1).astype(np.float32)[:, None]
+
+        track_rows, detection_rows = self._match(predicted, detections[:, :4])
+
+        # Alpha-beta update of matched tracks
+        measured = self._to_state(detections[detection_rows, :4])
+        residual = measured - predicted[track_rows]
+        self.states[track_rows] = predicted[track_rows] + self.alpha * residual
+        self.velocities[track_rows] += self.beta * residual / dt[track_rows]
+        self.frames[track_rows] = frame_index
+        self.confidences[track_rows] = detections[detection_rows, 4]
+        self.hits[track_rows] += 1
+        self.misses[track_rows] = 0
+        self.last_seen[track_rows] = frame_index
+
+        unmatched = np.setdiff1d(np.arange(len(self.ids)), track_rows)
+        self.misses[unmatched] += 1
+        self._remove(unmatched[self.misses[unmatched] > self.max_misses])
+
+        new = np.setdiff1d(np.arange(len(detections)), detection_rows)
+        self._add(frame_index, detections[new])
+
+        self.last_detection = frame_index
+        self.detections += 1
+
+        return self.boxes(frame_index)
+
+    def boxes(self, frame_index) -> np.ndarray:
+        """Boxes (T, 5) of x1, y1, x2, y2, confidence of the visible tracks, extrapolated to `frame_index`.
+
+        Tracks missed by the latest detection are kept for matching but not reported.
+        """
+        visible = self.misses == 0
+
+        if not visible.any():
+            return np.empty((0, 5), np.float32)
+
+        boxes = self._to_box(self._predict(frame_index)[visible])
+        return np.column_stack((boxes, self._confidences(frame_index)[visible])).astype(np.float32)
+
+    def track_ids(self) -> list[int]:
+        return [int(track_id) for track_id in self.ids[self.misses == 0]]
+
+    def stats(self, fps=None) -> dict:
+        """Lifetime of every track seen so far, finished or still active."""
+        tracks = self.finished + [
+            self._track_record(i) for i in range(len(self.ids))
+        ]
+
+        for track in tracks:
+            frames = track["end_frame"] - track["start_frame"]
+            track["duration"] = round(frames / fps, 3) if fps else None
+
+        return {
+            "tracks": tracks,
+            "track_count": len(tracks),
+            "detections": self.detections
+        }
+
+    def _predict(self, frame_index):
+        dt = (frame_index - self.frames).astype(np.float32)[:, None]
+        return self.states + self.velocities * dt
+
+    def _confidences(self, frame_index):
+        return self.confidences * self.decay ** np.maximum(frame_index - self.frames, 0)
+
+    def _match(self, predicted, boxes):
+        if not len(predicted) or not len(boxes):
+            return np.empty(0, np.int64), np.empty(0, np.int64)
+
+        iou = self.iou(self._to_box(predicted), boxes)
+        track_rows, detection_rows = [], []
+
+        # Greedy assignment, best pairs first
+        for flat in np.argsort(iou, axis=None)[::-1]:
+            t, d = divmod(int(flat), iou.shape[1])
+
+            if iou[t, d] < self.iou_threshold:
+                break
+
+            if t in track_rows or d in detection_rows:
+                continue
+
+            track_rows.append(t)
+            detection_rows.append(d)
+
+        return np.array(track_rows, np.int64), np.array(detection_rows, np.int64)
+
+    @staticmethod
+    def iou(a, b) -> np.ndarray:
+        """Pairwise IoU of (N, 4) and (M, 4) boxes of x1, y1, x2, y2."""
+        x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+        y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+        x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+        y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+
+        intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+        area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+        area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+
+        return intersection / np.maximum(area_a[:, None] + area_b[None, :] - intersection, 1e-6)
+
+    @staticmethod
+    def _to_state(boxes):
+        """x1, y1, x2, y2 -> center x, center y, width, height."""
+        return np.column_stack(((boxes[:, 0] + boxes[:, 2]) / 2, (boxes[:, 1] + boxes[:, 3]) / 2, boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1]))
+
+    @staticmethod
+    def _to_box(states):
+        half = np.maximum(states[:, 2:], 1.0) / 2
+        return np.column_stack((states[:, :2] - half, states[:, :2] + half))
+
+    def _add(self, frame_index, detections):
+        count = len(detections)
+        if not count:
+            return
+
+        self.ids = np.concatenate((self.ids, np.arange(self.next_id, self.next_id + count)))
+        self.states = np.concatenate((self.states, self._to_state(detections[:, :4])))
+        self.velocities = np.concatenate((self.velocities, np.zeros((count, 4), np.float32)))
+        self.confidences = np.concatenate((self.confidences, detections[:, 4]))
+        self.frames = np.concatenate((self.frames, np.full(count, frame_index, np.int64)))
+        self.first_seen = np.concatenate((self.first_seen, np.full(count, frame_index, np.int64)))
+        self.last_seen = np.concatenate((self.last_seen, np.full(count, frame_index, np.int64)))
+        self.hits = np.concatenate((self.hits, np.ones(count, np.int64)))
+        self.misses = np.concatenate((self.misses, np.zeros(count, np.int64)))
+        self.next_id += count
+
+    def _remove(self, rows):
+        if not len(rows):
+            return
+
+        self.finished.extend(self._track_record(i) for i in rows)
+        keep = np.setdiff1d(np.arange(len(self.ids)), rows)
+
+        for name in ("ids", "states", "velocities", "confidences", "frames", "first_seen", "last_seen", "hits", "misses"):
+            setattr(self, name, getattr(self, name)[keep])
+
+    def _track_record(self, i):
+        return {
+            "id": int(self.ids[i]),
+            "start_frame": int(self.first_seen[i]),
+            "end_frame": int(self.last_seen[i]),
+            "detections": int(self.hits[i])
+        }
+
+    def _clear(self):
+        self.ids = np.empty(0, np.int64)
+        self.states = np.empty((0, 4), np.float32)
+        self.velocities = np.empty((0, 4), np.float32)
+        self.confidences = np.empty(0, np.float32)
+        self.frames = np.empty(0, np.int64)  # Frame each state refers to
+        self.first_seen = np.empty(0, np.int64)
+        self.last_seen = np.empty(0, np.int64)
+        self.hits = np.empty(0, np.int64)
+        self.misses = np.empty(0, np.int64)
@@ -0,0 +1,244 @@
+import json
+import numpy as np
+
+class EventStore:
+    """Columnar store of detection events backed by NumPy arrays.
+
+    Each event covers the interval [timestamp, timestamp + duration]. Events
+    are kept sorted by start time, and the longest duration bounds how far
+    back a range query has to look, so `between` is two binary searches plus
+    a filter over the candidates.
+    """
+
+    COLUMNS = {
+        "analyzer": np.int16,
+        "frame_index": np.int64,
+        "timestamp": np.float64,
+        "duration": np.float64,
+        "confidence": np.float32,
+        "detail_offset": np.int64,
+    }
+    TOLERANCE = 1e-6  # Seconds; sampled events whose end and next start differ only by rounding touch
+
+    def __init__(self, capacity=1024):
+        self.analyzer_types: list[str] = []
+        self.details: list = []
+        self._columns = {name: np.empty(capacity, dtype) for name, dtype in self.COLUMNS.items()}
+        self._size = 0
+        self._sorted = True
+        self._max_duration = 0.0
+
+    def __len__(self):
+        return self._size
+
+    def column(self, name) -> np.ndarray:
+        self._sort()
+        return self._columns[name][:self._size]
+
+    @property
+    def ends(self) -> np.ndarray:
+        return self.column("timestamp") + self.column("duration")
+
+    def analyzer_code(self, analyzer_type) -> int:
+        if analyzer_type not in self.analyzer_types:
+            self.analyzer_types.append(analyzer_type)
+
+        return self.analyzer_types.index(analyzer_type)
+
+    def append(self, analyzer_type, frame_index, timestamp, confidence, detail=None, duration=0.0):
+        if self._size == len(self._columns["timestamp"]):
+            self._grow(max(1, self._size * 2))
+
+        i = self._size
+        columns = self._columns
+
+        if i and timestamp < columns["timestamp"][i - 1]:
+            self._sorted = False
+
+        columns["analyzer"][i] = self.analyzer_code(analyzer_type)
+        columns["frame_index"][i] = frame_index
+        columns["timestamp"][i] = timestamp
+        columns["duration"][i] = duration
+        columns["confidence"][i] = confidence
+        columns["detail_offset"][i] = len(self.details)
+
+        self.details.append(detail)
+        self._max_duration = max(self._max_duration, duration)
+        self._size += 1
+
+    def extend(self, other: "EventStore", offset=0.0, frame_offset=0):
+        """Appends all events of another store, shifting them by `offset` seconds and `frame_offset` frames."""
+        size = len(other)
+        if not size:
+            return
+
+        if self._size + size > len(self._columns["timestamp"]):
+            self._grow(max(self._size * 2, self._size + size))
+
+        codes = np.array([self.analyzer_code(t) for t in other.analyzer_types], dtype=np.int16)
+        target = slice(self._size, self._size + size)
+
+        self._columns["analyzer"][target] = codes[other.column("analyzer")]
+        self._columns["timestamp"][target] = other.column("timestamp") + offset
+        self._columns["detail_offset"][target] = len(self.details) + np.arange(size)
+
+        self._columns["frame_index"][target] = other.column("frame_index") + frame_offset
+
+        for name in ("duration", "confidence"):
+            self._columns[name][target] = other.column(name)
+
+        self.details.extend(other.details[i] for i in other.column("detail_offset"))
+        self._max_duration = max(self._max_duration, other._max_duration)
+        self._sorted = False
+        self._size += size
+
+    def between(self, t1, t2, analyzer_type=None) -> "EventStore":
+        """Returns the events whose interval overlaps [t1, t2]."""
+        starts = self.column("timestamp")
+
+        lo = np.searchsorted(starts, t1 - self._max_duration, side="left")
+        hi = np.searchsorted(starts, t2, side="right")
+
+        indexes = np.arange(lo, hi)
+        indexes = indexes[self.ends[lo:hi] >= t1]
+
+        if analyzer_type is not None:
+            if analyzer_type not in self.analyzer_types:
+                return EventStore(capacity=0)
+            indexes = indexes[self.column("analyzer")[indexes] == self.analyzer_types.index(analyzer_type)]
+
+        return self.take(indexes)
+
+    def select(self, analyzer_type) -> "EventStore":
+        """Returns the events of one analyzer."""
+        if analyzer_type not in self.analyzer_types:
+            return EventStore(capacity=0)
+
+        return self.take(np.flatnonzero(self.column("analyzer") == self.analyzer_types.index(analyzer_type)))
+
+    def take(self, indexes) -> "EventStore":
+        self._sort()
+
+        store = EventStore(capacity=len(indexes))
+        store.analyzer_types = list(self.analyzer_types)
+
+        for name in self.COLUMNS:
+            store._columns[name][:len(indexes)] = self._columns[name][indexes]
+
+        store.details = [self.details[offset] for offset in store._columns["detail_offset"][:len(indexes)]]
+        store._columns["detail_offset"][:len(indexes)] = np.arange(len(indexes))
+        store._size = len(indexes)
+        store._max_duration = float(store._columns["duration"][:len(indexes)].max()) if len(indexes) else 0.0
+
+        return store
+
+    def episodes(self, gap=0.0) -> list[dict]:
+        """Merges overlapping events from all analyzers into episodes.
+
+        Events closer than `gap` seconds are merged into the same episode.
+        Bounds are compared with `TOLERANCE`, because an end computed as
+        start + duration rarely equals the next start exactly.
+        """
+        if not self._size:
+            return []
+
+        starts = self.column("timestamp")
+        ends = np.maximum.accumulate(self.ends)
+        breaks = np.flatnonzero(starts[1:] > ends[:-1] + gap + self.TOLERANCE) + 1
+        bounds = np.concatenate(([0], breaks))
+
+        analyzers = self.column("analyzer")
+        confidences = self.column("confidence")
+        peak_confidences = np.maximum.reduceat(confidences, bounds)
+        counts = np.diff(np.concatenate((bounds, [self._size])))
+
+        episodes = []
+
+        for n, first in enumerate(bounds):
+            last = first + counts[n] - 1
+
+            episodes.append({
+                "start": float(starts[first]),
+                "end": float(ends[last]),
+                "analyzers": [self.analyzer_types[code] for code in np.unique(analyzers[first:last + 1])],
+                "count": int(counts[n]),
+                "confidence": round(float(peak_confidences[n]), 2)
+            })
+
+        return episodes
+
+    def counts(self) -> dict:
+        counts = np.bincount(self.column("analyzer"), minlength=len(self.analyzer_types))
+        return {analyzer_type: int(count) for analyzer_type, count in zip(self.analyzer_types, counts)}
+
+    def to_records(self) -> list[dict]:
+        return [
+            {
+                "type": self.analyzer_types[self.column("analyzer")[i]],
+                "frame_index": int(self.column("frame_index")[i]),
+                "timestamp": float(self.column("timestamp")[i]),
+                "duration": float(self.column("duration")[i]),
+                "confidence": round(float(self.column("confidence")[i]), 2),
+                "detail": self.details[self.column("detail_offset")[i]]
+            }
+            for i in range(self._size)
+        ]
+
+    def to_npz(self, file_path):
+        np.savez_compressed(
+            file_path,
+            analyzer_types=np.array(self.analyzer_types, dtype=str),
+            details=np.array([json.dumps(detail) for detail in self.details], dtype=str),
+            **{name: self.column(name) for name in self.COLUMNS}
+        )
+
+    @classmethod
+    def from_npz(cls, file_path) -> "EventStore":
+        with np.load(file_path) as data:
+            size = len(data["timestamp"])
+            store = cls(capacity=size)
+            store.analyzer_types = [str(t) for t in data["analyzer_types"]]
+            store.details = [json.loads(detail) for detail in data["details"]]
+
+            for name in cls.COLUMNS:
+                store._columns[name][:size] = data[name]
+
+        store._size = size
+        store._max_duration = float(store._columns["duration"][:size].max()) if size else 0.0
+
+        return store
+
+    def to_parquet(self, file_path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export requires pyarrow: pip install pyarrow") from e
+
+        table = pa.table({
+            "type": [self.analyzer_types[code] for code in self.column("analyzer")],
+            "frame_index": self.column("frame_index"),
+            "timestamp": self.column("timestamp"),
+            "duration": self.column("duration"),
+            "confidence": self.column("confidence"),
+            "detail": [json.dumps(self.details[offset]) for offset in self.column("detail_offset")]
+        })
+
+        pq.write_table(table, file_path)
+
+    def _grow(self, capacity):
+        for name, values in self._columns.items():
+            grown = np.empty(capacity, values.dtype)
+            grown[:self._size] = values[:self._size]
+            self._columns[name] = grown
+
+    def _sort(self):
+        if self._sorted:
+            return
+
+        order = np.argsort(self._columns["timestamp"][:self._size], kind="stable")
+
+        for name, values in self._columns.items():
+            values[:self._size] = values[:self._size][order]
+
+        self._sorted = True
@@ -1,9 +1,12 @@
 from typing import List
+from sdk.detection.report.event_store import EventStore
 from sdk.detection.report.report_item import ReportItem
 
 class Report:
-    def __init__(self):
+    def __init__(self, keep_items=True):
+        self.keep_items = keep_items  # When False, items are only kept as rows of the event store
         self._items: List[ReportItem] = []
+        self.events = EventStore()
 
     @property
     def items(self) -> List[ReportItem]:
@@ -11,6 +14,64 @@ class Report:
 
     @items.setter 
     def items(self, value: List[ReportItem]):
-        self._items = value
+        self._items = []
+        self.events = EventStore()
+        self.extend(value)
+
+    def add(self, item: ReportItem):
+        if self.keep_items:
+            self._items.append(item)
+
+        detail = {"image": item.image, "detail": item.detail}
+
+        if item.carried_forward:
+            detail["carried_forward"] = True
+
+        self.events.append(
+            item.type,
+            item.frame_index,
+            item.timestamp,
+            item.confidence,
+            detail,
+            item.duration
+        )
+
+    def extend(self, items: List[ReportItem]):
+        for item in items:
+            self.add(item)
+
+    @classmethod
+    def merge(cls, parts) -> "Report":
+        """Merges (report, time_offset, frame_offset) parts, shifting each part's items by its offsets."""
+        merged = cls()
+
+        for report, time_offset, frame_offset in parts:
+            if report is None:
+                continue
+
+            merged.events.extend(report.events, time_offset, frame_offset)
+            merged._items.extend(
+                item.model_copy(update={
+                    "timestamp": item.timestamp + time_offset,
+                    "frame_index": item.frame_index + frame_offset
+                })
+                for item in report.items
+            )
+
+        return merged
+
+    def between(self, t1, t2, analyzer_type=None) -> EventStore:
+        return self.events.between(t1, t2, analyzer_type)
+
+    def episodes(self, gap=0.0) -> list[dict]:
+        return self.events.episodes(gap)
+
+    def summary(self) -> dict:
+        return {
+            "detected": len(self.events) > 0,
+            "events": len(self.events),
+            "counts": self.events.counts(),
+            "episodes": self.episodes()
+        }
 
 
@@ -6,6 +6,10 @@ class ReportItem(BaseModel):
     image: str = Field(..., description="Path to the saved image file")
     timestamp: float = Field(..., description="Timestamp of the detection in seconds")
     detail: Optional[Any] = Field(None, description="Additional detection details")
+    type: Optional[str] = Field(None, description="Type of the analyzer that produced the detection")
+    frame_index: int = Field(0, ge=0, description="Index of the frame the detection was made on")
+    duration: float = Field(0.0, ge=0.0, description="Seconds of video the detection covers")
+    carried_forward: bool = Field(False, description="Whether the detection was reused from an earlier frame on a static scene")
 
     @classmethod
     def default(cls) -> "ReportItem":
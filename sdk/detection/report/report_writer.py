@@ -0,0 +1,75 @@
+import json
+import os
+import time
+from pathlib import Path
+from sdk.app.logger import Logger
+from sdk.app.metrics import Metrics
+
+class ReportWriter:
+    """Streams report events to a JSONL file while they are produced.
+
+    Lines are flushed every `flush_every` events or `flush_interval` seconds,
+    so consumers can tail the file. `close` writes a compact summary next to
+    it (`<name>.summary.json`). When appending, `offset` drops whatever was
+    written past that byte position, e.g. lines after the last checkpoint.
+    """
+
+    def __init__(self, file_path, flush_every=100, flush_interval=1.0, append=False, offset=None, count=0):
+        self.logger = Logger(__name__)
+        self.file_path = Path(file_path)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.count = count
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+        if append and offset is not None and self.file_path.is_file():
+            os.truncate(self.file_path, offset)
+
+        self._file = open(self.file_path, "a" if append else "w", encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def position(self):
+        """Bytes written so far, after flushing."""
+        self.flush()
+        return self._file.tell()
+
+    @property
+    def summary_path(self):
+        return self.file_path.with_suffix(".summary.json")
+
+    def write(self, event: dict):
+        start = time.perf_counter()
+
+        self._file.write(json.dumps(event, separators=(",", ":"), default=str) + "\n")
+        self.count += 1
+        self._pending += 1
+
+        if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+        Metrics.instance().observe("stage_seconds", time.perf_counter() - start, stage="report_write", analyzer=event.get("type"))
+
+    def flush(self):
+        self._file.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self, summary: dict = None):
+        if self._file.closed:
+            return
+
+        self.flush()
+        self._file.close()
+
+        if summary is not None:
+            with open(self.summary_path, "w", encoding="utf-8") as f:
+                json.dump(summary, f, separators=(",", ":"), default=str)
+
+        self.logger.finished(f"Report streamed to {self.file_path} ({self.count} events)")
@@ -0,0 +1,112 @@
+import bisect
+import shutil
+import subprocess
+import time
+import cv2
+from sdk.app.logger import Logger
+from sdk.video.video_chunk import VideoChunk
+
+class ChunkPlanner:
+    """Plans virtual chunks of a video as frame ranges of the original file.
+
+    Chunk boundaries are aligned to keyframes read from the container index
+    with ffprobe (packets only, nothing is decoded), so a worker can seek
+    straight to its range. Without ffprobe on PATH, the ranges are split
+    evenly and seeking falls back to decoding from the previous keyframe.
+    """
+
+    def __init__(self, file_path, chunk_seconds=300.0):
+        self.logger = Logger(__name__)
+        self.input_file = file_path
+        self.chunk_seconds = chunk_seconds
+        self.ffprobe_path = shutil.which("ffprobe")
+
+    def plan(self) -> list[VideoChunk]:
+        start_time = time.time()
+
+        fps, frame_count = self.get_video_info()
+        keyframes = self.get_keyframes()
+        chunk_frames = max(1, int(self.chunk_seconds * fps))
+
+        if keyframes:
+            frame_count = max(frame_count, keyframes[-1][0] + 1)
+        else:
+            keyframes = [(frame_index, frame_index / fps) for frame_index in range(0, frame_count, chunk_frames)]
+
+        keyframe_indexes = [frame_index for frame_index, _ in keyframes]
+        boundaries = [0]
+
+        while True:
+            # First keyframe at or after the desired chunk end
+            position = bisect.bisect_left(keyframe_indexes, boundaries[-1] + chunk_frames)
+
+            if position >= len(keyframes) or keyframe_indexes[position] >= frame_count:
+                break
+
+            boundaries.append(keyframe_indexes[position])
+
+        pts = dict(keyframes)
+        chunks = [
+            VideoChunk(
+                index=i,
+                start_frame=start,
+                end_frame=end,
+                start_pts=pts.get(start, start / fps)
+            )
+            for i, (start, end) in enumerate(zip(boundaries, boundaries[1:] + [frame_count]))
+        ]
+
+        self.logger.finished(f"Planned {len(chunks)} chunks of ~{self.chunk_seconds:.0f}s for {self.input_file}", start_time)
+
+        return chunks
+
+    def get_video_info(self):
+        cap = cv2.VideoCapture(self.input_file)
+
+        try:
+            if not cap.isOpened():
+                raise IOError(f"Cannot open video file: {self.input_file}")
+
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30  # Default to 30
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        finally:
+            cap.release()
+
+        return fps, frame_count
+
+    def get_keyframes(self) -> list[tuple[int, float]]:
+        """Returns (frame index, PTS seconds) of every keyframe, or [] if unavailable."""
+        if not self.ffprobe_path:
+            self.logger.info("ffprobe not found on PATH, chunks will not be keyframe aligned")
+            return []
+
+        cmd = [
+            self.ffprobe_path,
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "packet=pts_time,flags",
+            "-of", "csv=print_section=0",
+            self.input_file
+        ]
+
+        result = subprocess.run(cmd, capture_output=True, text=True)
+
+        if result.returncode != 0:
+            self.logger.error(f"ffprobe failed with code {result.returncode}: {result.stderr.strip()}")
+            return []
+
+        packets = []
+
+        for line in result.stdout.splitlines():
+            fields = line.split(",")
+
+            try:
+                packets.append((float(fields[0]), "K" in fields[1]))
+            except (IndexError, ValueError):
+                continue  # Packets without a PTS
+
+        # Packets are in decode order; frame indexes follow presentation order
+        packets.sort()
+        start_pts = packets[0][0] if packets else 0.0
+
+        return [(frame_index, pts - start_pts) for frame_index, (pts, is_key) in enumerate(packets) if is_key]
@@ -0,0 +1,50 @@
+import time
+from sdk.detection.core.analyzer_result import AnalyzerResult
+from sdk.detection.core.core_analyzer import CoreAnalyzer
+from sdk.video.video_frame import VideoFrame
+
+class FrameBatcher:
+    """Collects sampled frames for one analyzer and runs them in batches.
+
+    A batch runs once it holds `analyzer.batch_size` frames, or once its
+    oldest frame has waited `analyzer.batch_max_wait` seconds. Results come
+    back in frame order.
+    """
+
+    def __init__(self, analyzer: CoreAnalyzer):
+        self.analyzer = analyzer
+        self.frames: list[VideoFrame] = []
+        self.started = None
+
+    def __len__(self):
+        return len(self.frames)
+
+    def add(self, frame: VideoFrame) -> list[tuple[VideoFrame, AnalyzerResult]]:
+        if not self.frames:
+            self.started = time.monotonic()
+
+        frame.retain()  # Released by the caller once the batch results are handled
+        self.frames.append(frame)
+
+        if len(self.frames) >= self.analyzer.batch_size or self.is_expired():
+            return self.flush()
+
+        return []
+
+    def is_expired(self):
+        return bool(self.frames) and time.monotonic() - self.started >= self.analyzer.batch_max_wait
+
+    def flush(self) -> list[tuple[VideoFrame, AnalyzerResult]]:
+        if not self.frames:
+            return []
+
+        frames, self.frames = self.frames, []
+
+        try:
+            results = self.analyzer.analyze_frames([frame.index for frame in frames], [frame.image for frame in frames])
+        except Exception:
+            for frame in frames:
+                frame.release()
+            raise
+
+        return list(zip(frames, results))
@@ -0,0 +1,35 @@
+import queue
+import numpy as np
+
+class FrameBufferPool:
+    """Fixed set of preallocated image buffers that decoded frames are written into.
+
+    Buffers are acquired by the decoder and released once every consumer is
+    done with the frame (see `VideoFrame.release`), so a steady stream of
+    frames reuses the same memory instead of allocating a new image each
+    time. When all buffers are out, `acquire` waits, which also bounds
+    memory. The pool must hold at least as many buffers as frames can be in
+    flight at once, or decoding stalls.
+    """
+
+    def __init__(self, shape, size, dtype=np.uint8):
+        self.shape = tuple(shape)
+        self.size = size
+        self._free = queue.Queue()
+
+        for _ in range(size):
+            self._free.put(np.empty(self.shape, dtype))
+
+    @property
+    def available(self):
+        return self._free.qsize()
+
+    def acquire(self, timeout=None):
+        """A free buffer, or None when none was released within `timeout` seconds."""
+        try:
+            return self._free.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def release(self, buffer):
+        self._free.put(buffer)
@@ -0,0 +1,20 @@
+from sdk.detection.core.core_analyzer import CoreAnalyzer
+
+class FrameScheduler:
+    """Decides, per frame, which analyzers need it.
+
+    A frame is decoded when at least one analyzer wants it, and is then
+    dispatched only to the analyzers that asked for it.
+    """
+
+    def __init__(self, analyzers: list[CoreAnalyzer]):
+        self.analyzers = analyzers
+
+    def plan(self, frame_index) -> list[CoreAnalyzer]:
+        return [analyzer for analyzer in self.analyzers if analyzer.wants_frame(frame_index)]
+
+    def analyzers_for(self, frame) -> list[CoreAnalyzer]:
+        if frame.targets is not None:
+            return frame.targets
+
+        return self.plan(frame.index)
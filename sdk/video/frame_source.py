@@ -0,0 +1,180 @@
+import queue
+import threading
+import time
+import cv2
+from sdk.app.logger import Logger
+from sdk.app.metrics import Metrics
+from sdk.video.frame_buffer_pool import FrameBufferPool
+from sdk.video.video_frame import VideoFrame
+
+class FrameSource:
+    """Decodes a video on a background thread into a bounded queue.
+
+    Every frame is grabbed, but only frames accepted by `should_retrieve`
+    are retrieved (fully decoded into an image) and handed to the consumer.
+    If `should_retrieve` returns a list (e.g. `FrameScheduler.plan`), it is
+    attached to the frame as `targets`. A frame range [start_frame, end_frame)
+    can be given to read only part of the file.
+
+    With `buffer_pool_size`, frames are decoded into a pool of reusable
+    buffers; consumers must call `frame.release()` when done with a frame.
+    """
+
+    _END = object()
+    QUEUE_SIZE = 32
+
+    def __init__(self, file_path, should_retrieve=None, queue_size=QUEUE_SIZE, start_frame=0, end_frame=None, buffer_pool_size=0):
+        self.logger = Logger(__name__)
+        self.file_path = file_path
+        self.should_retrieve = should_retrieve or (lambda frame_index: True)
+        self.queue_size = queue_size
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.buffer_pool_size = buffer_pool_size
+        self.buffer_pool = None
+        self.cap = None
+        self.fps = 0.0
+        self.frame_count = 0
+        self._queue = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._error = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def __iter__(self):
+        while True:
+            frame = self._queue.get()
+
+            if frame is self._END:
+                break
+
+            yield frame
+
+        if self._error:
+            raise self._error
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.file_path)
+
+        if not self.cap.isOpened():
+            self.logger.failed(f"Cannot open video file: {self.file_path}")
+            self.cap = None
+            return False
+
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30  # Default to 30
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+        if self.buffer_pool_size:
+            width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            self.buffer_pool = FrameBufferPool((height, width, 3), self.buffer_pool_size) if width and height else None
+
+        if self.start_frame:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.start_frame)
+
+        return True
+
+    def start(self):
+        if self.cap is None and not self.open():
+            raise IOError(f"Cannot open video file: {self.file_path}")
+
+        self._stop.clear()
+        self._error = None
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._thread = threading.Thread(target=self._decode, name=f"decode-{self.file_path}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _acquire(self):
+        while not self._stop.is_set():
+            buffer = self.buffer_pool.acquire(timeout=0.1)
+
+            if buffer is not None:
+                return buffer
+        return None
+
+    def _retrieve(self):
+        """Retrieves the grabbed frame into a pooled buffer when possible; returns (ret, image, pool)."""
+        if self.buffer_pool is None:
+            ret, image = self.cap.retrieve()
+            return ret, image, None
+
+        buffer = self._acquire()
+        if buffer is None:
+            return False, None, None
+
+        ret, image = self.cap.retrieve(buffer)
+
+        # OpenCV allocates a new image when the decoded frame does not fit the buffer
+        if ret and image is buffer:
+            return ret, image, self.buffer_pool
+
+        self.buffer_pool.release(buffer)
+        return ret, image, None
+
+    def _timestamp(self, frame_index):
+        msec = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+
+        if msec > 0 or frame_index == self.start_frame == 0:
+            return msec / 1000.0
+
+        return frame_index / self.fps
+
+    def _decode(self):
+        frame_index = self.start_frame
+        metrics = Metrics.instance()
+
+        try:
+            while not self._stop.is_set():
+                if self.end_frame is not None and frame_index >= self.end_frame:
+                    break
+
+                start = time.perf_counter()
+
+                if not self.cap.grab():
+                    break
+
+                metrics.observe("stage_seconds", time.perf_counter() - start, stage="grab", analyzer="video")
+                targets = self.should_retrieve(frame_index)
+
+                if targets:
+                    start = time.perf_counter()
+                    ret, image, pool = self._retrieve()
+                    metrics.observe("stage_seconds", time.perf_counter() - start, stage="decode", analyzer="video")
+                    metrics.inc("frames_retrieved_total", analyzer="video")
+                    targets = targets if isinstance(targets, list) else None
+
+                    if ret and not self._put(VideoFrame(frame_index, self._timestamp(frame_index), image, targets, pool)):
+                        break
+
+                frame_index += 1
+        except Exception as e:
+            self.logger.error(f"Decoding failed at frame {frame_index}", e)
+            self._error = e
+        finally:
+            self._put(self._END)
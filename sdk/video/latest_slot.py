@@ -0,0 +1,56 @@
+import threading
+
+class LatestSlot:
+    """Single-item handoff between threads that keeps only the newest item.
+
+    `put` overwrites an item the consumer has not taken yet, so a slow
+    consumer always gets the freshest data instead of a growing backlog.
+    """
+
+    def __init__(self):
+        self.dropped = 0
+        self._item = None
+        self._has_item = False
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    @property
+    def empty(self):
+        return not self._has_item
+
+    def put(self, item) -> bool:
+        """Stores the item. Returns False when it replaced an item nobody took."""
+        with self._condition:
+            replaced = self._has_item
+
+            if replaced:
+                self.dropped += 1
+
+            self._item = item
+            self._has_item = True
+            self._condition.notify()
+
+            return not replaced
+
+    def get(self, timeout=None):
+        """Waits for the next item. Returns None on timeout or once closed and empty."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._has_item or self._closed, timeout)
+
+            if not self._has_item:
+                return None
+
+            item = self._item
+            self._item = None
+            self._has_item = False
+
+            return item
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+import cv2
+from sdk.app.logger import Logger
+from sdk.app.metrics import Metrics
+from sdk.video.latest_slot import LatestSlot
+from sdk.video.video_frame import VideoFrame
+
+class LiveSource:
+    """Captures frames on a background thread, keeping only the latest one.
+
+    `source` is anything `cv2.VideoCapture` accepts: a camera index, a
+    stream URL or a file. Files are played at real-time pace by default, so
+    they behave like a camera for testing. Each frame is stamped with the
+    `time.perf_counter()` at capture for glass-to-result latency.
+    """
+
+    def __init__(self, source=0, realtime=None):
+        self.logger = Logger(__name__)
+        self.source = source
+        self.realtime = os.path.isfile(str(source)) if realtime is None else realtime
+        self.cap = None
+        self.fps = 0.0
+        self.captured = 0
+        self.slot = LatestSlot()
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def dropped(self):
+        return self.slot.dropped
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self):
+        self.cap = cv2.VideoCapture(self.source)
+
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open video source: {self.source}")
+
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30  # Default to 30
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._capture, name="live-capture", daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+
+        self.slot.close()
+
+    def get(self, timeout=None) -> VideoFrame:
+        """Latest frame not taken yet; None on timeout or when the source ended."""
+        return self.slot.get(timeout)
+
+    def _capture(self):
+        metrics = Metrics.instance()
+        start = time.perf_counter()
+        index = 0
+
+        try:
+            while not self._stop.is_set():
+                if self.realtime:
+                    delay = start + index / self.fps - time.perf_counter()
+
+                    if delay > 0:
+                        time.sleep(delay)
+
+                ret, image = self.cap.read()
+
+                if not ret:
+                    break
+
+                frame = VideoFrame(index, index / self.fps, image)
+                frame.captured_at = time.perf_counter()
+
+                if not self.slot.put(frame):
+                    metrics.inc("frames_dropped_total", analyzer="live")
+
+                metrics.inc("frames_captured_total", analyzer="live")
+                self.captured += 1
+                index += 1
+        except Exception as e:
+            self.logger.error(f"Capture failed: {self.source}", e)
+        finally:
+            self.slot.close()
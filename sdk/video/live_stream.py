@@ -0,0 +1,57 @@
+import threading
+import time
+from sdk.video.live_source import LiveSource
+
+class LiveStream:
+    """One source of a multi-stream engine with its counters.
+
+    A stream has at most one frame in the pipeline: until its result is
+    done, newer frames only replace each other in the source's latest slot,
+    which is the per-stream backpressure.
+    """
+
+    def __init__(self, name, source, realtime=None):
+        self.name = name
+        self.source = LiveSource(source, realtime)
+        self.processed = 0
+        self.detections = 0
+        self.started_at = None
+        self._in_flight = threading.Event()
+
+    @property
+    def in_flight(self):
+        return self._in_flight.is_set()
+
+    @property
+    def ended(self):
+        slot = self.source.slot
+        return slot.closed and slot.empty and not self.in_flight
+
+    @property
+    def fps(self):
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        return self.processed / elapsed if elapsed else 0.0
+
+    def start(self):
+        self.source.start()
+        self.started_at = time.perf_counter()
+
+    def stop(self):
+        self.source.stop()
+
+    def take(self):
+        """Latest frame if the stream has nothing in flight, else None."""
+        if self.in_flight:
+            return None
+
+        frame = self.source.get(timeout=0)
+
+        if frame is not None:
+            self._in_flight.set()
+
+        return frame
+
+    def done(self, detected=False):
+        self.processed += 1
+        self.detections += int(detected)
+        self._in_flight.clear()
@@ -0,0 +1,53 @@
+import cv2
+import numpy as np
+
+class MotionGate:
+    """Detects frames whose scene has not changed since the last analyzed frame.
+
+    Frames are compared as small grayscale thumbnails by their mean absolute
+    difference (0-255) against the last frame that passed the gate, so slow
+    drift still adds up. After `max_static` gated frames in a row a frame is
+    let through anyway, which bounds how stale a carried-forward result gets.
+    """
+
+    def __init__(self, threshold=2.0, max_static=30, width=64):
+        self.threshold = threshold
+        self.max_static = max_static
+        self.width = width
+        self.static_count = 0
+        self.score = 0.0
+        self._reference = None
+        self._thumbnail = None
+
+    def is_static(self, image) -> bool:
+        thumbnail = self.get_thumbnail(image)
+
+        if self._reference is None or self.static_count >= self.max_static:
+            return self._pass(thumbnail)
+
+        cv2.absdiff(thumbnail, self._reference, dst=self._thumbnail)
+        self.score = float(self._thumbnail.mean())
+
+        if self.score >= self.threshold:
+            return self._pass(thumbnail)
+
+        self.static_count += 1
+        return True
+
+    def get_thumbnail(self, image):
+        height, width = image.shape[:2]
+        size = (self.width, max(1, round(height * self.width / width)))
+        small = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+    def reset(self):
+        self.static_count = 0
+        self.score = 0.0
+        self._reference = None
+
+    def _pass(self, thumbnail):
+        self._reference = thumbnail
+        self._thumbnail = np.empty_like(thumbnail)
+        self.static_count = 0
+        return False
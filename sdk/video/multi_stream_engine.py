@@ -0,0 +1,205 @@
+import queue
+import threading
+import time
+import cv2
+import mediapipe as mp
+import numpy as np
+from ultralytics import YOLO
+from sdk.app.logger import Logger
+from sdk.app.metrics import Metrics
+from sdk.detection.core.model_pool import ModelPool
+from sdk.detection.head.head_file_analyzer import HeadFileAnalyzer
+from sdk.detection.head.landmark_series import LandmarkSeries
+from sdk.detection.person.person_file_analyzer import PersonFileAnalyzer
+from sdk.video.live_stream import LiveStream
+
+class MultiStreamEngine:
+    """Analyzes many live streams on one shared set of models.
+
+    A dispatcher thread visits the streams round-robin, starting one stream
+    later each round so none is favored. It takes the latest frame of every
+    stream that has nothing in flight and runs YOLO once over the whole
+    cross-stream batch. The frames then go through a bounded queue to head
+    workers, each owning a static-image FaceMesh, because frames of
+    different streams interleave.
+    """
+
+    def __init__(self, sources, model_name="yolov8n.pt", confidence=0.5, look_mode="yaw", look_away_threshold=0.1,
+                 batch_size=8, workers=2, realtime=None, on_result=None):
+        self.logger = Logger(__name__)
+        self.streams = [LiveStream(f"stream{i}", source, realtime) for i, source in enumerate(sources)]
+        self.model_name = model_name
+        self.confidence = confidence
+        self.look_mode = look_mode
+        self.look_away_threshold = look_away_threshold
+        self.batch_size = batch_size
+        self.workers = max(1, workers)
+        self.on_result = on_result or self.log_result
+        self.model = None
+        self._model_keys = []
+        self._next = 0
+        self._queue = queue.Queue(maxsize=self.workers * 2)
+        self._stop = threading.Event()
+
+    def run(self, duration=None) -> dict:
+        """Runs until every source ends, `duration` seconds pass or Ctrl+C. Returns per-stream stats."""
+        start_time = time.time()
+        self.logger.started(f"Starting {len(self.streams)} streams with {self.workers} head workers")
+
+        pool = ModelPool.instance()
+        self.model = pool.acquire(("yolo", self.model_name), lambda: YOLO(self.model_name), self.warmup)
+        self._model_keys.append(("yolo", self.model_name))
+
+        workers = [
+            threading.Thread(target=self._analyze_heads, args=(i,), name=f"head-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+
+        try:
+            for stream in self.streams:
+                stream.start()
+
+            for worker in workers:
+                worker.start()
+
+            self._dispatch(time.perf_counter() + duration if duration else None)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._stop.set()
+
+            for _ in workers:
+                self._queue.put(None)
+
+            for worker in workers:
+                if worker.is_alive():
+                    worker.join()
+
+            for stream in self.streams:
+                stream.stop()
+
+            for key in self._model_keys:
+                pool.release(key)
+
+            self._model_keys = []
+
+        stats = self.stats()
+        self.logger.finished(f"Streams finished: {len(self.streams)}", start_time)
+
+        return stats
+
+    def stop(self):
+        self._stop.set()
+
+    def warmup(self, model):
+        model(np.zeros((640, 640, 3), dtype=np.uint8), verbose=False)
+
+    def stats(self) -> dict:
+        metrics = Metrics.instance()
+        stats = {}
+
+        for stream in self.streams:
+            latency = metrics.histogram("latency_seconds", analyzer="live", stream=stream.name)
+
+            stats[stream.name] = {
+                "source": str(stream.source.source),
+                "fps": round(stream.fps, 2),
+                "captured": stream.source.captured,
+                "processed": stream.processed,
+                "dropped": stream.source.dropped,
+                "detections": stream.detections,
+                "latency_p50": latency.percentile(50) if latency else 0.0,
+                "latency_p99": latency.percentile(99) if latency else 0.0
+            }
+
+        return stats
+
+    def log_result(self, stream: LiveStream, frame, people, looking_away, latency):
+        if people > 1 or looking_away:
+            self.logger.info(f"[{stream.name}] Frame {frame.index} [{latency * 1000:.0f} ms]: people {people}, looking away {looking_away}")
+
+    def _dispatch(self, deadline):
+        metrics = Metrics.instance()
+
+        while not self._stop.is_set():
+            if deadline and time.perf_counter() >= deadline:
+                break
+
+            batch = self._collect()
+
+            if not batch:
+                if all(stream.ended for stream in self.streams):
+                    break
+
+                time.sleep(0.002)
+                continue
+
+            with metrics.timer("stage_seconds", stage="inference", analyzer="person"):
+                outputs = self.model([frame.image for _, frame in batch], verbose=False)
+
+            metrics.inc("batches_total", analyzer="person")
+            metrics.inc("frames_batched_total", len(batch), analyzer="person")
+
+            for (stream, frame), output in zip(batch, outputs):
+                people = len(PersonFileAnalyzer.filter_people(output.boxes.data, self.confidence))
+                self._queue.put((stream, frame, people))  # Blocks while the head workers are behind
+
+        # Let frames already in the pipeline finish
+        while any(stream.in_flight for stream in self.streams) and not self._stop.is_set():
+            time.sleep(0.01)
+
+    def _collect(self):
+        """Takes up to `batch_size` frames, visiting the streams round-robin."""
+        count = len(self.streams)
+        batch = []
+
+        for offset in range(count):
+            stream = self.streams[(self._next + offset) % count]
+            frame = stream.take()
+
+            if frame is not None:
+                batch.append((stream, frame))
+
+                if len(batch) == self.batch_size:
+                    break
+
+        self._next = (self._next + 1) % count
+
+        return batch
+
+    def _analyze_heads(self, worker_index):
+        pool = ModelPool.instance()
+        key = ("face_mesh", True, worker_index)
+        face_mesh = pool.acquire(key, lambda: mp.solutions.face_mesh.FaceMesh(static_image_mode=True, max_num_faces=2))
+        metrics = Metrics.instance()
+
+        try:
+            while True:
+                item = self._queue.get()
+
+                if item is None:
+                    break
+
+                stream, frame, people = item
+                looking_away = False
+
+                try:
+                    with metrics.timer("stage_seconds", stage="inference", analyzer="head"):
+                        mesh_result = face_mesh.process(cv2.cvtColor(frame.image, cv2.COLOR_BGR2RGB))
+
+                    if mesh_result.multi_face_landmarks:
+                        points = np.stack([LandmarkSeries.to_array(face.landmark) for face in mesh_result.multi_face_landmarks])
+                        _, away = HeadFileAnalyzer.get_look_away(LandmarkSeries.get_deviations(points), self.look_mode, self.look_away_threshold)
+                        looking_away = bool(away.any())
+                except Exception as e:
+                    self.logger.error(f"[{stream.name}] Head analysis failed at frame {frame.index}", e)
+
+                latency = time.perf_counter() - frame.captured_at
+                metrics.observe("latency_seconds", latency, analyzer="live", stream=stream.name)
+                metrics.inc("frames_processed_total", analyzer="live", stream=stream.name)
+
+                detected = people > 1 or looking_away
+                stream.done(detected)
+                self.on_result(stream, frame, people, looking_away, latency)
+        finally:
+            pool.release(key)
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from sdk.app.logger import Logger
+from sdk.detection.report.event_store import EventStore
+
+class ResultCache:
+    """Disk cache of per-analyzer results, addressed by content and parameters.
+
+    An entry holds one analyzer's events for one file (or chunk) with their
+    evidence images and finalize stats. Its key hashes the file content and
+    every parameter that changes the result, so editing one analyzer's
+    settings only invalidates that analyzer. Entries are evicted least
+    recently used first once the cache grows past `max_bytes`. Entries are
+    written to a temporary folder and renamed into place, so concurrent
+    workers never see a partial entry.
+    """
+
+    VERSION = 2  # 2: segment images stored relative
+    HASH_BLOCK = 4 << 20
+
+    def __init__(self, folder, max_bytes=10 << 30):
+        self.logger = Logger(__name__)
+        self.folder = Path(folder)
+        self.max_bytes = max_bytes
+        self.entries_folder = self.folder / "entries"
+        self.hashes_folder = self.folder / "hashes"
+
+        self.entries_folder.mkdir(parents=True, exist_ok=True)
+        self.hashes_folder.mkdir(parents=True, exist_ok=True)
+
+    def content_hash(self, file_path) -> str:
+        """SHA-256 of the file, remembered per path until its size or mtime change."""
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        memo_path = self.hashes_folder / f"{hashlib.sha1(file_path.encode()).hexdigest()}.json"
+
+        try:
+            with open(memo_path) as f:
+                memo = json.load(f)
+
+            if memo["size"] == stat.st_size and memo["mtime_ns"] == stat.st_mtime_ns:
+                return memo["hash"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        start_time = time.time()
+        digest = hashlib.sha256()
+
+        with open(file_path, "rb") as f:
+            while block := f.read(self.HASH_BLOCK):
+                digest.update(block)
+
+        memo = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": digest.hexdigest()}
+        self._write_json(memo_path, memo)
+        self.logger.finished(f"Hashed {file_path}", start_time)
+
+        return memo["hash"]
+
+    def key(self, fields: dict) -> str:
+        text = json.dumps({"version": self.VERSION, **fields}, sort_keys=True, default=str)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get(self, key, output_folder):
+        """Loads a cached entry, copying its images into `output_folder`.
+
+        Returns `(events, stats)` or None on a miss.
+        """
+        entry = self.entries_folder / key
+        meta_path = entry / "meta.json"
+
+        if not meta_path.is_file():
+            return None
+
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+
+            events = EventStore.from_npz(entry / "events.npz")
+            output_folder = Path(output_folder)
+            output_folder.mkdir(parents=True, exist_ok=True)
+
+            for image in (entry / "images").iterdir():
+                shutil.copy2(image, output_folder / image.name)
+
+            events.details = [self._map_images(detail, lambda name: str(output_folder / name)) for detail in events.details]
+
+            os.utime(meta_path)  # Marks the entry as recently used
+        except Exception as e:
+            self.logger.error(f"Failed to read cache entry {key}", e, stack=False)
+            return None
+
+        return events, meta.get("stats")
+
+    def put(self, key, events: EventStore, stats=None):
+        """Stores an analyzer's events, copying the evidence images they reference."""
+        temp = self.entries_folder / f".tmp-{uuid.uuid4().hex}"
+        images = temp / "images"
+        images.mkdir(parents=True)
+
+        try:
+            def store_image(image):
+                if os.path.isfile(image):
+                    shutil.copy2(image, images / Path(image).name)
+
+                return Path(image).name  # Stored relative, resolved again on load
+
+            # Mapped copies, so the caller's detail dicts stay untouched
+            events.details = [self._map_images(detail, store_image) for detail in events.details]
+
+            events.to_npz(temp / "events.npz")
+            size = sum(path.stat().st_size for path in temp.rglob("*") if path.is_file())
+            self._write_json(temp / "meta.json", {"size": size, "created_at": time.time(), "stats": stats})
+
+            try:
+                os.replace(temp, self.entries_folder / key)
+            except OSError:
+                shutil.rmtree(temp)  # Another worker stored the same entry first
+        except Exception as e:
+            shutil.rmtree(temp, ignore_errors=True)
+            self.logger.error(f"Failed to write cache entry {key}", e, stack=False)
+            return
+
+        self.evict()
+
+    def evict(self):
+        entries = []
+
+        for entry in self.entries_folder.iterdir():
+            meta_path = entry / "meta.json"
+
+            if entry.name.startswith(".") or not meta_path.is_file():
+                continue
+
+            try:
+                with open(meta_path) as f:
+                    size = json.load(f)["size"]
+            except (OSError, ValueError, KeyError):
+                continue
+
+            entries.append((meta_path.stat().st_mtime, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            self.logger.info(f"Cache entry evicted: {entry.name}")
+
+    @staticmethod
+    def _map_images(detail, map_image):
+        """Copy of an event detail with its evidence image, and a segment's nested `images`, passed through `map_image`."""
+        if not detail:
+            return detail
+
+        detail = dict(detail)
+        inner = detail.get("detail")
+
+        if detail.get("image"):
+            detail["image"] = map_image(detail["image"])
+
+        if isinstance(inner, dict) and inner.get("images"):
+            detail["detail"] = {**inner, "images": [map_image(image) for image in inner["images"]]}
+
+        return detail
+
+    def _write_json(self, file_path, value):
+        temp_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+
+        with open(temp_path, "w") as f:
+            json.dump(value, f, separators=(",", ":"))
+
+        os.replace(temp_path, file_path)
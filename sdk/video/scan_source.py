@@ -0,0 +1,106 @@
+import time
+import cv2
+from sdk.app.logger import Logger
+from sdk.app.metrics import Metrics
+from sdk.video.chunk_planner import ChunkPlanner
+from sdk.video.video_frame import VideoFrame
+
+class ScanSource:
+    """Reads a sparse sample of a video by seeking instead of decoding every frame.
+
+    In "keyframes" mode the samples are keyframes (I-frames) from the
+    container index, at least `interval` seconds apart. A keyframe decodes on
+    its own, so each sample costs one decode. In "interval" mode, or without
+    ffprobe, a frame is taken every `interval` seconds and each seek decodes
+    from the preceding keyframe.
+    """
+
+    MODES = ("keyframes", "interval")
+    GRAB_LIMIT = 8  # Samples this few frames ahead are reached by grabbing instead of seeking
+
+    def __init__(self, file_path, interval=10.0, mode="keyframes"):
+        self.logger = Logger(__name__)
+        self.file_path = file_path
+        self.interval = interval
+        self.mode = mode
+        self.cap = None
+        self.fps = 0.0
+        self.frame_count = 0
+        self.samples = []
+
+    @property
+    def duration(self):
+        return self.frame_count / self.fps if self.fps else 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self) -> bool:
+        self.cap = cv2.VideoCapture(self.file_path)
+
+        if not self.cap.isOpened():
+            self.logger.error(f"Cannot open video file: {self.file_path}")
+            return False
+
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30  # Default to 30
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.samples = self.plan()
+
+        return True
+
+    def plan(self) -> list[tuple[int, float]]:
+        """Returns the (frame index, PTS seconds) of the frames to read."""
+        if self.mode == "keyframes":
+            keyframes = ChunkPlanner(self.file_path).get_keyframes()
+
+            if keyframes:
+                samples = []
+                next_time = 0.0
+
+                for frame_index, pts in keyframes:
+                    if pts >= next_time:
+                        samples.append((frame_index, pts))
+                        next_time = pts + self.interval
+
+                return samples
+
+            self.logger.info(f"No keyframe index for {self.file_path}, sampling every {self.interval:.1f}s instead")
+            self.mode = "interval"
+
+        step = max(1, round(self.interval * self.fps))
+
+        return [(frame_index, frame_index / self.fps) for frame_index in range(0, self.frame_count, step)]
+
+    def close(self):
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+
+    def __iter__(self):
+        metrics = Metrics.instance()
+        position = 0  # Index of the frame the decoder returns next
+
+        for frame_index, timestamp in self.samples:
+            start = time.perf_counter()
+            gap = frame_index - position
+
+            if 0 <= gap <= self.GRAB_LIMIT:
+                for _ in range(gap):
+                    self.cap.grab()
+            else:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+
+            ret, image = self.cap.read()
+            position = frame_index + 1
+
+            metrics.observe("stage_seconds", time.perf_counter() - start, stage="decode", analyzer="scan")
+
+            if not ret:
+                continue  # Index past the last decodable frame
+
+            metrics.inc("frames_retrieved_total", analyzer="scan")
+
+            yield VideoFrame(frame_index, timestamp, image)
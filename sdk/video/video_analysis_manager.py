@@ -1,14 +1,40 @@
+from concurrent.futures import ProcessPoolExecutor
 from glob import glob
+from pathlib import Path
+import json
 import os
+import shutil
+import tempfile
 import time
 from sdk.app.logger import Logger
+from sdk.app.metrics import Metrics
+from sdk.detection.report.report import Report
+from sdk.detection.report.report_writer import ReportWriter
+from sdk.video.chunk_planner import ChunkPlanner
+from sdk.video.result_cache import ResultCache
 from sdk.video.video_analysis_request import VideoAnalysisRequest
+from sdk.video.video_chunk import VideoChunk
 from sdk.video.video_file_analyzer import VideoFileAnalyzer
-from sdk.video.video_splitter import VideoSplitter
-from sdk.detection.head.head_file_analyzer import HeadFileAnalyzer
-from sdk.detection.head.head_request import HeadRequest
-from sdk.detection.person.person_file_analyzer import PersonFileAnalyzer
-from sdk.detection.person.person_request import PersonRequest
+from sdk.video.video_scanner import VideoScanner
+
+def _init_worker(request: VideoAnalysisRequest):
+    # Load and warm up the models once per worker; they stay cached in the ModelPool.
+    # Analyzers clean their output folder on creation, so point them at a scratch input.
+    with tempfile.TemporaryDirectory() as folder:
+        request = request.clone()
+        request.input = os.path.join(folder, "warmup.mp4")
+        (VideoScanner if request.scan else VideoFileAnalyzer)(request).release()
+
+def _analyze_file(request: VideoAnalysisRequest):
+    return VideoFileAnalyzer(request).analyze()
+
+def _scan_file(request: VideoAnalysisRequest):
+    scanner = VideoScanner(request)
+
+    try:
+        return scanner.scan()
+    finally:
+        scanner.release()
 
 class VideoAnalysisManager:
     def __init__(self, request: VideoAnalysisRequest):
@@ -22,11 +48,19 @@ class VideoAnalysisManager:
 
         self.logger.started(f"Started analyzing video")
 
+        if self.request.metrics_port:
+            Metrics.instance().serve(self.request.metrics_port)
+            # Worker processes keep their own totals, which only reach their metrics.json files
+            self.logger.info(f"Metrics served on http://127.0.0.1:{self.request.metrics_port}/metrics")
+
         try:
-            folder_path = self.split()
+            chunks = None if self.request.scan else self.split()
+
+            if chunks:
+                report = self.analyze_chunks(self.request.input, chunks)
 
-            if folder_path:
-                report = self.analyze_folder(folder_path)
+            elif self.request.scan:
+                report = self.scan(self.request.input)
 
             elif os.path.isfile(self.request.input):
                 report = self.analyze_file(self.request.input)
@@ -44,37 +78,124 @@ class VideoAnalysisManager:
 
         return report
 
-    def split(self):
-        MAX_SIZE = 50 # MB
+    def split(self) -> list[VideoChunk]:
+        # Chunks only pay off when several workers analyze them in parallel
+        if self.request.workers <= 1 or not os.path.isfile(self.request.input):
+            return None
 
-        if os.path.isfile(self.request.input):
-            if os.path.getsize(self.request.input) > MAX_SIZE * 1024 * 1024:
-                self.logger.info(f"File is larger than {MAX_SIZE}MB")
-            else:
-                self.logger.info("File is within the limit")
-                return None
-        else:
+        chunks = ChunkPlanner(self.request.input, self.request.chunk_seconds).plan()
+
+        if len(chunks) <= 1:
+            self.logger.info("File fits in a single chunk")
             return None
-        
-        splitter = VideoSplitter(self.request.input)
-        splitter.split()
 
-        return splitter.output_folder
+        return chunks
 
     def analyze_folder(self, folder_path):
-        report = None
-
         self.logger.started(f"Analyzing all mp4 files in folder: {folder_path}")
 
-        for file_path in glob(os.path.join(folder_path, "*.mp4")):
-            report = self.analyze_file(file_path)
+        file_paths = sorted(glob(os.path.join(folder_path, "*.mp4")))
+        reports = self.analyze_files(file_paths)
+
+        return dict(zip(file_paths, reports))
+
+    def analyze_chunks(self, file_path, chunks: list[VideoChunk]) -> Report:
+        start_time = time.time()
+
+        self.logger.started(f"Analyzing {len(chunks)} chunks of {file_path}")
+
+        # Chunks share the output folder of the file, so clean it once up front
+        output_folder = Path(file_path).parent / Path(file_path).stem
+        resuming = self.request.resume and any(output_folder.glob("checkpoint_*.pkl"))
+
+        # Chunk checkpoints of an interrupted run live in the same folder
+        if self.request.clean_output and not resuming and output_folder.is_dir():
+            shutil.rmtree(output_folder)
+
+        if self.request.cache_folder:
+            # Hash the file once here instead of in every chunk worker
+            ResultCache(self.request.cache_folder, self.request.cache_max_bytes).content_hash(file_path)
+
+        requests = []
+
+        for chunk in chunks:
+            request = self.clone_request(file_path)
+            request.start_frame = chunk.start_frame
+            request.end_frame = chunk.end_frame
+            request.clean_output = False
+            requests.append(request)
+
+        # Chunks seek into the original file, so their timestamps are already absolute
+        reports = self.run_requests(requests)
+        report = Report.merge((chunk_report, 0.0, 0) for chunk_report in reports)
+        report.events.to_npz(output_folder / "events.npz")
+
+        # Chunk events are streamed to report_<start frame>.jsonl; the summary covers the whole file
+        with open(output_folder / "report.summary.json", "w") as f:
+            json.dump(report.summary(), f, separators=(",", ":"))
+
+        self.logger.finished(f"Merged {len(chunks)} chunk reports", start_time)
 
         return report
-    
+
+    def scan(self, path) -> list[dict]:
+        """Scores each file from a sparse sample of frames; results go to scan.jsonl, highest risk first in its summary."""
+        start_time = time.time()
+
+        if os.path.isdir(path):
+            file_paths = sorted(glob(os.path.join(path, "*.mp4")))
+            report_path = Path(path) / "scan.jsonl"
+        elif os.path.isfile(path):
+            file_paths = [path]
+            report_path = Path(path).parent / Path(path).stem / "scan.jsonl"
+        else:
+            self.logger.error(f"Invalid 'input' path in request {self.request}")
+            return None
+
+        self.logger.started(f"Scanning {len(file_paths)} files every {self.request.scan_interval:.1f}s ({self.request.scan_mode})")
+
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        writer = ReportWriter(report_path)
+        results = []
+
+        try:
+            for result in self.run_requests([self.clone_request(file_path) for file_path in file_paths], _scan_file):
+                if result:
+                    writer.write(result)
+                    results.append(result)
+        finally:
+            ranking = sorted(results, key=lambda result: result["risk"], reverse=True)
+            writer.close({
+                "files": len(results),
+                "flagged": sum(1 for result in results if result["risk"] > 0),
+                "video_seconds": round(sum(result["duration"] for result in results), 1),
+                "seconds": round(time.time() - start_time, 2),
+                "ranking": [{"file": result["file"], "risk": result["risk"]} for result in ranking]
+            })
+
+        self.logger.finished(f"Scanned {len(results)} files", start_time)
+
+        return results
+
+    def analyze_files(self, file_paths) -> list[Report]:
+        return self.run_requests([self.clone_request(file_path) for file_path in file_paths])
+
+    def run_requests(self, requests: list[VideoAnalysisRequest], run=_analyze_file) -> list:
+        workers = min(self.request.workers, len(requests))
+
+        if workers <= 1:
+            return [run(request) for request in requests]
+
+        self.logger.info(f"Analyzing {len(requests)} requests with {workers} workers")
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(requests[0],)) as executor:
+            return list(executor.map(run, requests))
+
     def analyze_file(self, file_path):
+        return _analyze_file(self.clone_request(file_path))
+
+    def clone_request(self, file_path) -> VideoAnalysisRequest:
         request = self.request.clone()
         request.input = file_path
-        analyzer = VideoFileAnalyzer(request)
-        report = analyzer.analyze()
-        return report
+        return request
     
\ No newline at end of file
@@ -1,13 +1,46 @@
 from argparse import Namespace
 from pydantic import Field, model_validator
-from typing import Optional
+from typing import Literal, Optional
 from sdk.detection.core.core_request import CoreRequest
 
 class VideoAnalysisRequest(CoreRequest):
     input: Optional[str] = Field(None, description="Input file or folder path (for 'file' mode)")
-    model_name: str = Field("yolov8n.pt", description="Path to the YOLO model file (.pt)")
+    model_name: str = Field("yolov8n.pt", description="Path to the YOLO model file (.pt, or .onnx for the onnx backend)")
+    backend: Literal["torch", "onnx"] = Field("torch", description="Person detection backend: PyTorch, or ONNX Runtime on CPU")
+    quantize: bool = Field(False, description="Use a dynamically quantized INT8 model with the onnx backend")
+    intra_op_threads: int = Field(0, ge=0, description="ONNX Runtime threads within an operator, 0 for the number of cores")
+    inter_op_threads: int = Field(1, ge=1, description="ONNX Runtime threads running operators in parallel")
     confidence: float = Field(0.5, ge=0.0, le=1.0, description="Confidence threshold between 0.0 and 1.0")
     frame_skip: int = Field(5, ge=0, description="Number of frames to skip between detections")
+    batch_size: int = Field(1, ge=1, description="Number of sampled frames sent to the person model in one inference call")
+    batch_max_wait: float = Field(0.5, ge=0.0, description="Maximum seconds a partial person batch waits before inference")
+    tracking: bool = Field(False, description="Track person boxes between detections instead of running the person model on every sampled frame")
+    detect_interval: int = Field(30, ge=1, description="Maximum frames between person model detections when tracking")
+    decode_queue_size: int = Field(32, ge=1, description="Maximum number of decoded frames buffered ahead of analysis")
+    reuse_frame_buffers: bool = Field(True, description="Decode frames into a pool of reusable buffers instead of allocating each one")
+    workers: int = Field(1, ge=1, description="Number of worker processes used to analyze chunks in parallel")
+    chunk_seconds: float = Field(300.0, gt=0.0, description="Approximate duration of a chunk when analyzing in parallel")
+    image_format: Literal["png", "jpg", "webp"] = Field("jpg", description="Format of the saved evidence images")
+    image_quality: int = Field(90, ge=1, le=100, description="JPEG/WebP quality of the saved evidence images")
+    image_max_width: Optional[int] = Field(None, ge=1, description="Downscale evidence images wider than this many pixels")
+    image_writer_threads: int = Field(2, ge=1, description="Number of background threads writing evidence images")
+    image_queue_size: int = Field(64, ge=1, description="Maximum number of evidence images waiting to be written")
+    metrics_port: Optional[int] = Field(None, ge=1, le=65535, description="Serve Prometheus metrics on localhost at this port; metrics recorded in worker processes are not included")
+    start_frame: int = Field(0, ge=0, description="First frame to analyze")
+    end_frame: Optional[int] = Field(None, ge=0, description="Frame after the last frame to analyze, None for end of file")
+    look_mode: Literal["yaw", "yaw_pitch", "gaze"] = Field("yaw", description="Look direction analysis mode of the head analyzer")
+    look_away_threshold: float = Field(0.1, ge=0.0, le=1.0, description="Deviation from center that counts as looking away (0.0 to 1.0)")
+    head_cascade: bool = Field(False, description="Run head analysis on crops of the detected person boxes")
+    motion_gate: bool = Field(False, description="Reuse the previous results instead of running analyzers on frames without scene change")
+    motion_threshold: float = Field(2.0, ge=0.0, description="Mean absolute gray-level difference (0-255) that counts as scene change")
+    motion_max_static: int = Field(30, ge=0, description="Sampled frames in a row that may be gated before analysis is forced")
+    checkpoint_interval: float = Field(60.0, ge=0.0, description="Seconds between checkpoints of a running analysis, 0 to disable")
+    resume: bool = Field(True, description="Continue from a matching checkpoint left by an interrupted run")
+    cache_folder: Optional[str] = Field(None, description="Folder of the result cache; None disables caching")
+    cache_max_bytes: int = Field(10 << 30, ge=0, description="Size the result cache is trimmed to, least recently used entries first")
+    scan: bool = Field(False, description="Triage mode: analyze a sparse sample of frames and score each file instead of a full report")
+    scan_mode: Literal["keyframes", "interval"] = Field("keyframes", description="Sample keyframes (one decode each), or frames at a fixed interval found by seeking")
+    scan_interval: float = Field(10.0, gt=0.0, description="Seconds between scanned frames; the minimum spacing of keyframes in 'keyframes' mode")
 
     @classmethod
     def sample(cls) -> "VideoAnalysisRequest":
@@ -27,8 +60,11 @@ class VideoAnalysisRequest(CoreRequest):
         if not input_path:
             raise ValueError("Input path is required")
         
-        if not model_name.endswith(".pt"):
-            raise ValueError("model_name must end with .pt")
+        if model_name and not model_name.endswith((".pt", ".onnx")):
+            raise ValueError("model_name must end with .pt or .onnx")
+
+        if model_name and model_name.endswith(".onnx") and values.get("backend", "torch") != "onnx":
+            raise ValueError("An .onnx model_name requires backend 'onnx'")
         
         return values
     
@@ -42,9 +78,4 @@ class VideoAnalysisRequest(CoreRequest):
     
     def clone(self) -> "VideoAnalysisRequest":
         """Creates a deep copy of the current request."""
-        return VideoAnalysisRequest(
-            input=self.input,
-            model_name=self.model_name,
-            confidence=self.confidence,
-            frame_skip=self.frame_skip
-        )
\ No newline at end of file
+        return self.model_copy(deep=True)
\ No newline at end of file
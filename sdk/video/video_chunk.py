@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+
+class VideoChunk(BaseModel):
+    index: int = Field(..., ge=0, description="Position of the chunk in the video")
+    start_frame: int = Field(..., ge=0, description="First frame of the chunk")
+    end_frame: int = Field(..., ge=0, description="Frame after the last frame of the chunk")
+    start_pts: float = Field(0.0, ge=0.0, description="Presentation timestamp of the first frame in seconds")
+
+    @property
+    def frame_count(self):
+        return self.end_frame - self.start_frame
@@ -1,20 +1,64 @@
+import os
 import time
-import cv2
+from pathlib import Path
 from sdk.app.logger import Logger  
+from sdk.app.metrics import Metrics
+from sdk.detection.core.checkpoint import Checkpoint
 from sdk.detection.core.core_analyzer import CoreAnalyzer
+from sdk.detection.core.image_writer import ImageWriter
+from sdk.detection.head.head_request import HeadRequest
 from sdk.detection.person.person_request import PersonRequest
 from sdk.detection.report.report import Report
 from sdk.detection.report.report_item import ReportItem
+from sdk.detection.report.report_writer import ReportWriter
+from sdk.video.frame_batcher import FrameBatcher
+from sdk.video.frame_scheduler import FrameScheduler
+from sdk.video.frame_source import FrameSource
+from sdk.video.motion_gate import MotionGate
+from sdk.video.result_cache import ResultCache
 from sdk.video.video_analysis_request import VideoAnalysisRequest
+from sdk.video.video_frame import VideoFrame
 from sdk.detection.head.head_file_analyzer import HeadFileAnalyzer
 from sdk.detection.person.person_file_analyzer import PersonFileAnalyzer
 
 class VideoFileAnalyzer:
+    PROGRESS_INTERVAL = 0.5
+    PERSON_FIELDS = (
+        "model_name", "backend", "quantize", "intra_op_threads", "inter_op_threads",
+        "batch_size", "batch_max_wait", "tracking", "detect_interval", "confidence", "frame_skip"
+    )
+    HEAD_FIELDS = ("look_mode", "look_away_threshold", "frame_skip")
+    CACHE_FIELDS = ("start_frame", "end_frame", "motion_gate", "motion_threshold", "motion_max_static", "image_format", "image_quality", "image_max_width")
+
     def __init__(self, request: VideoAnalysisRequest):
         self.request = request
         self.logger = Logger(__name__)
         self._analyzers = None
-        self.cap = None
+        self.source = None
+        self.scheduler = None
+        self.batchers = {}
+        self.waiting = {}  # Analyzer -> frames held until its dependencies have analyzed them
+        self.motion_gate = MotionGate(request.motion_threshold, request.motion_max_static) if request.motion_gate else None
+        self.last_results = {}
+        self.last_images = {}
+        self.dependencies = {}  # Analyzer -> analyzers whose output it uses, which must run with it
+        self.cache = ResultCache(request.cache_folder, request.cache_max_bytes) if request.cache_folder else None
+        self.checkpoint = Checkpoint(self.checkpoint_path, request.checkpoint_interval, self.checkpoint_signature())
+        self.resume_state = self.checkpoint.load() if request.resume else None
+
+        if self.resume_state:
+            # Analyzers clean their output folder on creation, which would drop the evidence written so far
+            self.request = request = request.model_copy(update={"clean_output": False})
+        self.error = None  # Exception that ended the last analyze() early
+        self.on_progress = None  # Called with the analyzed fraction (0.0 to 1.0), at most every PROGRESS_INTERVAL seconds
+        self._progress_time = 0.0
+        self.image_writer = ImageWriter(
+            request.image_format,
+            request.image_quality,
+            request.image_max_width,
+            request.image_writer_threads,
+            request.image_queue_size
+        )
 
         self.add_sample_analyzer()
 
@@ -26,90 +70,487 @@ class VideoFileAnalyzer:
     def analyzers(self, value):
         self._analyzers = value
 
-    def open_video(self, file_path):
-        self.cap = cv2.VideoCapture(file_path)
+    @property
+    def output_folder(self):
+        return Path(self.request.input).parent / Path(self.request.input).stem
+
+    @property
+    def is_chunk(self):
+        return self.request.start_frame > 0 or self.request.end_frame is not None
+
+    @property
+    def events_path(self):
+        if self.is_chunk:
+            return self.output_folder / f"events_{self.request.start_frame:08d}.npz"
+
+        return self.output_folder / "events.npz"
+
+    @property
+    def metrics_path(self):
+        if self.is_chunk:
+            return self.output_folder / f"metrics_{self.request.start_frame:08d}.json"
+
+        return self.output_folder / "metrics.json"
+
+    @property
+    def checkpoint_path(self):
+        if self.is_chunk:
+            return self.output_folder / f"checkpoint_{self.request.start_frame:08d}.pkl"
+
+        return self.output_folder / "checkpoint.pkl"
 
-        if not self.cap.isOpened():
-            self.logger.failed(f"Cannot open video file: {file_path}")
+    @property
+    def report_path(self):
+        if self.is_chunk:
+            return self.output_folder / f"report_{self.request.start_frame:08d}.jsonl"
+
+        return self.output_folder / "report.jsonl"
+
+    def open_video(self, file_path, analyzers=None, start_frame=None):
+        self.scheduler = FrameScheduler(analyzers or self.analyzers)
+        source = FrameSource(
+            file_path,
+            self.scheduler.plan,
+            self.request.decode_queue_size,
+            self.request.start_frame if start_frame is None else start_frame,
+            self.request.end_frame,
+            self.buffer_pool_size(analyzers or self.analyzers)
+        )
+
+        if not source.open():
             return None
         
         self.logger.success(f"Video opened: {file_path}")
 
-        return self.cap
+        return source
 
     def add_sample_analyzer(self):
+        # Built through validation, so invalid combinations (e.g. an .onnx model without the onnx backend) fail here
+        person_request = PersonRequest.model_validate(
+            PersonRequest.default(self.request.input).model_dump()
+            | {name: getattr(self.request, name) for name in self.PERSON_FIELDS}
+            | {"clean_output": self.request.clean_output}
+        )
+        # The head analyzer has no confidence threshold of its own; it samples at the same stride.
+        # A report item holds one image, so each look-away segment keeps only its peak frame.
+        head_request = HeadRequest.model_validate(
+            HeadRequest.default(self.request.input).model_dump()
+            | {name: getattr(self.request, name) for name in self.HEAD_FIELDS}
+            | {"cascade": self.request.head_cascade, "evidence_frames": 1, "clean_output": self.request.clean_output}
+        )
+
+        person_analyzer = PersonFileAnalyzer(person_request)
+        head_analyzer = HeadFileAnalyzer(head_request)
+
+        # In cascade mode, head frames wait until the person batch holding them has run (see run_dependent)
+        head_analyzer.box_source = person_analyzer.person_boxes
+
+        if head_request.cascade:
+            self.dependencies[head_analyzer] = [person_analyzer]
+
         self._analyzers = [
-                PersonFileAnalyzer(PersonRequest.default(self.request.input)),
-                HeadFileAnalyzer(PersonRequest.default(self.request.input))
+                person_analyzer,
+                head_analyzer
               ]
+
+        for analyzer in self._analyzers:
+            analyzer.image_writer = self.image_writer
         
     def analyze(self) -> Report:
         self.logger.started(f"Started analyzing video")
 
         start_time = time.time()
 
+        report = Report(keep_items=False)
+        writer = None
+        stats = {}
+
+        # The process-wide totals also hold earlier files of a folder run or a warm job worker
+        metrics = Metrics.instance().begin_scope()
+
         try:
-            report = Report()
+            cached, analyzers = self.load_cached()
+            state = self.resume_state
+
+            if state and state["analyzers"] != [analyzer.type for analyzer in analyzers]:
+                state = None  # The cache hits changed since the checkpoint, start over
+
+            if analyzers:
+                start_frame = state["frame_index"] + 1 if state else None
+                self.source = self.open_video(self.request.input, analyzers, start_frame)
+                if self.source is None:
+                    return
 
-            self.cap = self.open_video(self.request.input)
-            if self.cap is None:
-                return
+            if state:
+                # Events up to the checkpoint, cache hits included, are restored; later lines are dropped
+                writer = ReportWriter(self.report_path, append=True, offset=state["report_offset"], count=state["report_count"])
+                self.restore_checkpoint(report, state, analyzers)
+                self.logger.info(f"Resuming from frame {state['frame_index'] + 1}")
+            else:
+                writer = ReportWriter(self.report_path)
 
-            frame_index = 0
+            for analyzer, (events, analyzer_stats) in cached.items():
+                if not state:
+                    self.add_items(report, writer, self.to_items(events))
 
-            while True:
-                ret, frame = self.cap.read()
+                if analyzer_stats is not None:
+                    stats[analyzer.type] = analyzer_stats
 
-                if not ret:
-                    break
+            if analyzers:
+                self.batchers = {analyzer: FrameBatcher(analyzer) for analyzer in analyzers}
 
-                frame_index += 1
-                
-                report = self.run_analyzers(frame_index, frame)
-                
-            self.cap.release()
+                with self.source:
+                    for frame in self.source:
+                        self.add_items(report, writer, self.run_analyzers(frame))
+                        self.report_progress(frame)
+                        frame.release()
 
-            if report.items.count == 0:
+                        if self.checkpoint.is_due():
+                            self.save_checkpoint(report, writer, frame, analyzers)
+
+                self.add_items(report, writer, self.flush_analyzers())
+                self.add_items(report, writer, self.close_segments(analyzers))
+                computed = self.finalize_analyzers(analyzers)
+                stats.update(computed)
+                self.store_cached(report, analyzers, computed)
+            else:
+                self.logger.success("All analyzer results loaded from cache")
+
+            if len(report.events) == 0:
                 self.logger.failed("No detection found in the video")
 
+            report.events.to_npz(self.events_path)
+            metrics.save(self.metrics_path)
+            self.checkpoint.remove()
+
             self.logger.finished("Video analysis complete", start_time)
         except Exception as e:
+            self.error = e
             self.logger.error("Error during video analysis.", e)
+        finally:
+            Metrics.instance().end_scope(metrics)
+
+            if writer:
+                writer.close({**report.summary(), **stats})
+
+            self.release()
         
         return report
 
-    def run_analyzers(self, frame_index, frame) -> Report:
-        report = Report()
+    def buffer_pool_size(self, analyzers) -> int:
+        if not self.request.reuse_frame_buffers:
+            return 0
+
+        # Frames in flight: the decode queue, pending batches, frames waiting for a dependency's
+        # batch, the frame being handled and the one being decoded
+        waiting = sum(dependency.batch_size for analyzer in analyzers for dependency in self.dependencies.get(analyzer, []))
+
+        return self.request.decode_queue_size + sum(analyzer.batch_size for analyzer in analyzers) + waiting + 2
+
+    def checkpoint_signature(self) -> dict:
+        stat = os.stat(self.request.input) if os.path.isfile(self.request.input) else None
+
+        return {
+            "file": (os.path.abspath(self.request.input), stat.st_size, stat.st_mtime_ns) if stat else self.request.input,
+            "request": self.request.model_dump(exclude={"clean_output", "resume", "checkpoint_interval", "workers", "metrics_port"})
+        }
+
+    def save_checkpoint(self, report: Report, writer: ReportWriter, frame: VideoFrame, analyzers):
+        # Pending batches and evidence images are completed first, so the state is
+        # exactly "every frame up to this one is done"
+        self.add_items(report, writer, self.flush_analyzers())
+        self.image_writer.flush()
+
+        self.checkpoint.save({
+            "frame_index": frame.index,
+            "analyzers": [analyzer.type for analyzer in analyzers],
+            "events": report.events,
+            "report_offset": writer.position,
+            "report_count": writer.count,
+            "analyzer_states": {analyzer.type: analyzer.get_state() for analyzer in analyzers},
+            "motion_gate": self.motion_gate,
+            "last_results": {analyzer.type: result for analyzer, result in self.last_results.items()},
+            "last_images": {analyzer.type: image for analyzer, image in self.last_images.items()}
+        })
+
+    def restore_checkpoint(self, report: Report, state, analyzers):
+        report.events = state["events"]
+        self.motion_gate = state["motion_gate"]
+
+        for analyzer in analyzers:
+            analyzer.set_state(state["analyzer_states"][analyzer.type])
+
+            if analyzer.type in state["last_results"]:
+                self.last_results[analyzer] = state["last_results"][analyzer.type]
+
+            if analyzer.type in state["last_images"]:
+                self.last_images[analyzer] = state["last_images"][analyzer.type]
+
+    def report_progress(self, frame: VideoFrame):
+        now = time.perf_counter()
+
+        if not self.on_progress or now - self._progress_time < self.PROGRESS_INTERVAL:
+            return
+
+        self._progress_time = now
+        end_frame = self.request.end_frame or self.source.frame_count
+        total = end_frame - self.request.start_frame
+
+        if total > 0:
+            self.on_progress(min(1.0, (frame.index - self.request.start_frame + 1) / total))
+
+    def add_items(self, report: Report, writer: ReportWriter, items: list[ReportItem]):
+        for item in items:
+            report.add(item)
+            writer.write(item.model_dump())
+
+    def release(self):
+        self.image_writer.close()
 
         for analyzer in self.analyzers:
-            item = self.run_analyzer(analyzer, frame_index, frame)
+            analyzer.release()
 
-            if item:
-                report.items.append(item)
+    def run_analyzers(self, frame: VideoFrame) -> list[ReportItem]:
+        items = []
+        targets = self.scheduler.analyzers_for(frame)
 
-        return report
+        if targets and self.motion_gate and self.motion_gate.is_static(frame.image):
+            Metrics.instance().inc("frames_static_total")
+
+            # Earlier frames still held in a batch or waiting for a dependency are analyzed first,
+            # so the carried results are the latest ones and segments see the frames in order
+            items.extend(self.flush_analyzers())
+
+            for analyzer in targets:
+                items.extend(self.carry_forward(analyzer, frame))
+
+            targets = []
+
+        for analyzer in targets:
+            if analyzer in self.dependencies:
+                items.extend(self.run_dependent(analyzer, frame))
+            else:
+                items.extend(self.run_analyzer(analyzer, frame))
+
+        # Partial batches of analyzers that did not want this frame must not wait forever
+        for analyzer, batcher in self.batchers.items():
+            if analyzer not in targets and batcher.is_expired():
+                items.extend(self.run_batch(analyzer, batcher.flush))
+
+        for analyzer in self.waiting:
+            items.extend(self.run_dependent(analyzer))
+
+        return items
+
+    def run_dependent(self, analyzer: CoreAnalyzer, frame: VideoFrame = None) -> list[ReportItem]:
+        """Runs an analyzer that uses other analyzers' output once they are done with its frames.
+
+        Frames wait while a dependency still holds frames in a pending batch,
+        so e.g. head crops use the person boxes of the same frame even with
+        batched person inference.
+        """
+        waiting = self.waiting.setdefault(analyzer, [])
+
+        if frame is not None:
+            frame.retain()
+            waiting.append(frame)
+
+        if any(self.batchers[dependency].frames for dependency in self.dependencies[analyzer] if dependency in self.batchers):
+            return []
+
+        items = []
+
+        for waiting_frame in waiting:
+            items.extend(self.run_analyzer(analyzer, waiting_frame))
+            waiting_frame.release()
+
+        waiting.clear()
+
+        return items
+
+    def load_cached(self):
+        """Splits the analyzers into cache hits, as {analyzer: (events, stats)}, and the ones to run."""
+        if not self.cache:
+            return {}, self.analyzers
+
+        content_hash = self.cache.content_hash(self.request.input)
+        metrics = Metrics.instance()
+        cached = {}
+        misses = []
+
+        for analyzer in self.analyzers:
+            hit = self.cache.get(self.cache_key(analyzer, content_hash), analyzer.output_folder)
+            metrics.inc("cache_hits_total" if hit else "cache_misses_total", analyzer=analyzer.type)
+
+            if hit:
+                cached[analyzer] = hit
+            else:
+                misses.append(analyzer)
+
+        if misses and self.motion_gate:
+            # Gate decisions depend on the frames every analyzer asked for
+            misses = list(self.analyzers)
+
+        for analyzer in list(misses):
+            misses.extend(dependency for dependency in self.dependencies.get(analyzer, []) if dependency not in misses)
+
+        analyzers = [analyzer for analyzer in self.analyzers if analyzer in misses]
+        cached = {analyzer: hit for analyzer, hit in cached.items() if analyzer not in misses}
+
+        self.logger.info(f"Cache hits: {[analyzer.type for analyzer in cached]}, to analyze: {[analyzer.type for analyzer in analyzers]}")
+
+        return cached, analyzers
+
+    def store_cached(self, report: Report, analyzers, stats):
+        if not self.cache:
+            return
+
+        self.image_writer.flush()  # Evidence images must be on disk before they are copied
+        content_hash = self.cache.content_hash(self.request.input)
+
+        for analyzer in analyzers:
+            self.cache.put(self.cache_key(analyzer, content_hash), report.events.select(analyzer.type), stats.get(analyzer.type))
+
+    def cache_key(self, analyzer: CoreAnalyzer, content_hash) -> str:
+        exclude = {"input", "clean_output", "checkpoint_interval", "resume"}  # They do not change results
+        fields = {
+            "content": content_hash,
+            "analyzer": analyzer.type,
+            "request": analyzer.request.model_dump(exclude=exclude),
+            "video": {name: getattr(self.request, name) for name in self.CACHE_FIELDS}
+        }
+
+        if self.motion_gate or analyzer in self.dependencies:
+            fields["others"] = {other.type: other.request.model_dump(exclude=exclude) for other in self.analyzers if other is not analyzer}
+
+        return self.cache.key(fields)
+
+    def to_items(self, events) -> list[ReportItem]:
+        return [
+            ReportItem(
+                confidence=record["confidence"],
+                image=record["detail"].get("image") or "",
+                timestamp=record["timestamp"],
+                detail=record["detail"].get("detail"),
+                type=record["type"],
+                frame_index=record["frame_index"],
+                duration=record["duration"],
+                carried_forward=record["detail"].get("carried_forward", False)
+            )
+            for record in events.to_records()
+        ]
+
+    def finalize_analyzers(self, analyzers=None) -> dict:
+        stats = {}
+
+        for analyzer in analyzers or self.analyzers:
+            analyzer_stats = analyzer.finalize(self.source.fps)
+
+            if analyzer_stats is not None:
+                stats[analyzer.type] = analyzer_stats
+
+        return stats
+
+    def flush_analyzers(self) -> list[ReportItem]:
+        items = []
+
+        # Dependencies come first in the batchers, so their flush releases the frames waiting on them
+        for analyzer, batcher in self.batchers.items():
+            if analyzer in self.waiting:
+                items.extend(self.run_dependent(analyzer))
+
+            items.extend(self.run_batch(analyzer, batcher.flush))
+
+        return items
     
-    def run_analyzer(self, analyzer: CoreAnalyzer, frame_index, frame) -> Report:
-        start_time = time.time()
+    def run_analyzer(self, analyzer: CoreAnalyzer, frame: VideoFrame) -> list[ReportItem]:
+        return self.run_batch(analyzer, lambda: self.batchers[analyzer].add(frame))
+
+    def run_batch(self, analyzer: CoreAnalyzer, run) -> list[ReportItem]:
+        start = time.perf_counter()
 
-        item = None
+        items = []
 
         try:
-            result = analyzer.analyze_frame(frame_index, frame)
+            results = run()
 
-            if not result:
-                return item;
-        
-            if result.success:
-                item = ReportItem.default()
-                item.confidence = result.confidence
-                item.timestamp = analyzer.to_timestamp(self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
-                item.image = analyzer.save_frame(frame, item.timestamp)
-                item.detail = result.detail
-                
-                self.logger.finished(f"Frame [{frame_index}]: Analysis completed by [{analyzer.type_title}] analyzer", start_time)
+            try:
+                for frame, result in results:
+                    self.last_results[analyzer] = result
+                    items.extend(self.emit(analyzer, frame, result))
+            finally:
+                # Evidence images are copied on submit, so the batch's buffers can be reused now
+                for frame, _ in results:
+                    frame.release()
+
+            if results:
+                metrics = Metrics.instance()
+                metrics.observe("stage_seconds", (time.perf_counter() - start) / len(results), len(results), stage="analyze", analyzer=analyzer.type)
+                metrics.inc("events_total", len(items), analyzer=analyzer.type)
+                self.logger.debug("Frames [%d-%d]: Analysis completed by [%s] analyzer", results[0][0].index, results[-1][0].index, analyzer.type_title, every=5.0)
 
         except Exception as e:
-            self.logger.error(f"Error in Frame [{frame_index}]: [{analyzer.type_title}] analyzer.", e)
+            self.logger.error(f"Error in [{analyzer.type_title}] analyzer.", e)
         
-        return item
\ No newline at end of file
+        return items
+
+    def carry_forward(self, analyzer: CoreAnalyzer, frame: VideoFrame) -> list[ReportItem]:
+        result = self.last_results.get(analyzer)
+
+        if result is None:
+            return []
+
+        return self.emit(analyzer, frame, result.model_copy(update={"carried_forward": True}))
+
+    def emit(self, analyzer: CoreAnalyzer, frame: VideoFrame, result) -> list[ReportItem]:
+        """Report items of a frame's result: the frame itself, or for segment analyzers the segments it closed."""
+        if analyzer.reports_segments:
+            # Evidence is only copied for frames the segment keeps
+            segments = analyzer.track_result(frame.index, frame.timestamp, result, lambda: self.image_writer.prepare(frame.image), self.source.fps)
+            return [self.to_segment_item(analyzer, segment) for segment in segments]
+
+        item = self.to_item(analyzer, frame, result)
+
+        return [item] if item else []
+
+    def close_segments(self, analyzers) -> list[ReportItem]:
+        return [
+            self.to_segment_item(analyzer, segment)
+            for analyzer in analyzers
+            for segment in analyzer.close_segments(self.source.fps)
+        ]
+
+    def to_segment_item(self, analyzer: CoreAnalyzer, segment) -> ReportItem:
+        return ReportItem(
+            confidence=segment["confidence"],
+            image=segment["image"],
+            timestamp=segment["start"],
+            detail={key: value for key, value in segment.items() if key not in ("image", "timestamp")},
+            type=analyzer.type,
+            frame_index=segment["start_frame"],
+            duration=segment["duration"]
+        )
+
+    def to_item(self, analyzer: CoreAnalyzer, frame: VideoFrame, result) -> ReportItem:
+        if not result or not result.success:
+            return None
+
+        item = ReportItem.default()
+        item.confidence = result.confidence
+        item.timestamp = frame.timestamp
+        item.carried_forward = result.carried_forward
+
+        if result.carried_forward and analyzer in self.last_images:
+            item.image = self.last_images[analyzer]  # Same scene, so the earlier evidence still shows it
+        else:
+            image = self.image_writer.prepare(frame.image)
+            analyzer.annotate(image, frame.index, image.shape[1] / frame.image.shape[1])
+            item.image = analyzer.save_frame(image, analyzer.to_timestamp(frame.timestamp), frame.index, prepared=True)
+            self.last_images[analyzer] = item.image
+
+        item.detail = result.detail
+        item.type = analyzer.type
+        item.frame_index = frame.index
+        item.duration = analyzer.frame_skip / self.source.fps
+
+        return item
@@ -0,0 +1,24 @@
+class VideoFrame:
+    def __init__(self, index, timestamp, image, targets=None, pool=None):
+        self.index = index
+        self.timestamp = timestamp  # PTS in seconds
+        self.image = image
+        self.targets = targets  # Analyzers that requested this frame, when scheduled
+        self.captured_at = None  # time.perf_counter() at capture, for live sources
+        self._pool = pool  # FrameBufferPool owning the image buffer, if any
+        self._refs = 1
+
+    def retain(self):
+        """Keeps the image buffer alive for one more holder, e.g. a pending batch."""
+        self._refs += 1
+
+    def release(self):
+        """Drops one holder; the last one returns a pooled buffer for reuse."""
+        self._refs -= 1
+
+        if self._refs == 0 and self._pool is not None:
+            self._pool.release(self.image)
+            self.image = None
+
+    def __repr__(self):
+        return f"VideoFrame(index={self.index}, timestamp={self.timestamp:.3f})"
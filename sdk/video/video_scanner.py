@@ -0,0 +1,113 @@
+import time
+from sdk.app.logger import Logger
+from sdk.app.metrics import Metrics
+from sdk.detection.head.head_file_analyzer import HeadFileAnalyzer
+from sdk.detection.head.head_request import HeadRequest
+from sdk.detection.person.person_file_analyzer import PersonFileAnalyzer
+from sdk.detection.person.person_request import PersonRequest
+from sdk.video.scan_source import ScanSource
+from sdk.video.video_analysis_request import VideoAnalysisRequest
+
+class VideoScanner:
+    """Triage pass over a video: person and head analysis on a sparse sample of frames.
+
+    Instead of a report, it returns a coarse risk score per file, used to rank
+    a backlog and pick the recordings that deserve a full analysis. Each
+    analyzer's score is the confidence-weighted fraction of samples it
+    flagged, and the risk is the chance that any of them fires on a sample,
+    1 - (1 - person) * (1 - head). No evidence images are saved and the
+    output folders are not cleaned, so an earlier full analysis is kept.
+    """
+
+    MAX_HITS = 10
+
+    def __init__(self, request: VideoAnalysisRequest):
+        self.request = request
+        self.logger = Logger(__name__)
+        self.analyzers = self.create_analyzers()
+
+    def create_analyzers(self):
+        person_request = PersonRequest.default(self.request.input)
+        head_request = HeadRequest.default(self.request.input)
+        head_request.look_mode = self.request.look_mode
+        head_request.look_away_threshold = self.request.look_away_threshold
+
+        for name in ("model_name", "backend", "quantize", "intra_op_threads", "inter_op_threads", "confidence"):
+            setattr(person_request, name, getattr(self.request, name))
+
+        # Every sample is analyzed, and samples are seconds apart, so nothing can be tracked between them
+        for request in (person_request, head_request):
+            request.frame_skip = 1
+            request.clean_output = False
+
+        head_request.static_frames = True
+        head_request.cascade = self.request.head_cascade
+
+        person_analyzer = PersonFileAnalyzer(person_request)
+        head_analyzer = HeadFileAnalyzer(head_request)
+        head_analyzer.box_source = person_analyzer.person_boxes
+
+        return [person_analyzer, head_analyzer]
+
+    def scan(self) -> dict:
+        start_time = time.time()
+
+        source = ScanSource(self.request.input, self.request.scan_interval, self.request.scan_mode)
+        if not source.open():
+            return None
+
+        metrics = Metrics.instance()
+        flagged = {analyzer.type: 0 for analyzer in self.analyzers}
+        scores = {analyzer.type: 0.0 for analyzer in self.analyzers}
+        hits = []
+        samples = 0
+
+        with source:
+            for frame in source:
+                samples += 1
+
+                # Person analysis runs first, so its boxes are ready for the head crops
+                for analyzer in self.analyzers:
+                    with metrics.timer("stage_seconds", stage="analyze", analyzer=analyzer.type):
+                        result = analyzer.analyze_frame(frame.index, frame.image)
+
+                    if result and result.success:
+                        flagged[analyzer.type] += 1
+                        scores[analyzer.type] += result.confidence
+                        hits.append({
+                            "type": analyzer.type,
+                            "frame_index": frame.index,
+                            "timestamp": round(frame.timestamp, 3),
+                            "confidence": result.confidence
+                        })
+
+        metrics.inc("files_scanned_total")
+
+        clear = 1.0
+
+        for analyzer_type in scores:
+            scores[analyzer_type] = scores[analyzer_type] / samples if samples else 0.0
+            clear *= 1.0 - scores[analyzer_type]
+
+        hits = sorted(hits, key=lambda hit: hit["confidence"], reverse=True)[:self.MAX_HITS]
+        seconds = time.time() - start_time
+
+        self.logger.finished(f"Scanned {samples} frames of {self.request.input}, risk {1.0 - clear:.2f}", start_time)
+
+        return {
+            "file": self.request.input,
+            "mode": source.mode,
+            "duration": round(source.duration, 1),
+            "samples": samples,
+            "risk": round(1.0 - clear, 3),
+            "analyzers": {
+                analyzer_type: {"flagged": flagged[analyzer_type], "score": round(scores[analyzer_type], 3)}
+                for analyzer_type in scores
+            },
+            "hits": sorted(hits, key=lambda hit: hit["timestamp"]),
+            "seconds": round(seconds, 2)
+        }
+
+    def release(self):
+        for analyzer in self.analyzers:
+            analyzer.release()
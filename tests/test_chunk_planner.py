@@ -0,0 +1,57 @@
+import subprocess
+import pytest
+
+pytest.importorskip("cv2")
+
+from sdk.video.chunk_planner import ChunkPlanner
+
+def create_planner(monkeypatch, fps, frame_count, keyframes, chunk_seconds):
+    planner = ChunkPlanner("video.mp4", chunk_seconds)
+    monkeypatch.setattr(planner, "get_video_info", lambda: (fps, frame_count))
+    monkeypatch.setattr(planner, "get_keyframes", lambda: keyframes)
+    return planner
+
+def assert_contiguous(chunks, frame_count):
+    assert chunks[0].start_frame == 0
+    assert chunks[-1].end_frame == frame_count
+    assert all(a.end_frame == b.start_frame for a, b in zip(chunks, chunks[1:]))
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+
+def test_chunks_start_on_the_first_keyframe_after_each_chunk_end(monkeypatch):
+    keyframes = [(frame_index, frame_index / 24) for frame_index in range(0, 1000, 48)]
+    chunks = create_planner(monkeypatch, 24, 1000, keyframes, 10.0).plan()
+
+    assert_contiguous(chunks, 1000)
+    assert [chunk.start_frame for chunk in chunks] == [0, 240, 480, 720, 960]
+    assert chunks[1].start_pts == pytest.approx(10.0)
+
+def test_irregular_keyframes_make_longer_chunks(monkeypatch):
+    keyframes = [(0, 0.0), (100, 4.0), (300, 12.0), (310, 12.4), (700, 28.0)]
+    chunks = create_planner(monkeypatch, 25, 800, keyframes, 10.0).plan()
+
+    assert_contiguous(chunks, 800)
+    assert [chunk.start_frame for chunk in chunks] == [0, 300, 700]
+
+def test_even_split_without_keyframes(monkeypatch):
+    chunks = create_planner(monkeypatch, 30, 1000, [], 10.0).plan()
+
+    assert_contiguous(chunks, 1000)
+    assert [chunk.start_frame for chunk in chunks] == [0, 300, 600, 900]
+    assert chunks[3].start_pts == pytest.approx(30.0)
+
+def test_short_video_is_one_chunk(monkeypatch):
+    chunks = create_planner(monkeypatch, 30, 100, [(0, 0.0), (60, 2.0)], 10.0).plan()
+
+    assert [(chunk.start_frame, chunk.end_frame) for chunk in chunks] == [(0, 100)]
+
+def test_keyframes_follow_presentation_order(monkeypatch):
+    # B-frames: packets come in decode order; the stream starts at PTS 1.0
+    stdout = "1.000000,K__\n1.080000,___\n1.040000,___\nN/A,___\n1.120000,K__\n1.160000,___\n"
+    planner = ChunkPlanner("video.mp4")
+    planner.ffprobe_path = "ffprobe"
+    monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: subprocess.CompletedProcess(args, 0, stdout, ""))
+
+    keyframes = planner.get_keyframes()
+
+    assert [frame_index for frame_index, _ in keyframes] == [0, 3]
+    assert [pts for _, pts in keyframes] == pytest.approx([0.0, 0.12])
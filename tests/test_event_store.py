@@ -0,0 +1,28 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from sdk.detection.report.event_store import EventStore
+
+def test_episodes_merge_events_touching_up_to_rounding():
+    # frame_skip 5 at 6 fps: each event lasts 5/6 s, and start + duration
+    # differs from the next start in the last bit for some frames
+    fps, frame_skip = 6, 5
+    store = EventStore()
+
+    for frame_index in range(0, 20 * fps, frame_skip):
+        store.append("person", frame_index, frame_index / fps, 0.9, duration=frame_skip / fps)
+
+    episodes = store.episodes()
+
+    assert len(episodes) == 1
+    assert episodes[0]["count"] == 24
+    assert episodes[0]["end"] == pytest.approx(20.0)
+
+def test_episodes_split_on_real_gaps():
+    store = EventStore()
+    store.append("person", 0, 0.0, 0.9, duration=1.0)
+    store.append("person", 30, 1.5, 0.9, duration=1.0)
+
+    assert len(store.episodes()) == 2
+    assert len(store.episodes(gap=0.5)) == 1
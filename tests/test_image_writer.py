@@ -0,0 +1,24 @@
+import threading
+import pytest
+
+pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from sdk.detection.core.image_writer import ImageWriter
+
+def test_submit_after_close_restarts_the_writer(tmp_path):
+    writer = ImageWriter(threads=1, queue_size=2)
+    frame = np.zeros((16, 16, 3), dtype=np.uint8)
+    writer.close()
+
+    # More images than the queue holds would block forever without writer threads
+    submitter = threading.Thread(target=lambda: [writer.submit(tmp_path / f"{i}.jpg", frame) for i in range(5)], daemon=True)
+    submitter.start()
+    submitter.join(timeout=10)
+
+    assert not submitter.is_alive()
+
+    writer.close()
+
+    assert writer.written == 5
+    assert len(list(tmp_path.glob("*.jpg"))) == 5
@@ -0,0 +1,41 @@
+import logging
+from sdk.app.logger import _Message, _RateLimitFilter
+
+def make_record(message):
+    record = logging.LogRecord("sdk.test", logging.DEBUG, __file__, 1, message, None, None)
+    record.every = 60.0
+    return record
+
+def test_rate_limit_keeps_callable_messages_lazy():
+    calls = []
+
+    def message():
+        calls.append(1)
+        return "frame done"
+
+    limiter = _RateLimitFilter()
+    records = [make_record(_Message("", "DEBUG", "test", message, (), None)) for _ in range(4)]
+
+    assert limiter.filter(records[0])
+    assert not limiter.filter(records[1])
+    assert not limiter.filter(records[2])
+
+    # Let the next one through as if the interval had passed
+    limiter._last.clear()
+    assert limiter.filter(records[3])
+
+    assert calls == []
+    assert str(records[3].msg).endswith("frame done (+2 similar suppressed)")
+    assert len(calls) == 1
+
+def test_rate_limit_ignores_records_without_every():
+    record = make_record(_Message("", "INFO", "test", "hello", (), None))
+    record.every = None
+
+    assert all(_RateLimitFilter().filter(record) for _ in range(3))
+
+def test_rate_limit_groups_lambdas_from_one_call_site():
+    limiter = _RateLimitFilter()
+    records = [make_record(_Message("", "DEBUG", "test", lambda i=i: f"frame {i}", (), None)) for i in range(3)]
+
+    assert [limiter.filter(record) for record in records] == [True, False, False]
@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from sdk.video.motion_gate import MotionGate
+
+def gray_frame(level):
+    return np.full((120, 160, 3), level, dtype=np.uint8)
+
+def test_first_frame_passes_and_unchanged_frames_are_static():
+    gate = MotionGate(threshold=2.0, max_static=30)
+
+    assert not gate.is_static(gray_frame(100))
+    assert gate.is_static(gray_frame(100))
+    assert gate.is_static(gray_frame(101))
+    assert gate.static_count == 2
+
+def test_scene_change_passes():
+    gate = MotionGate(threshold=2.0)
+    gate.is_static(gray_frame(100))
+
+    assert not gate.is_static(gray_frame(110))
+    assert gate.score == pytest.approx(10.0)
+    assert gate.static_count == 0
+
+def test_slow_drift_adds_up_against_the_last_passed_frame():
+    gate = MotionGate(threshold=2.5)
+    gate.is_static(gray_frame(100))
+
+    # Each step is below the threshold, but the third is 3 levels from the reference
+    assert [gate.is_static(gray_frame(level)) for level in (101, 102, 103)] == [True, True, False]
+
+def test_max_static_forces_analysis():
+    gate = MotionGate(threshold=2.0, max_static=3)
+    frame = gray_frame(100)
+
+    assert [gate.is_static(frame) for _ in range(9)] == [False, True, True, True, False, True, True, True, False]
+
+def test_reset_passes_the_next_frame():
+    gate = MotionGate()
+    gate.is_static(gray_frame(100))
+    gate.reset()
+
+    assert not gate.is_static(gray_frame(100))
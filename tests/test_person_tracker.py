@@ -0,0 +1,78 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from sdk.detection.person.person_tracker import PersonTracker
+
+def people(frame_index, confidence=0.9):
+    """Two people walking right at 2 px per frame, far enough apart never to overlap."""
+    shift = 2 * frame_index
+    return np.array([
+        [10 + shift, 20, 60 + shift, 140, confidence],
+        [300 + shift, 20, 350 + shift, 140, confidence]
+    ], dtype=np.float32)
+
+def test_needs_detection_on_first_frame_and_after_interval():
+    tracker = PersonTracker(detect_interval=30)
+
+    assert tracker.needs_detection(0)
+
+    tracker.update(0, people(0))
+
+    assert not tracker.needs_detection(10)
+    assert not tracker.needs_detection(29)
+    assert tracker.needs_detection(30)
+
+    # A planned detection counts before it has run
+    assert not tracker.needs_detection(40, last_detection=30)
+
+def test_needs_detection_when_confidence_decays_below_minimum():
+    tracker = PersonTracker(detect_interval=100, min_confidence=0.3, decay=0.98)
+    tracker.update(0, people(0, confidence=0.35))
+
+    # 0.35 * 0.98 ** 7 = 0.304, 0.35 * 0.98 ** 8 = 0.298
+    assert not tracker.needs_detection(7)
+    assert tracker.needs_detection(8)
+
+def test_needs_no_early_detection_without_tracks():
+    tracker = PersonTracker(detect_interval=30)
+    tracker.update(0, np.empty((0, 5), np.float32))
+
+    assert not tracker.needs_detection(10)
+    assert tracker.needs_detection(30)
+
+def test_update_matches_detections_and_keeps_ids():
+    tracker = PersonTracker(detect_interval=5)
+    tracker.update(0, people(0))
+
+    for frame_index in range(5, 50, 5):
+        detections = people(frame_index)[::-1]  # Detection order must not matter
+        boxes = tracker.update(frame_index, detections)
+
+        assert tracker.track_ids() == [1, 2]
+        np.testing.assert_allclose(boxes[:, :4], people(frame_index)[:, :4], atol=3.0)
+
+    assert len(tracker) == 2
+    assert tracker.stats()["track_count"] == 2
+
+def test_extrapolates_between_detections():
+    tracker = PersonTracker(detect_interval=10)
+
+    for frame_index in range(0, 40, 5):
+        tracker.update(frame_index, people(frame_index))
+
+    np.testing.assert_allclose(tracker.boxes(38)[:, :4], people(38)[:, :4], atol=3.0)
+
+def test_lost_track_ends_and_new_person_gets_new_id():
+    tracker = PersonTracker(max_misses=2)
+    tracker.update(0, people(0))
+
+    for frame_index in (5, 10, 15):
+        tracker.update(frame_index, people(frame_index)[:1])
+
+    assert tracker.track_ids() == [1]
+    assert [track["id"] for track in tracker.finished] == [2]
+
+    tracker.update(20, people(20))
+
+    assert tracker.track_ids() == [1, 3]
@@ -0,0 +1,32 @@
+from pathlib import Path
+import pytest
+
+pytest.importorskip("numpy")
+
+from sdk.detection.report.event_store import EventStore
+from sdk.video.result_cache import ResultCache
+
+def test_hit_at_another_path_only_references_the_new_output_folder(tmp_path):
+    old_folder = tmp_path / "old" / "video" / "head"
+    old_folder.mkdir(parents=True)
+    images = []
+
+    for name in ("00-01_00000045.jpg", "00-02_00000050.jpg"):
+        (old_folder / name).write_bytes(b"jpg")
+        images.append(str(old_folder / name))
+
+    events = EventStore()
+    segment = {"start": 1.8, "end": 16.4, "images": images}
+    events.append("head", 45, 1.8, 1.0, {"image": images[0], "detail": segment}, 14.8)
+
+    cache = ResultCache(tmp_path / "cache")
+    cache.put("key", events)
+
+    new_folder = tmp_path / "new" / "video" / "head"
+    hit, _ = cache.get("key", new_folder)
+    detail = hit.details[0]
+    paths = [detail["image"], *detail["detail"]["images"]]
+
+    assert all(path.startswith(str(new_folder)) for path in paths)
+    assert all(Path(path).is_file() for path in paths)
+    assert segment["images"] == images  # The caller's details are not rewritten
@@ -0,0 +1,97 @@
+import pytest
+
+pytest.importorskip("mediapipe")
+pytest.importorskip("ultralytics")
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from sdk.bench.stub_models import StubFaceMesh, StubYolo
+from sdk.bench.synthetic_video import SyntheticVideo
+from sdk.detection.core.model_pool import ModelPool
+from sdk.video.video_analysis_request import VideoAnalysisRequest
+from sdk.video.video_file_analyzer import VideoFileAnalyzer
+
+def create_video(path, fps=15, seconds=20, scene_seconds=2):
+    """A video whose scene only changes every `scene_seconds`, so most frames are static."""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (160, 120))
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+
+    for frame_index in range(fps * seconds):
+        if frame_index % (fps * scene_seconds) == 0:
+            frame[:] = 40
+            x = (frame_index // (fps * scene_seconds)) * 12
+            cv2.rectangle(frame, (x, 20), (x + 30, 100), (200, 120, 60), -1)
+
+        writer.write(frame)
+
+    writer.release()
+
+    return str(path)
+
+def install_stubs():
+    # Fresh stubs, so every run sees the same model outputs
+    pool = ModelPool.instance()
+    pool.register(("yolo", "yolov8n.pt"), StubYolo())
+    pool.register(("face_mesh", False), StubFaceMesh())
+
+def to_events(report):
+    return [
+        (record["type"], record["frame_index"], record["timestamp"], record["duration"], record["confidence"])
+        for record in report.events.to_records()
+    ]
+
+def analyze(video, **settings):
+    install_stubs()
+
+    request = VideoAnalysisRequest(input=video, frame_skip=1, motion_gate=True, motion_max_static=10, checkpoint_interval=0, **settings)
+
+    return to_events(VideoFileAnalyzer(request).analyze())
+
+def test_motion_gate_events_do_not_depend_on_batch_size(tmp_path):
+    video = create_video(tmp_path / "static.mp4")
+
+    single = analyze(video, batch_size=1)
+    batched = analyze(video, batch_size=8, batch_max_wait=60.0)
+
+    # Every frame has a person event, most of them carried forward, and the stub face looks away long enough for a segment
+    assert sum(1 for event in single if event[0] == "person") == 300
+    assert any(event[0] == "head" for event in single)
+    assert batched == single
+
+def test_resumed_run_matches_uninterrupted_run(tmp_path):
+    video = SyntheticVideo(tmp_path).create(160, 120, 20, 15)
+    settings = {"input": video, "frame_skip": 2}
+
+    install_stubs()
+    expected = VideoFileAnalyzer(VideoAnalysisRequest(checkpoint_interval=0, **settings)).analyze()
+    with open(tmp_path / "synthetic_160x120_15fps_20s" / "report.jsonl") as f:
+        expected_lines = f.read().splitlines()[:-1]  # Without the summary line, which holds timings
+
+    # Checkpoint after every frame and crash at frame 150, as if the process had been killed
+    install_stubs()
+    interrupted = VideoFileAnalyzer(VideoAnalysisRequest(checkpoint_interval=1e-9, **settings))
+    run_analyzers = interrupted.run_analyzers
+
+    def crash_at_150(frame):
+        if frame.index == 150:
+            raise KeyboardInterrupt
+        return run_analyzers(frame)
+
+    interrupted.run_analyzers = crash_at_150
+
+    with pytest.raises(KeyboardInterrupt):
+        interrupted.analyze()
+
+    # The stubs keep their state, as the models would see the same frames again
+    resumed = VideoFileAnalyzer(VideoAnalysisRequest(checkpoint_interval=0, **settings))
+
+    assert resumed.resume_state["frame_index"] == 148  # The last sampled frame before the crash
+
+    report = resumed.analyze()
+    with open(tmp_path / "synthetic_160x120_15fps_20s" / "report.jsonl") as f:
+        lines = f.read().splitlines()[:-1]
+
+    assert any(event[0] == "head" for event in to_events(expected))
+    assert to_events(report) == to_events(expected)
+    assert lines == expected_lines
+    assert not (tmp_path / "synthetic_160x120_15fps_20s" / "checkpoint.pkl").exists()